@@ -1,6 +1,6 @@
 import React, { createContext, useContext, useState, useEffect, ReactNode, useCallback } from 'react';
 import { Platform } from 'react-native';
-import { getRecordings, getUserFromStorage, Recording, getAudioUrl } from '../services/api';
+import { getArchiveSummary, getUserFromStorage } from '../services/api';
 
 // 웹 환경에서 localStorage 사용을 위한 타입 선언
 declare const localStorage: {
@@ -83,38 +83,21 @@ export const AppProvider: React.FC<AppProviderProps> = ({ children }) => {
     setAccessibilityStep(step);
   };
 
-  // 총 녹음 시간 계산 함수 (백엔드에서 제공하는 duration 사용)
-  const calculateTotalDuration = useCallback(async (recordings: Recording[]) => {
-    if (recordings.length === 0) {
-      setTotalArchiveDuration(0);
-      return;
-    }
-
-    // 백엔드에서 제공하는 duration을 사용 (없으면 0으로 처리)
-    const totalSeconds = recordings.reduce((sum, recording) => {
-      return sum + (recording.duration || 0);
-    }, 0);
-    
-    setTotalArchiveDuration(totalSeconds);
-  }, []);
-
   // 총 녹음 시간 새로고침 함수
+  // 녹음 목록을 모두 받아 더하지 않고, 서버 집계(아카이브 요약의 total_duration)를 사용
   const refreshArchiveDuration = useCallback(async () => {
     const userInfo = getUserFromStorage();
     if (userInfo && isOnboardingCompleted) {
       try {
-        const response = await getRecordings({ 
-          userId: userInfo.id,
-          limit: 1000
-        });
+        const response = await getArchiveSummary(userInfo.id, { top: 1 });
         if (response.success) {
-          await calculateTotalDuration(response.recordings);
+          setTotalArchiveDuration(response.total_duration || 0);
         }
       } catch (error) {
         console.error('총 녹음 시간 계산 오류:', error);
       }
     }
-  }, [isOnboardingCompleted, calculateTotalDuration]);
+  }, [isOnboardingCompleted]);
 
   // 온보딩 완료 후 총 녹음 시간 계산
   useEffect(() => {
@@ -23,7 +23,7 @@ declare const document: {
 import { useApp } from '../../contexts/AppContext';
 import NavigationBar from '../../components/NavigationBar';
 import Header from '../../components/Header';
-import { getRecordings, getUserFromStorage, Recording, getAudioUrl } from '../../services/api';
+import { getArchiveSummary, getUserFromStorage, ArchiveSummary } from '../../services/api';
 
 // API URL 가져오기 (웹 환경에서만 사용)
 const getApiUrl = () => {
@@ -41,7 +41,7 @@ const ArchiveScreen: FC = () => {
   const navigation = useNavigation<ArchiveScreenNavigationProp>();
   const { isOnboardingCompleted, totalArchiveDuration } = useApp();
   const [viewMode, setViewMode] = useState<'monthly' | 'all'>('monthly'); // 'monthly' 또는 'all'
-  const [recordings, setRecordings] = useState<Recording[]>([]);
+  const [summary, setSummary] = useState<ArchiveSummary | null>(null); // 서버에서 집계한 아카이브 요약
   const [loading, setLoading] = useState<boolean>(true);
   const [currentPageIndex, setCurrentPageIndex] = useState<number>(0); // 페이지 인덱스 (0, 1, 2)
   
@@ -54,32 +54,34 @@ const ArchiveScreen: FC = () => {
     return now.getMonth() + 1; // 1-12
   }, []);
 
-  // 녹음 데이터 로드
+  // 아카이브 요약 로드 (월별 모드는 이번 달, 전체 모드는 전체 기간)
   useEffect(() => {
-    const loadRecordings = async () => {
+    const loadSummary = async () => {
       try {
         setLoading(true);
         const userInfo = getUserFromStorage();
         if (userInfo) {
-          const response = await getRecordings({ 
-            userId: userInfo.id,
-            limit: 1000 // 충분히 많이 가져오기
+          const now = new Date();
+          const month = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}`;
+          const response = await getArchiveSummary(userInfo.id, {
+            month: viewMode === 'monthly' ? month : undefined,
+            top: 4,
           });
           if (response.success) {
-            setRecordings(response.recordings);
+            setSummary(response);
           }
         }
       } catch (error) {
-        console.error('녹음 데이터 로드 오류:', error);
+        console.error('아카이브 요약 로드 오류:', error);
       } finally {
         setLoading(false);
       }
     };
 
     if (isOnboardingCompleted) {
-      loadRecordings();
+      loadSummary();
     }
-  }, [isOnboardingCompleted]);
+  }, [isOnboardingCompleted, viewMode]);
 
   // 온보딩 완료 상태 확인
   useEffect(() => {
@@ -88,21 +90,6 @@ const ArchiveScreen: FC = () => {
     }
   }, [isOnboardingCompleted, navigation]);
 
-  // 월별 또는 전체 기록 필터링
-  const filteredRecordings = useMemo(() => {
-    if (viewMode === 'monthly') {
-      const now = new Date();
-      const currentYear = now.getFullYear();
-      const currentMonth = now.getMonth() + 1;
-      
-      return recordings.filter(rec => {
-        const recDate = new Date(rec.recorded_at);
-        return recDate.getFullYear() === currentYear && recDate.getMonth() + 1 === currentMonth;
-      });
-    }
-    return recordings;
-  }, [recordings, viewMode]);
-
   // 총 시간을 분 또는 초로 변환 (Context에서 가져온 값 사용)
   const totalTimeDisplay = useMemo(() => {
     // viewMode에 따라 필터링된 녹음의 시간만 계산
@@ -145,39 +132,18 @@ const ArchiveScreen: FC = () => {
     return `M ${points.join(' L ')}`;
   };
 
-  // 위치별 기록 통계 계산 (상위 4개)
-  const topLocations = useMemo(() => {
-    const locationCounts: { [key: string]: number } = {};
-    
-    filteredRecordings.forEach(rec => {
-      if (rec.district) {
-        locationCounts[rec.district] = (locationCounts[rec.district] || 0) + 1;
-      }
-    });
-    
-    // 카운트 기준으로 정렬하고 상위 4개만 반환
-    return Object.entries(locationCounts)
-      .map(([district, count]) => ({ district, count }))
-      .sort((a, b) => b.count - a.count)
-      .slice(0, 4);
-  }, [filteredRecordings]);
+  // 위치별 기록 통계 (서버에서 상위 4개 집계)
+  const topLocations = useMemo(() => summary?.top_districts ?? [], [summary]);
 
-  // 감정별 기록 통계 계산 (상위 4개)
+  // 감정별 기록 통계 (상위 4개, 기록이 있는 감정만)
   const topEmotions = useMemo(() => {
-    const emotionCounts: { [key: string]: number } = {};
-    
-    filteredRecordings.forEach(rec => {
-      if (rec.emotion) {
-        emotionCounts[rec.emotion] = (emotionCounts[rec.emotion] || 0) + 1;
-      }
-    });
-    
-    // 카운트 기준으로 정렬하고 상위 4개만 반환
-    return Object.entries(emotionCounts)
+    if (!summary) return [];
+    return Object.entries(summary.emotions)
+      .filter(([, count]) => count > 0)
       .map(([emotion, count]) => ({ emotion, count }))
       .sort((a, b) => b.count - a.count)
       .slice(0, 4);
-  }, [filteredRecordings]);
+  }, [summary]);
 
   // 페이지 인덱스에 따른 표시할 데이터
   const displayData = useMemo(() => {
@@ -17,7 +17,7 @@ import Svg, { Circle, Path, ClipPath, Defs, G, Rect } from 'react-native-svg';
 import { useApp } from '../../contexts/AppContext';
 import NavigationBar from '../../components/NavigationBar';
 import Header from '../../components/Header';
-import { getRecordings, getUserFromStorage, Recording } from '../../services/api';
+import { getArchiveSummary, getRecordings, getUserFromStorage, Recording } from '../../services/api';
 
 // 웹 환경에서 document 사용을 위한 타입 선언
 declare const document: {
@@ -30,6 +30,10 @@ declare const document: {
 const screenWidth = 390;
 const screenHeight = 844;
 
+// 기록 페이지 크기 / 남은 기록이 이만큼이면 다음 페이지 로드
+const ARCHIVE_PAGE_SIZE = 30;
+const ARCHIVE_PREFETCH_THRESHOLD = 5;
+
 type EmotionDetailScreenNavigationProp = NativeStackNavigationProp<RootStackParamList, 'EmotionDetail'>;
 type EmotionDetailScreenRouteProp = RouteProp<RootStackParamList, 'EmotionDetail'>;
 
@@ -274,6 +278,9 @@ const EmotionDetailScreen: FC = () => {
   const [recordings, setRecordings] = useState<Recording[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
   const [currentSlideIndex, setCurrentSlideIndex] = useState<number>(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null); // 다음 페이지 커서 (없으면 마지막 페이지)
+  const [totalCount, setTotalCount] = useState<number | null>(null); // 해당 감정 기록 수 (아카이브 집계)
+  const loadingMoreRef = useRef<boolean>(false);
   const isGestureDetectedRef = useRef<boolean>(false);
   const slideAnim = useRef(new Animated.Value(0)).current;
   const isAnimatingRef = useRef<boolean>(false);
@@ -299,33 +306,37 @@ const EmotionDetailScreen: FC = () => {
     return now.getMonth() + 1; // 1-12
   }, []);
 
+  // 이번 달 ('YYYY-MM'과 1일~말일)
+  const currentMonthRange = useMemo(() => {
+    const now = new Date();
+    const month = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}`;
+    const lastDay = new Date(now.getFullYear(), now.getMonth() + 1, 0).getDate();
+    return { month, startDate: `${month}-01`, endDate: `${month}-${String(lastDay).padStart(2, '0')}` };
+  }, []);
+
+  // 목록 조회 조건 (월별 모드는 이번 달 기록만)
+  const recordingFilter = useMemo(() => (
+    viewMode === 'monthly'
+      ? { emotion, startDate: currentMonthRange.startDate, endDate: currentMonthRange.endDate }
+      : { emotion }
+  ), [emotion, viewMode, currentMonthRange]);
+
   // recordings의 ID 배열만 비교하여 실제 변경 여부 확인 (참조 동일성 문제 해결)
   const recordingIds = useMemo(() => 
     recordings.map(r => r.id).filter((id): id is number => id !== undefined).join(','), 
     [recordings]
   );
 
-  // 해당 감정의 기록만 필터링
+  // 해당 감정의 기록 (감정/월 필터는 서버에서 적용, 지금까지 로드한 페이지만)
   const emotionRecordings = useMemo(() => {
-    let filtered = recordings.filter(rec => rec.emotion === emotion);
-    
-    // 월별 모드인 경우 현재 월의 기록만 필터링
-    if (viewMode === 'monthly') {
-      const now = new Date();
-      const currentYear = now.getFullYear();
-      const currentMonth = now.getMonth() + 1;
-      
-      filtered = filtered.filter(rec => {
-        const recDate = new Date(rec.recorded_at);
-        return recDate.getFullYear() === currentYear && recDate.getMonth() + 1 === currentMonth;
-      });
-    }
-    
     // ref에 저장 (리렌더링 방지)
-    emotionRecordingsRef.current = filtered;
+    emotionRecordingsRef.current = recordings;
     
-    return filtered;
-  }, [recordingIds, emotion, viewMode]); // recordingIds를 의존성으로 사용하여 실제 내용 변경 시에만 재계산
+    return recordings;
+  }, [recordingIds]); // recordingIds를 의존성으로 사용하여 실제 내용 변경 시에만 재계산
+
+  // 아직 로드하지 않은 페이지가 있으면 처음/마지막에서 반대쪽으로 넘어가지 않음 (다음 페이지 로드 후 이어서 넘김)
+  const hasMore = nextCursor !== null;
 
 
   // 현재 슬라이드의 기록 데이터 (무한 슬라이드)
@@ -338,16 +349,18 @@ const EmotionDetailScreen: FC = () => {
   // 이전 기록 (왼쪽 원)
   const prevRecording = useMemo(() => {
     if (emotionRecordings.length <= 1) return null;
+    if (hasMore && currentSlideIndex === 0) return null;
     const prevIndex = (currentSlideIndex - 1 + emotionRecordings.length) % emotionRecordings.length;
     return emotionRecordings[prevIndex];
-  }, [emotionRecordings, currentSlideIndex]);
+  }, [emotionRecordings, currentSlideIndex, hasMore]);
 
   // 다음 기록 (오른쪽 원)
   const nextRecording = useMemo(() => {
     if (emotionRecordings.length <= 1) return null;
+    if (hasMore && currentSlideIndex + 1 >= emotionRecordings.length) return null;
     const nextIndex = (currentSlideIndex + 1) % emotionRecordings.length;
     return emotionRecordings[nextIndex];
-  }, [emotionRecordings, currentSlideIndex]);
+  }, [emotionRecordings, currentSlideIndex, hasMore]);
 
   // findIndex 결과를 메모이제이션 (리렌더링 방지)
   const recordingIndices = useMemo(() => {
@@ -494,17 +507,17 @@ const EmotionDetailScreen: FC = () => {
     };
   }, []); // 의존성 배열 비움 - 리렌더링 없이 ref만 사용
 
-  // 녹음 데이터 로드
+  // 녹음 데이터 로드 (해당 감정 기록 첫 페이지 + 아카이브 집계의 전체 개수)
   useEffect(() => {
     const loadRecordings = async () => {
       try {
         setLoading(true);
         const userInfo = getUserFromStorage();
         if (userInfo) {
-          const response = await getRecordings({ 
-            userId: userInfo.id,
-            limit: 1000
-          });
+          const [response, summary] = await Promise.all([
+            getRecordings({ userId: userInfo.id, limit: ARCHIVE_PAGE_SIZE, ...recordingFilter }),
+            getArchiveSummary(userInfo.id, { month: viewMode === 'monthly' ? currentMonthRange.month : undefined, top: 1 }),
+          ]);
           if (response.success) {
             // 배열이 실제로 변경되었을 때만 업데이트 (참조 동일성 문제 방지)
             setRecordings(prev => {
@@ -518,6 +531,10 @@ const EmotionDetailScreen: FC = () => {
               
               return response.recordings;
             });
+            setNextCursor(response.next_cursor);
+          }
+          if (summary.success) {
+            setTotalCount(summary.emotions[emotion] ?? null);
           }
         }
       } catch (error) {
@@ -530,7 +547,39 @@ const EmotionDetailScreen: FC = () => {
     if (isOnboardingCompleted) {
       loadRecordings();
     }
-  }, [isOnboardingCompleted]);
+  }, [isOnboardingCompleted, recordingFilter]);
+
+  // 마지막 기록 근처까지 넘기면 다음 페이지 로드 (FeedScreen과 동일)
+  useEffect(() => {
+    if (!nextCursor || loadingMoreRef.current) return;
+    if (currentSlideIndex < emotionRecordings.length - ARCHIVE_PREFETCH_THRESHOLD) return;
+
+    const loadMore = async () => {
+      loadingMoreRef.current = true;
+      try {
+        const userInfo = getUserFromStorage();
+        if (!userInfo) return;
+        const response = await getRecordings({
+          userId: userInfo.id,
+          limit: ARCHIVE_PAGE_SIZE,
+          cursor: nextCursor,
+          ...recordingFilter,
+        });
+        if (response.success) {
+          setRecordings(prev => {
+            const existingIds = new Set(prev.map(r => r.id));
+            return [...prev, ...response.recordings.filter(r => !existingIds.has(r.id))];
+          });
+          setNextCursor(response.next_cursor);
+        }
+      } catch (error) {
+        console.error('다음 기록 로드 오류:', error);
+      } finally {
+        loadingMoreRef.current = false;
+      }
+    };
+    loadMore();
+  }, [currentSlideIndex, emotionRecordings.length, nextCursor, recordingFilter]);
 
   // 좌우 스와이프 제스처 처리 (무한 슬라이드) - LocationDetailScreen과 동일
   const handleTouchStart = (e: any) => {
@@ -563,7 +612,10 @@ const EmotionDetailScreen: FC = () => {
       
       const deltaX = currentX - startX;
       
-      if (Math.abs(deltaX) > 50 && !isAnimatingRef.current) {
+      // 넘길 기록이 아직 로드되지 않았으면 (다음 페이지 로드 중) 움직이지 않음
+      const target = deltaX > 0 ? prevRecording : nextRecording;
+      
+      if (Math.abs(deltaX) > 50 && !isAnimatingRef.current && target) {
         isGestureDetectedRef.current = true;
         isAnimatingRef.current = true;
         
@@ -698,7 +750,7 @@ const EmotionDetailScreen: FC = () => {
       {emotionRecordings.length > 0 && (
         <View style={styles.slideInfoContainer}>
           <Text style={styles.slideInfoText}>
-            {(currentSlideIndex % emotionRecordings.length) + 1}/{emotionRecordings.length}
+            {(currentSlideIndex % emotionRecordings.length) + 1}/{Math.max(totalCount ?? 0, emotionRecordings.length)}
           </Text>
         </View>
       )}
@@ -17,7 +17,7 @@ import Svg, { Circle, Ellipse, Path, G, Mask, Line, Rect, ClipPath, Defs, Image,
 import { useApp } from '../../contexts/AppContext';
 import NavigationBar from '../../components/NavigationBar';
 import Header from '../../components/Header';
-import { getRecordings, getUserFromStorage, Recording } from '../../services/api';
+import { getEmotionStats, getRecordings, getUserFromStorage, Recording } from '../../services/api';
 
 // 웹 환경에서 document 사용을 위한 타입 선언
 declare const document: {
@@ -29,6 +29,10 @@ declare const document: {
 const screenWidth = 390;
 const screenHeight = 844;
 
+// 기록 페이지 크기 / 남은 기록이 이만큼이면 다음 페이지 로드
+const ARCHIVE_PAGE_SIZE = 30;
+const ARCHIVE_PREFETCH_THRESHOLD = 5;
+
 type LocationDetailScreenNavigationProp = NativeStackNavigationProp<RootStackParamList, 'LocationDetail'>;
 type LocationDetailScreenRouteProp = RouteProp<RootStackParamList, 'LocationDetail'>;
 
@@ -43,6 +47,9 @@ const LocationDetailScreen: FC = () => {
   const [recordings, setRecordings] = useState<Recording[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
   const [currentSlideIndex, setCurrentSlideIndex] = useState<number>(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null); // 다음 페이지 커서 (없으면 마지막 페이지)
+  const [totalCount, setTotalCount] = useState<number | null>(null); // 해당 장소 기록 수 (서버 집계)
+  const loadingMoreRef = useRef<boolean>(false);
   const isGestureDetectedRef = useRef<boolean>(false);
   const slideAnim = useRef(new Animated.Value(0)).current;
   const isAnimatingRef = useRef<boolean>(false);
@@ -63,24 +70,24 @@ const LocationDetailScreen: FC = () => {
     return now.getMonth() + 1; // 1-12
   }, []);
 
-  // 해당 장소의 기록만 필터링
-  const locationRecordings = useMemo(() => {
-    let filtered = recordings.filter(rec => rec.district === district);
-    
-    // 월별 모드인 경우 현재 월의 기록만 필터링
-    if (viewMode === 'monthly') {
-      const now = new Date();
-      const currentYear = now.getFullYear();
-      const currentMonth = now.getMonth() + 1;
-      
-      filtered = filtered.filter(rec => {
-        const recDate = new Date(rec.recorded_at);
-        return recDate.getFullYear() === currentYear && recDate.getMonth() + 1 === currentMonth;
-      });
-    }
-    
-    return filtered;
-  }, [recordings, district, viewMode]);
+  // 이번 달 1일~말일 (YYYY-MM-DD)
+  const currentMonthRange = useMemo(() => {
+    const now = new Date();
+    const month = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}`;
+    const lastDay = new Date(now.getFullYear(), now.getMonth() + 1, 0).getDate();
+    return { startDate: `${month}-01`, endDate: `${month}-${String(lastDay).padStart(2, '0')}` };
+  }, []);
+
+  // 목록/개수 조회 조건 (월별 모드는 이번 달 기록만)
+  const recordingFilter = useMemo(() => (
+    viewMode === 'monthly' ? { district, ...currentMonthRange } : { district }
+  ), [district, viewMode, currentMonthRange]);
+
+  // 해당 장소의 기록 (장소/월 필터는 서버에서 적용, 지금까지 로드한 페이지만)
+  const locationRecordings = recordings;
+
+  // 아직 로드하지 않은 페이지가 있으면 처음/마지막에서 반대쪽으로 넘어가지 않음 (다음 페이지 로드 후 이어서 넘김)
+  const hasMore = nextCursor !== null;
 
   // 현재 슬라이드의 기록 데이터 (무한 슬라이드)
   const currentRecording = useMemo(() => {
@@ -92,26 +99,35 @@ const LocationDetailScreen: FC = () => {
   // 이전 기록 (왼쪽 캐릭터)
   const prevRecording = useMemo(() => {
     if (locationRecordings.length <= 1) return null;
+    if (hasMore && currentSlideIndex === 0) return null;
     const prevIndex = (currentSlideIndex - 1 + locationRecordings.length) % locationRecordings.length;
     return locationRecordings[prevIndex];
-  }, [locationRecordings, currentSlideIndex]);
+  }, [locationRecordings, currentSlideIndex, hasMore]);
 
   // 다음 기록 (오른쪽 캐릭터)
   const nextRecording = useMemo(() => {
     if (locationRecordings.length <= 1) return null;
+    if (hasMore && currentSlideIndex + 1 >= locationRecordings.length) return null;
     const nextIndex = (currentSlideIndex + 1) % locationRecordings.length;
     return locationRecordings[nextIndex];
-  }, [locationRecordings, currentSlideIndex]);
+  }, [locationRecordings, currentSlideIndex, hasMore]);
 
-  // 기록 데이터 로드
+  // 기록 데이터 로드 (해당 장소 기록 첫 페이지 + 전체 개수)
   useEffect(() => {
     const loadRecordings = async () => {
       try {
         const user = await getUserFromStorage();
         if (user) {
-          const response = await getRecordings({ userId: user.id });
+          const [response, stats] = await Promise.all([
+            getRecordings({ userId: user.id, limit: ARCHIVE_PAGE_SIZE, ...recordingFilter }),
+            getEmotionStats({ userId: user.id, ...recordingFilter }),
+          ]);
           if (response.success && response.recordings) {
             setRecordings(response.recordings);
+            setNextCursor(response.next_cursor);
+          }
+          if (stats.success) {
+            setTotalCount(stats.total);
           }
         }
       } catch (error) {
@@ -121,7 +137,39 @@ const LocationDetailScreen: FC = () => {
       }
     };
     loadRecordings();
-  }, []);
+  }, [recordingFilter]);
+
+  // 마지막 기록 근처까지 넘기면 다음 페이지 로드 (FeedScreen과 동일)
+  useEffect(() => {
+    if (!nextCursor || loadingMoreRef.current) return;
+    if (currentSlideIndex < locationRecordings.length - ARCHIVE_PREFETCH_THRESHOLD) return;
+
+    const loadMore = async () => {
+      loadingMoreRef.current = true;
+      try {
+        const user = getUserFromStorage();
+        if (!user) return;
+        const response = await getRecordings({
+          userId: user.id,
+          limit: ARCHIVE_PAGE_SIZE,
+          cursor: nextCursor,
+          ...recordingFilter,
+        });
+        if (response.success) {
+          setRecordings(prev => {
+            const existingIds = new Set(prev.map(r => r.id));
+            return [...prev, ...response.recordings.filter(r => !existingIds.has(r.id))];
+          });
+          setNextCursor(response.next_cursor);
+        }
+      } catch (error) {
+        console.error('다음 기록 로드 오류:', error);
+      } finally {
+        loadingMoreRef.current = false;
+      }
+    };
+    loadMore();
+  }, [currentSlideIndex, locationRecordings.length, nextCursor, recordingFilter]);
 
   // 좌우 스와이프 제스처 처리 (무한 슬라이드)
   const handleTouchStart = (e: any) => {
@@ -154,7 +202,10 @@ const LocationDetailScreen: FC = () => {
       
       const deltaX = currentX - startX;
       
-      if (Math.abs(deltaX) > 50 && !isAnimatingRef.current) {
+      // 넘길 기록이 아직 로드되지 않았으면 (다음 페이지 로드 중) 움직이지 않음
+      const target = deltaX > 0 ? prevRecording : nextRecording;
+      
+      if (Math.abs(deltaX) > 50 && !isAnimatingRef.current && target) {
         isGestureDetectedRef.current = true;
         isAnimatingRef.current = true;
         
@@ -564,7 +615,7 @@ const LocationDetailScreen: FC = () => {
       {locationRecordings.length > 0 && (
         <View style={styles.slideInfoContainer}>
           <Text style={styles.slideInfoText}>
-            {(currentSlideIndex % locationRecordings.length) + 1}/{locationRecordings.length}
+            {(currentSlideIndex % locationRecordings.length) + 1}/{Math.max(totalCount ?? 0, locationRecordings.length)}
           </Text>
         </View>
       )}
@@ -33,6 +33,10 @@ declare const document: {
 const screenWidth = 390;
 const screenHeight = 844;
 
+// 피드는 서버 페이지 단위로 로드 (남은 기록이 이 개수 이하가 되면 다음 페이지 요청)
+const FEED_PAGE_SIZE = 30;
+const FEED_PREFETCH_THRESHOLD = 5;
+
 type FeedScreenNavigationProp = NativeStackNavigationProp<RootStackParamList, 'Feed'>;
 type FeedScreenRouteProp = RouteProp<RootStackParamList, 'Feed'>;
 
@@ -45,6 +49,8 @@ const FeedScreen: FC = () => {
   const [userName, setUserName] = useState<string>('');
   const [currentUserId, setCurrentUserId] = useState<number | null>(null);
   const [loading, setLoading] = useState<boolean>(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null); // 다음 페이지 커서 (없으면 마지막 페이지)
+  const loadingMoreRef = useRef<boolean>(false);
   const [showDeleteModal, setShowDeleteModal] = useState<boolean>(false);
   const [isPlaying, setIsPlaying] = useState<boolean>(false);
   const [scrollY] = useState(new Animated.Value(0));
@@ -106,12 +112,13 @@ const FeedScreen: FC = () => {
           setCurrentUserId(userInfo.id);
         }
 
-        // 모든 업로드된 기록 가져오기
+        // 업로드된 기록 첫 페이지 가져오기 (나머지는 넘기면서 이어서 로드)
         if (userInfo) {
           const response = await getRecordings({
             isUploaded: true,
-            limit: 100, // 충분히 많이 가져오기
+            limit: FEED_PAGE_SIZE,
           });
+          setNextCursor(response.success ? response.next_cursor : null);
           
           if (response.success && response.recordings.length > 0) {
             // 최신순으로 정렬 (uploaded_at 기준, 내림차순)
@@ -170,6 +177,35 @@ const FeedScreen: FC = () => {
     }
   }, [isOnboardingCompleted, route.params?.recordingId]);
 
+  // 마지막 기록 근처까지 넘기면 다음 페이지 로드
+  useEffect(() => {
+    if (!nextCursor || loadingMoreRef.current) return;
+    if (currentRecordingIndex < recordings.length - FEED_PREFETCH_THRESHOLD) return;
+
+    const loadMore = async () => {
+      loadingMoreRef.current = true;
+      try {
+        const response = await getRecordings({
+          isUploaded: true,
+          limit: FEED_PAGE_SIZE,
+          cursor: nextCursor,
+        });
+        if (response.success) {
+          setRecordings(prev => {
+            const existingIds = new Set(prev.map(r => r.id));
+            return [...prev, ...response.recordings.filter(r => !existingIds.has(r.id))];
+          });
+          setNextCursor(response.next_cursor);
+        }
+      } catch (error) {
+        console.error('다음 기록 로드 오류:', error);
+      } finally {
+        loadingMoreRef.current = false;
+      }
+    };
+    loadMore();
+  }, [currentRecordingIndex, recordings.length, nextCursor]);
+
   // 온보딩 완료 상태 확인
   useEffect(() => {
     if (!isOnboardingCompleted) {
@@ -277,7 +313,7 @@ const FeedScreen: FC = () => {
       let newLikes: number;
       if (isLiked) {
         // 좋아요 취소
-        const response = await unlikeRecording(currentRecording.id);
+        const response = await unlikeRecording(currentRecording.id, currentUserId ?? undefined);
         if (response.success) {
           setLikedRecordings(prev => {
             const newSet = new Set(prev);
@@ -290,7 +326,7 @@ const FeedScreen: FC = () => {
         }
       } else {
         // 좋아요 추가
-        const response = await likeRecording(currentRecording.id);
+        const response = await likeRecording(currentRecording.id, currentUserId ?? undefined);
         if (response.success) {
           setLikedRecordings(prev => new Set(prev).add(currentRecording.id));
           newLikes = response.likes;
@@ -20,7 +20,7 @@ import { useApp } from '../../contexts/AppContext';
 import NavigationBar from '../../components/NavigationBar';
 import Header from '../../components/Header';
 import DeleteConfirmModal from '../../components/DeleteConfirmModal';
-import { getRecordings, getUserFromStorage, Recording, getAudioUrl, deleteRecording, updateRecording, likeRecording, unlikeRecording } from '../../services/api';
+import { getEmotionStats, getRecordings, getUserFromStorage, Recording, getAudioUrl, deleteRecording, updateRecording, likeRecording, unlikeRecording } from '../../services/api';
 
 // 웹 환경에서 document 사용을 위한 타입 선언
 declare const document: {
@@ -42,12 +42,20 @@ interface WeekDay {
   dateString: string; // YYYY-MM-DD 형식
 }
 
+// 선택한 날짜에 보여주는 기록 수 (최신순)
+const DAY_RECORDINGS_LIMIT = 3;
+
+// Date -> 'YYYY-MM-DD' (로컬 날짜 기준)
+const toDateString = (date: Date): string =>
+  `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`;
+
 const RecordsScreen: FC = () => {
   const navigation = useNavigation<RecordsScreenNavigationProp>();
   const route = useRoute<RecordsScreenRouteProp>();
   const { isOnboardingCompleted } = useApp();
   const [selectedDate, setSelectedDate] = useState<Date>(new Date());
-  const [recordings, setRecordings] = useState<Recording[]>([]);
+  const [recordings, setRecordings] = useState<Recording[]>([]); // 선택한 날짜의 최신 기록 (최대 DAY_RECORDINGS_LIMIT개)
+  const [recordedDays, setRecordedDays] = useState<Set<string>>(new Set()); // 표시 중인 주에서 기록이 있는 날짜 (YYYY-MM-DD)
   const [loading, setLoading] = useState<boolean>(true);
   // 현재 표시 중인 주의 시작일 (일요일)
   const [currentWeekStart, setCurrentWeekStart] = useState<Date>(() => {
@@ -101,6 +109,7 @@ const RecordsScreen: FC = () => {
   }>({ startX: 0, startY: 0, isDragging: false });
   const weekContainerRef = useRef<any>(null); // weekContainer DOM 요소 참조
   const currentWeekStartRef = useRef<Date>(currentWeekStart); // currentWeekStart의 최신 값을 추적
+  const loadRequestRef = useRef<number>(0); // 마지막 로드 요청 번호 (날짜를 빠르게 바꿀 때 이전 응답 무시)
 
   // 감정별 색상 매핑
   const getEmotionColor = (emotion: string): string => {
@@ -226,7 +235,7 @@ const RecordsScreen: FC = () => {
 
   // 선택한 날짜의 기록 최대 3개까지
   const todayRecordings = useMemo(() => {
-    const result = sortedDateRecordings.slice(0, 3); // 최대 3개
+    const result = sortedDateRecordings.slice(0, DAY_RECORDINGS_LIMIT); // 최대 3개
     // 디버깅용 로그 제거 (무한 렌더링 방지)
     // console.log('todayRecordings 개수:', result.length, '/ 전체:', sortedDateRecordings.length);
     return result;
@@ -277,15 +286,9 @@ const RecordsScreen: FC = () => {
     }
   }, []); // 빈 배열로 한 번만 실행
 
-  // 해당 날짜에 기록이 있는지 확인
+  // 해당 날짜에 기록이 있는지 확인 (표시 중인 주의 날짜별 집계)
   const hasRecording = (dateString: string): boolean => {
-    const hasRecord = recordings.some(rec => {
-      const recDate = new Date(rec.recorded_at);
-      recDate.setHours(0, 0, 0, 0); // 시간을 0으로 설정하여 날짜만 비교
-      const recDateString = `${recDate.getFullYear()}-${String(recDate.getMonth() + 1).padStart(2, '0')}-${String(recDate.getDate()).padStart(2, '0')}`;
-      return recDateString === dateString;
-    });
-    return hasRecord;
+    return recordedDays.has(dateString);
   };
 
   // 렌더링 체크용 useEffect 제거 (무한 렌더링 방지)
@@ -385,8 +388,9 @@ const RecordsScreen: FC = () => {
     try {
       const response = await deleteRecording(selectedRecording.id);
       if (response.success) {
-        // 녹음 목록에서 삭제
+        // 녹음 목록에서 삭제 후 다시 로드 (남은 기록/날짜 표시 갱신)
         setRecordings(prev => prev.filter(r => r.id !== selectedRecording.id));
+        loadRecordings();
         // 선택된 녹음 초기화
         setSelectedRecording(null);
         // 모달 닫기
@@ -870,36 +874,49 @@ const RecordsScreen: FC = () => {
     );
   };
 
-  // 녹음 데이터 로드 함수
+  // 녹음 데이터 로드 함수 (선택한 날짜의 최신 기록 한 페이지 + 표시 중인 주의 날짜별 기록 여부)
   const loadRecordings = useCallback(async () => {
+    const requestId = ++loadRequestRef.current;
     try {
       setLoading(true);
       const userInfo = getUserFromStorage();
       if (userInfo) {
         setUserName(userInfo.name);
         setCurrentUserId(userInfo.id);
-        // 모든 녹음 가져오기 (날짜별 필터링을 위해)
-        const response = await getRecordings({ 
-          userId: userInfo.id,
-          limit: 100 // 충분히 많이 가져오기
-        });
-        if (response.success) {
-          setRecordings(response.recordings);
+        const weekEnd = new Date(currentWeekStart);
+        weekEnd.setDate(currentWeekStart.getDate() + 6);
+        const [dayResponse, weekStats] = await Promise.all([
+          getRecordings({
+            userId: userInfo.id,
+            startDate: toDateString(selectedDate),
+            endDate: toDateString(selectedDate),
+            limit: DAY_RECORDINGS_LIMIT,
+          }),
+          getEmotionStats({
+            userId: userInfo.id,
+            startDate: toDateString(currentWeekStart),
+            endDate: toDateString(weekEnd),
+            bucket: 'day',
+          }),
+        ]);
+        if (requestId !== loadRequestRef.current) return;
+        if (dayResponse.success) {
+          setRecordings(dayResponse.recordings);
+        }
+        if (weekStats.success) {
+          setRecordedDays(new Set((weekStats.buckets || []).filter(b => b.total > 0).map(b => b.period)));
         }
       }
     } catch (error) {
       console.error('녹음 데이터 로드 오류:', error);
     } finally {
-      setLoading(false);
+      if (requestId === loadRequestRef.current) {
+        setLoading(false);
+      }
     }
-  }, []);
-
-  // 초기 로드
-  useEffect(() => {
-    loadRecordings();
-  }, [loadRecordings]);
+  }, [selectedDate, currentWeekStart]);
 
-  // 화면이 포커스될 때마다 데이터 새로고침 (녹음 완료 후 자동 반영)
+  // 화면이 포커스될 때마다, 그리고 날짜/주를 바꿀 때마다 데이터 새로고침 (녹음 완료 후 자동 반영)
   useFocusEffect(
     useCallback(() => {
       loadRecordings();
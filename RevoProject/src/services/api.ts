@@ -36,15 +36,49 @@ export interface Recording {
   uploaded_at: string | null;
   district: string | null;
   duration: number | null;  // 오디오 재생 시간 (초)
+  status: ProcessingStatus;  // 처리 상태 (비동기 업로드 시 pending -> done)
   created_at: string;
   updated_at: string;
 }
 
+export type ProcessingStatus = 'pending' | 'processing' | 'done' | 'failed';
+
+export interface ProcessingJob {
+  id: string;
+  recording_id: number;
+  status: ProcessingStatus;
+  attempts: number;
+  error: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+export interface EmotionCounts {
+  [key: string]: number;
+}
+
+export interface EmotionStatsBucket {
+  period: string; // 'YYYY-MM-DD' (day) 또는 'YYYY-MM' (month)
+  total: number;
+  emotions: EmotionCounts;
+}
+
 export interface EmotionStats {
   total: number;
-  emotions: {
-    [key: string]: number;
-  };
+  emotions: EmotionCounts;
+  buckets?: EmotionStatsBucket[]; // bucket 지정 시에만 포함
+}
+
+export interface ArchiveSummary {
+  user_id: number;
+  month: string | null; // 'YYYY-MM' (null이면 전체 기간)
+  total: number;
+  total_duration: number; // 초
+  emotions: EmotionCounts;
+  months: EmotionStatsBucket[]; // 월별 감정 개수 (오름차순)
+  top_districts: { district: string; count: number }[];
+  top_keywords: { keyword: string; count: number }[];
 }
 
 // ===== 에러 처리 =====
@@ -114,6 +148,28 @@ export const getUser = async (userId: number): Promise<{ success: boolean; user:
   }
 };
 
+/**
+ * 아카이브 요약 조회 (월별 감정 개수, 많이 기록한 동네, 자주 나온 키워드)
+ * @param userId - 사용자 ID
+ * @param options - month: 'YYYY-MM' (없으면 전체 기간), top: 상위 개수 (기본 4)
+ */
+export const getArchiveSummary = async (
+  userId: number,
+  options?: { month?: string; top?: number }
+): Promise<{ success: boolean } & ArchiveSummary> => {
+  try {
+    const params = new URLSearchParams();
+    if (options?.month) params.append('month', options.month);
+    if (options?.top) params.append('top', options.top.toString());
+
+    const response = await fetch(`${API_URL}/users/${userId}/archive?${params}`);
+    return handleResponse(response);
+  } catch (error) {
+    console.error('getArchiveSummary error:', error);
+    throw error;
+  }
+};
+
 // ===== 녹음 API =====
 
 /**
@@ -158,18 +214,29 @@ export const uploadRecording = async (
 
 /**
  * 녹음 목록 조회 (피드)
- * @param options - 조회 옵션 (userId, limit, isUploaded)
+ * 서버는 한 페이지(최대 100개)만 반환하며, 다음 페이지는 next_cursor로 요청합니다.
+ * @param options - 조회 옵션 (userId, limit, isUploaded, cursor, emotion, district, startDate/endDate: YYYY-MM-DD)
  */
 export const getRecordings = async (options?: {
   userId?: number;
   limit?: number;
   isUploaded?: boolean;
-}): Promise<{ success: boolean; count: number; recordings: Recording[] }> => {
+  cursor?: string | null;
+  emotion?: string;
+  district?: string;
+  startDate?: string;
+  endDate?: string;
+}): Promise<{ success: boolean; count: number; limit: number; next_cursor: string | null; recordings: Recording[] }> => {
   try {
     const params = new URLSearchParams();
     if (options?.userId) params.append('user_id', options.userId.toString());
     if (options?.limit) params.append('limit', options.limit.toString());
     if (options?.isUploaded !== undefined) params.append('is_uploaded', options.isUploaded.toString());
+    if (options?.cursor) params.append('cursor', options.cursor);
+    if (options?.emotion) params.append('emotion', options.emotion);
+    if (options?.district) params.append('district', options.district);
+    if (options?.startDate) params.append('start_date', options.startDate);
+    if (options?.endDate) params.append('end_date', options.endDate);
 
     const response = await fetch(`${API_URL}/recordings?${params}`);
     return handleResponse(response);
@@ -212,11 +279,19 @@ export const deleteRecording = async (recordingId: number): Promise<{ success: b
 /**
  * 좋아요 추가
  * @param recordingId - 녹음 ID
+ * @param userId - 사용자 ID (선택, 주면 같은 사용자의 중복 요청은 반영되지 않음)
  */
-export const likeRecording = async (recordingId: number): Promise<{ success: boolean; likes: number }> => {
+export const likeRecording = async (
+  recordingId: number,
+  userId?: number
+): Promise<{ success: boolean; likes: number; changed?: boolean }> => {
   try {
     const response = await fetch(`${API_URL}/recordings/${recordingId}/like`, {
       method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(userId !== undefined ? { user_id: userId } : {}),
     });
     return handleResponse(response);
   } catch (error) {
@@ -228,11 +303,19 @@ export const likeRecording = async (recordingId: number): Promise<{ success: boo
 /**
  * 좋아요 취소
  * @param recordingId - 녹음 ID
+ * @param userId - 사용자 ID (선택, 주면 같은 사용자의 중복 요청은 반영되지 않음)
  */
-export const unlikeRecording = async (recordingId: number): Promise<{ success: boolean; likes: number }> => {
+export const unlikeRecording = async (
+  recordingId: number,
+  userId?: number
+): Promise<{ success: boolean; likes: number; changed?: boolean }> => {
   try {
     const response = await fetch(`${API_URL}/recordings/${recordingId}/unlike`, {
       method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(userId !== undefined ? { user_id: userId } : {}),
     });
     return handleResponse(response);
   } catch (error) {
@@ -272,6 +355,20 @@ export const updateRecording = async (
   }
 };
 
+/**
+ * 비동기 처리 작업 상태 조회 (async 업로드 후 폴링)
+ * @param jobId - 작업 ID
+ */
+export const getJob = async (jobId: string): Promise<{ success: boolean; job: ProcessingJob; recording: Recording | null }> => {
+  try {
+    const response = await fetch(`${API_URL}/jobs/${jobId}`);
+    return handleResponse(response);
+  } catch (error) {
+    console.error('getJob error:', error);
+    throw error;
+  }
+};
+
 // ===== 오디오 파일 =====
 
 /**
@@ -285,13 +382,27 @@ export const getAudioUrl = (filename: string): string => {
 // ===== 통계 API =====
 
 /**
- * 감정별 통계 조회
- * @param userId - 특정 사용자만 통계 (선택)
+ * 감정별 통계 조회 (서버에서 집계)
+ * @param options - 조회 조건 (userId, startDate/endDate: YYYY-MM-DD, district, isUploaded, bucket)
  */
-export const getEmotionStats = async (userId?: number): Promise<{ success: boolean; stats: EmotionStats }> => {
+export const getEmotionStats = async (options?: {
+  userId?: number;
+  startDate?: string;
+  endDate?: string;
+  district?: string;
+  isUploaded?: boolean;
+  bucket?: 'day' | 'month';
+}): Promise<{ success: boolean } & EmotionStats> => {
   try {
-    const params = userId ? `?user_id=${userId}` : '';
-    const response = await fetch(`${API_URL}/emotions/stats${params}`);
+    const params = new URLSearchParams();
+    if (options?.userId) params.append('user_id', options.userId.toString());
+    if (options?.startDate) params.append('start_date', options.startDate);
+    if (options?.endDate) params.append('end_date', options.endDate);
+    if (options?.district) params.append('district', options.district);
+    if (options?.isUploaded !== undefined) params.append('is_uploaded', options.isUploaded.toString());
+    if (options?.bucket) params.append('bucket', options.bucket);
+
+    const response = await fetch(`${API_URL}/emotions/stats?${params}`);
     return handleResponse(response);
   } catch (error) {
     console.error('getEmotionStats error:', error);
@@ -375,6 +486,7 @@ export default {
   createOrGetUser,
   getAllUsers,
   getUser,
+  getArchiveSummary,
   
   // 녹음
   uploadRecording,
@@ -384,6 +496,7 @@ export default {
   likeRecording,
   unlikeRecording,
   updateRecording,
+  getJob,
   
   // 오디오
   getAudioUrl,
@@ -1,43 +1,32 @@
 """
 district 컬럼 추가 스크립트
+DATABASE_URL 기준으로 SQLite, PostgreSQL 모두 지원 (db_config.py)
 """
-import sqlite3
-from pathlib import Path
+import os
 
-db_path = Path('instance/revo.db')
+from sqlalchemy import String, inspect
 
-if not db_path.exists():
+from db_config import create_db_engine, sqlite_database_path
+from migrate_db import add_missing_columns
+
+engine = create_db_engine()
+
+db_path = sqlite_database_path(engine)
+if db_path and not os.path.exists(db_path):
     print("데이터베이스 파일이 없습니다.")
     exit(1)
 
-print(f"데이터베이스 파일: {db_path}")
-
-conn = sqlite3.connect(str(db_path))
-cursor = conn.cursor()
+print(f"데이터베이스: {engine.url.render_as_string(hide_password=True)}")
 
 try:
-    # 현재 컬럼 확인
-    cursor.execute("PRAGMA table_info(recordings)")
-    columns = [row[1] for row in cursor.fetchall()]
-    print(f"현재 컬럼: {columns}")
-    
     # district 컬럼 확인 및 추가
-    if 'district' not in columns:
-        print("district 컬럼 추가 중...")
-        cursor.execute("ALTER TABLE recordings ADD COLUMN district VARCHAR(50)")
-        conn.commit()
-        print("✅ district 컬럼 추가 완료!")
-    else:
-        print("✓ district 컬럼이 이미 존재합니다")
-    
+    with engine.begin() as conn:
+        add_missing_columns(conn, 'recordings', [('district', String(50), None, True)])
+
     # 최종 확인
-    cursor.execute("PRAGMA table_info(recordings)")
-    columns = [row[1] for row in cursor.fetchall()]
+    columns = [column['name'] for column in inspect(engine).get_columns('recordings')]
     print(f"최종 컬럼: {columns}")
-    
+
 except Exception as e:
-    conn.rollback()
     print(f"❌ 오류: {e}")
     raise
-finally:
-    conn.close()
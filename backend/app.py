@@ -7,13 +7,29 @@ from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 import os
 import uuid
+import hashlib
 from datetime import datetime, timezone, timedelta
-from werkzeug.utils import secure_filename
-import whisper
+from werkzeug.utils import secure_filename, safe_join
+from werkzeug.exceptions import RequestEntityTooLarge
 from dotenv import load_dotenv
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
 
-from models import db, User, Recording, EmotionType, get_kst_now
-from services import analyze_text_with_gpt, extract_keywords_simple
+from db_config import DATABASE_URL, engine_options, configure_engine
+from models import db, User, Recording, ProcessingJob, ProcessingStatus, EmotionType, UserMonthEmotionStat, get_kst_now
+from services import analyze_text_with_gpt, extract_keywords_simple, get_analysis_memo_stats, get_gpt_stats
+from jobs import JobWorkerPool, enqueue_job
+from cache import get_cache, hash_file
+from audio_utils import get_audio_duration
+from ingest import receive_upload, UploadError
+from stats import emotion_stats, archive_summary, parse_date, recording_filters, StatsQueryError
+from pagination import clamp_page_size, paginate_recordings, InvalidCursorError
+from search import ensure_search_index, index_recording, search_recordings, unindex_recording, SearchQueryError
+import stt
+import rollups
+import keyword_index
+import likes
+from like_buffer import LikeBuffer, LIKE_BUFFER
 
 # 환경변수 로드
 load_dotenv()
@@ -29,8 +45,9 @@ else:
     # 프로덕션 환경: 특정 도메인만 허용
     CORS(app, origins=allowed_origins)
 
-# 데이터베이스 설정
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///revo.db'
+# 데이터베이스 설정 (DATABASE_URL, 엔진/풀 옵션은 db_config.py 참고)
+app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(DATABASE_URL)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 
@@ -39,22 +56,181 @@ UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'm4a', 'ogg', 'webm'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 
+# 요청 본문 전체 크기 제한 (파일 + 폼 필드 여유분)
+# Content-Length가 이보다 크면 본문을 읽기 전에 413으로 거절
+app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE + 1024 * 1024
+
+# 비동기 처리 기본값 (요청의 async 값으로 개별 지정 가능)
+ASYNC_PROCESSING = os.getenv('ASYNC_PROCESSING', 'false').lower() in ('1', 'true', 'yes')
+
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Whisper 모델 로드
-print("Whisper 모델 로딩 중...")
-whisper_model = whisper.load_model("base")
-print("Whisper 모델 로드 완료!")
+# 오디오 파일 MIME 타입
+AUDIO_MIME_TYPES = {
+    'wav': 'audio/wav',
+    'mp3': 'audio/mpeg',
+    'm4a': 'audio/mp4',
+    'ogg': 'audio/ogg',
+    'webm': 'audio/webm',
+    'mp4': 'audio/mp4',
+}
+
+# 오디오 응답 캐시 기간 (초, 기본 1년) - uuid 파일명이라 같은 URL의 내용은 바뀌지 않음
+AUDIO_CACHE_MAX_AGE = int(os.getenv('AUDIO_CACHE_MAX_AGE', str(365 * 24 * 60 * 60)))
+
+# Whisper 모델은 워커마다 로드하지 않음
+# - WHISPER_SERVER_URL 설정 시: 공유 추론 서버(whisper_server.py) 사용
+# - 미설정 시: 첫 STT 요청에서 이 프로세스에 한 번만 로드
+if stt.WHISPER_SERVER_URL:
+    print(f"Whisper 추론 서버 사용: {stt.WHISPER_SERVER_URL}")
+else:
+    print("Whisper 모델은 첫 STT 요청 시 로드됩니다. (WHISPER_SERVER_URL 미설정)")
 
 # 데이터베이스 초기화
 with app.app_context():
+    configure_engine(db.engine)  # SQLite PRAGMA (WAL, busy_timeout 등) - 첫 연결 전에 등록
     db.create_all()
+    with db.engine.begin() as conn:
+        ensure_search_index(conn)  # 검색 색인 (SQLite FTS5 테이블/트리거, 없을 때만 생성, 빠진 녹음 색인)
+        keyword_index.ensure_keyword_index(conn)  # 키워드 색인 (비어 있으면 기존 녹음으로 채움)
+        rollups.ensure_rollups(conn)  # 사용자별 집계 (비어 있으면 기존 녹음으로 채움)
     print("데이터베이스 초기화 완료!")
 
 def allowed_file(filename):
     """허용된 파일 확장자 확인"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def is_async_request(form=None):
+    """요청이 비동기 처리 모드인지 확인 (폼/쿼리의 async 값, 없으면 ASYNC_PROCESSING 기본값)"""
+    value = (form if form is not None else request.form).get('async') or request.args.get('async')
+    if value is None:
+        return ASYNC_PROCESSING
+    return value.strip().lower() in ('1', 'true', 'yes')
+
+def transcribe_audio(filepath, audio_hash=None):
+    """
+    Whisper로 STT 처리
+    같은 오디오(해시)의 결과가 캐시에 있으면 Whisper를 건너뜀
+    실패 시 예외를 그대로 올림 (FileNotFoundError: 파일/ffmpeg 문제)
+    """
+    cache = get_cache()
+    if cache is not None and audio_hash:
+        cached = cache.get_transcript(audio_hash)
+        if cached is not None:
+            print(f"STT 캐시 히트: {audio_hash[:12]}... -> {cached}")
+            return cached
+    
+    print("STT 처리 중... (Whisper 사용)")
+    print(f"Whisper에 전달할 파일 경로: {filepath}")
+    print(f"파일 절대 경로: {os.path.abspath(filepath)}")
+    
+    # 파일 존재 재확인
+    if not os.path.exists(filepath):
+        print(f"ERROR: 파일이 존재하지 않습니다: {filepath}")
+        raise FileNotFoundError(f'파일을 찾을 수 없습니다: {filepath}')
+    
+    try:
+        # ffmpeg 확인 (Windows에서 필요)
+        import subprocess
+        try:
+            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True, timeout=5)
+            print("ffmpeg 확인 완료")
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            print("경고: ffmpeg가 설치되어 있지 않거나 PATH에 없습니다.")
+            print("webm 파일 처리를 위해 ffmpeg가 필요할 수 있습니다.")
+        
+        text = stt.transcribe(filepath, language='ko')
+    except FileNotFoundError as e:
+        print(f"Whisper 파일 찾기 오류: {str(e)}")
+        print(f"시도한 경로: {filepath}")
+        print(f"파일 존재 여부: {os.path.exists(filepath)}")
+        if os.path.exists(filepath):
+            print(f"파일은 존재하지만 Whisper가 찾지 못함 - ffmpeg 설치 필요할 수 있음")
+        raise
+    except Exception as whisper_error:
+        print(f"Whisper 처리 오류: {str(whisper_error)}")
+        import traceback
+        print(traceback.format_exc())
+        raise
+    transcript = text.strip()
+    print(f"Whisper STT 완료: {transcript}")
+    
+    if cache is not None and audio_hash:
+        cache.set_transcript(audio_hash, transcript)
+    return transcript
+
+def analyze_transcript(transcript):
+    """
+    텍스트 키워드/감정 분석
+    Returns:
+        tuple: (쉼표로 구분된 키워드 문자열, EmotionType)
+    """
+    print(f"최종 사용 텍스트: {transcript}")
+    print(f"텍스트 길이: {len(transcript)}")
+    
+    # ChatGPT로 키워드 및 감정 분석 (같은 텍스트는 services에서 캐시된 결과 사용)
+    print("=" * 50)
+    print("GPT 분석 시작...")
+    print(f"분석할 텍스트: {transcript}")
+    print("=" * 50)
+    analysis = analyze_text_with_gpt(transcript)
+    print("=" * 50)
+    print(f"GPT 분석 완료 - 키워드: {analysis['keywords']}, 감정: {analysis['emotion'].value}")
+    print("=" * 50)
+    
+    # 키워드가 없으면 간단한 키워드 추출 사용
+    if not analysis['keywords']:
+        analysis['keywords'] = extract_keywords_simple(transcript)
+    
+    keywords_str = ','.join(analysis['keywords'])
+    emotion = analysis['emotion']
+    
+    print(f"분석 완료 - 키워드: {keywords_str}, 감정: {emotion.value}")
+    return keywords_str, emotion
+
+def process_recording_job(recording, job):
+    """
+    비동기 작업 처리 (워커 스레드에서 실행)
+    duration 계산 -> STT -> 분석 후 녹음 정보 갱신
+    """
+    filepath = os.path.join(os.path.abspath(UPLOAD_FOLDER), recording.audio_file)
+    before = rollups.snapshot(recording)
+    
+    recording.duration = get_audio_duration(filepath)
+    if job.transcript:
+        transcript = job.transcript
+    else:
+        audio_hash = hash_file(filepath) if get_cache() is not None else None
+        transcript = transcribe_audio(filepath, audio_hash)
+    keywords_str, emotion = analyze_transcript(transcript)
+    
+    recording.content = transcript
+    recording.keywords = keywords_str
+    recording.emotion = emotion
+    
+    # 임시 감정값으로 집계된 부분을 분석 결과로 교체 (작업 완료 커밋에 함께 반영)
+    rollups.update_recording(before, recording)
+    keyword_index.update_recording(recording)
+    index_recording(recording)
+
+# 비동기 처리 워커 풀 (JOB_WORKERS=0이면 비활성화)
+job_pool = JobWorkerPool(app, process_recording_job)
+job_pool.start()
+
+# 좋아요 쓰기 지연 버퍼 (LIKE_BUFFER=true일 때만, 기본은 요청마다 바로 반영)
+like_buffer = LikeBuffer(app) if LIKE_BUFFER else None
+if like_buffer:
+    like_buffer.start()
+
+def merge_pending_likes(recording_dicts):
+    """좋아요 버퍼 사용 시 아직 DB에 반영되지 않은 좋아요 증감을 응답에 더함"""
+    return like_buffer.merge(recording_dicts) if like_buffer else recording_dicts
+
+@app.errorhandler(413)
+def request_entity_too_large(error):
+    """요청 본문이 MAX_CONTENT_LENGTH를 넘는 경우"""
+    return jsonify({'error': f'파일 크기가 너무 큽니다. (최대 {MAX_FILE_SIZE // (1024 * 1024)}MB)'}), 413
+
 # ==================== API 엔드포인트 ====================
 
 @app.route('/api/health', methods=['GET'])
@@ -63,9 +239,25 @@ def health_check():
     return jsonify({
         'status': 'ok',
         'message': '서버가 정상적으로 실행 중입니다.',
-        'timestamp': get_kst_now().isoformat()
+        'timestamp': get_kst_now().isoformat(),
+        'like_buffer': like_buffer.stats() if like_buffer else {'enabled': False},
+        'gpt': get_gpt_stats()  # 프로세스(워커)별 ChatGPT 동시 호출/재시도 통계
     })
 
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """STT/분석 캐시 히트/미스 통계"""
+    try:
+        cache = get_cache()
+        return jsonify({
+            'success': True,
+            'enabled': cache is not None,
+            'stats': cache.stats() if cache is not None else None,
+            'gpt_memo': get_analysis_memo_stats()  # 프로세스(워커)별 메모리 캐시
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ==================== 사용자 API ====================
 
 @app.route('/api/users', methods=['POST'])
@@ -125,10 +317,44 @@ def get_user(user_id):
 def get_all_users():
     """모든 사용자 조회"""
     try:
-        users = User.query.all()
+        # 사용자별 녹음 수는 월 x 감정 롤업 행의 합 (녹음 테이블을 훑지 않고 사용자의 롤업 행만 읽음)
+        # 롤업이 비어 있는 기존 DB는 앱 시작/migrate_db에서 먼저 채우므로 사용자 조회(COUNT)와 같은 값
+        recording_count = (
+            select(func.coalesce(func.sum(UserMonthEmotionStat.count), 0))
+            .where(UserMonthEmotionStat.user_id == User.id)
+            .scalar_subquery()
+        )
+        rows = db.session.execute(select(User, recording_count).order_by(User.id)).all()
         return jsonify({
             'success': True,
-            'users': [user.to_dict() for user in users]
+            'users': [user.to_dict(recording_count=count) for user, count in rows]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/users/<int:user_id>/archive', methods=['GET'])
+def get_user_archive(user_id):
+    """
+    아카이브 요약 (월별 감정 개수, 많이 기록한 동네, 자주 나온 키워드)
+    Query params:
+    - month: YYYY-MM (선택, 없으면 전체 기간)
+    - top: 동네/키워드 상위 개수 (기본 4, 최대 20)
+    """
+    try:
+        user = db.session.get(User, user_id)
+        if not user:
+            return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
+        
+        top = max(1, min(request.args.get('top', default=4, type=int), 20))
+        try:
+            summary = archive_summary(user_id, month=request.args.get('month') or None, top=top)
+        except StatsQueryError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'user_id': user_id,
+            **summary
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -143,127 +369,111 @@ def create_recording():
     - audio: 오디오 파일
     - user_id: 사용자 ID
     - highlight_time: 하이라이트 구간 (선택, 예: "1:30")
+    - async: true면 파일만 저장하고 202 + 작업 ID 반환, STT/분석은 백그라운드에서 처리 (선택)
     """
+    audio = None
     try:
+        # 요청 본문을 한 번 읽으면서 폼 필드를 모으고 오디오 파트는 업로드 폴더의 임시 파일로 저장
+        # (크기 초과/오디오가 아닌 파일은 본문을 받는 도중 바로 중단)
+        upload_dir = os.path.abspath(UPLOAD_FOLDER)
+        os.makedirs(upload_dir, exist_ok=True)
+        try:
+            form, audio = receive_upload(request.stream, request.mimetype_params, upload_dir, MAX_FILE_SIZE)
+        except UploadError as upload_error:
+            print(f"업로드 거부: {upload_error.message}")
+            return jsonify({'error': upload_error.message}), upload_error.status
+        
         # 파일 확인
-        if 'audio' not in request.files:
+        if audio is None:
             return jsonify({'error': '오디오 파일이 없습니다.'}), 400
         
-        file = request.files['audio']
-        user_id_str = request.form.get('user_id')
-        highlight_time = request.form.get('highlight_time')
-        frontend_transcript = request.form.get('transcript', '').strip()  # 프론트엔드에서 인식한 텍스트
-        district = request.form.get('district', '').strip()  # 위치 정보 (동/구)
+        user_id_str = form.get('user_id')
+        highlight_time = form.get('highlight_time')
+        frontend_transcript = form.get('transcript', '').strip()  # 프론트엔드에서 인식한 텍스트
+        district = form.get('district', '').strip()  # 위치 정보 (동/구)
         
         if not user_id_str:
+            audio.discard()
             return jsonify({'error': '사용자 ID가 필요합니다.'}), 400
         
         # user_id를 정수로 변환
         try:
             user_id = int(user_id_str)
         except (ValueError, TypeError):
+            audio.discard()
             return jsonify({'error': '사용자 ID가 올바르지 않습니다.'}), 400
         
         # 사용자 확인
         user = db.session.get(User, user_id)
         if not user:
+            audio.discard()
             return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
         
-        if file.filename == '':
-            return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
-        
-        if not allowed_file(file.filename):
+        if not allowed_file(audio.filename):
+            audio.discard()
             return jsonify({'error': '허용되지 않은 파일 형식입니다.'}), 400
         
         # 파일 저장
-        filename = secure_filename(file.filename)
+        filename = secure_filename(audio.filename)
         if not filename:
             # 파일명이 없으면 확장자만 사용
-            file_ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else 'webm'
+            file_ext = audio.filename.rsplit('.', 1)[1].lower() if '.' in audio.filename else 'webm'
             filename = f"recording.{file_ext}"
         
         unique_filename = f"{uuid.uuid4()}_{filename}"
-        
-        # 업로드 폴더 절대 경로
-        upload_dir = os.path.abspath(UPLOAD_FOLDER)
-        os.makedirs(upload_dir, exist_ok=True)
-        
         filepath = os.path.join(upload_dir, unique_filename)
         
         print(f"파일 저장 시작: {filename}")
         print(f"저장 경로: {filepath}")
-        print(f"업로드 폴더 존재: {os.path.exists(upload_dir)}")
         
+        # 검사를 통과한 임시 파일을 최종 경로로 이름 변경
         try:
-            file.save(filepath)
+            audio.save(filepath)
         except Exception as save_error:
+            audio.discard()
             print(f"파일 저장 오류: {str(save_error)}")
             return jsonify({'error': f'파일 저장 실패: {str(save_error)}'}), 500
-        
-        # 파일 저장 확인
-        if not os.path.exists(filepath):
-            print(f"파일이 저장되지 않았습니다: {filepath}")
-            return jsonify({'error': '파일 저장에 실패했습니다.'}), 500
-        
-        # 파일 크기 확인
-        try:
-            file_size = os.path.getsize(filepath)
-        except Exception as size_error:
-            print(f"파일 크기 확인 오류: {str(size_error)}")
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            return jsonify({'error': f'파일 크기 확인 실패: {str(size_error)}'}), 500
-        
-        if file_size > MAX_FILE_SIZE:
-            os.remove(filepath)
-            return jsonify({'error': '파일 크기가 너무 큽니다. (최대 50MB)'}), 400
-        
-        if file_size == 0:
-            os.remove(filepath)
-            return jsonify({'error': '빈 파일입니다.'}), 400
+        audio_hash = audio.sha256
         
         print(f"파일 업로드 완료: {unique_filename}")
         print(f"파일 경로: {filepath}")
-        print(f"파일 크기: {file_size} bytes")
-        print(f"파일 존재 확인: {os.path.exists(filepath)}")
+        print(f"파일 크기: {audio.size} bytes")
+        print(f"파일 형식: {audio.audio_format}")
+        
+        # 비동기 처리 모드: 파일과 pending 상태의 녹음만 저장하고 바로 202 응답
+        if is_async_request(form):
+            recording = Recording(
+                user_id=user_id,
+                content=frontend_transcript,
+                keywords=None,
+                audio_file=unique_filename,
+                emotion=EmotionType.CONFUSION,  # 처리 완료 전 임시값 (보통)
+                highlight_time=highlight_time,
+                district=district if district else None,
+                status=ProcessingStatus.PENDING,
+                recorded_at=get_kst_now()
+            )
+            db.session.add(recording)
+            rollups.add_recording(recording)
+            keyword_index.add_recording(recording)
+            index_recording(recording)
+            job = enqueue_job(recording, transcript=frontend_transcript)
+            db.session.commit()
+            
+            job_pool.notify()
+            
+            print(f"비동기 처리 작업 등록: {job.id} (녹음 ID: {recording.id})")
+            
+            return jsonify({
+                'success': True,
+                'message': '녹음이 접수되었습니다. 분석이 끝나면 상태가 done으로 바뀝니다.',
+                'job': job.to_dict(),
+                'status_url': f'/api/jobs/{job.id}',
+                'recording': recording.to_dict()
+            }), 202
         
-        # 오디오 duration 계산
-        audio_duration = None
-        try:
-            # 방법 1: pydub 사용 시도
-            try:
-                from pydub import AudioSegment
-                audio = AudioSegment.from_file(filepath)
-                audio_duration = len(audio) / 1000.0  # 밀리초를 초로 변환
-                print(f"오디오 duration 계산 완료 (pydub): {audio_duration}초")
-            except ImportError:
-                # 방법 2: ffprobe 사용 (ffmpeg의 일부)
-                import subprocess
-                import json
-                
-                # ffprobe로 duration 추출
-                cmd = [
-                    'ffprobe',
-                    '-v', 'quiet',
-                    '-print_format', 'json',
-                    '-show_format',
-                    filepath
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    duration_str = data.get('format', {}).get('duration')
-                    if duration_str:
-                        audio_duration = float(duration_str)
-                        print(f"오디오 duration 계산 완료 (ffprobe): {audio_duration}초")
-                    else:
-                        print("오디오 duration 계산 실패: ffprobe에서 duration을 찾을 수 없음")
-                else:
-                    print(f"오디오 duration 계산 실패: ffprobe 실행 실패 - {result.stderr}")
-        except Exception as duration_error:
-            print(f"오디오 duration 계산 실패 (계속 진행): {str(duration_error)}")
-            # duration 계산 실패해도 계속 진행 (기존 녹음과의 호환성을 위해)
+        # 오디오 duration 계산 (헤더만 읽음, 실패 시 ffprobe)
+        audio_duration = get_audio_duration(filepath, audio.audio_format)
         
         # STT 처리
         # 프론트엔드에서 인식한 텍스트가 있으면 우선 사용, 없으면 Whisper 사용
@@ -274,63 +484,14 @@ def create_recording():
             print("=" * 50)
             transcript = frontend_transcript
         else:
-            print("STT 처리 중... (Whisper 사용)")
-            print(f"Whisper에 전달할 파일 경로: {filepath}")
-            print(f"파일 절대 경로: {os.path.abspath(filepath)}")
-            
-            # 파일 존재 재확인
-            if not os.path.exists(filepath):
-                print(f"ERROR: 파일이 존재하지 않습니다: {filepath}")
-                return jsonify({'error': '파일을 찾을 수 없습니다.'}), 500
-            
             try:
-                # ffmpeg 확인 (Windows에서 필요)
-                import subprocess
-                try:
-                    subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True, timeout=5)
-                    print("ffmpeg 확인 완료")
-                except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                    print("경고: ffmpeg가 설치되어 있지 않거나 PATH에 없습니다.")
-                    print("webm 파일 처리를 위해 ffmpeg가 필요할 수 있습니다.")
-                
-                result = whisper_model.transcribe(filepath, language='ko')
+                transcript = transcribe_audio(filepath, audio_hash)
             except FileNotFoundError as e:
-                print(f"Whisper 파일 찾기 오류: {str(e)}")
-                print(f"시도한 경로: {filepath}")
-                print(f"파일 존재 여부: {os.path.exists(filepath)}")
-                if os.path.exists(filepath):
-                    print(f"파일은 존재하지만 Whisper가 찾지 못함 - ffmpeg 설치 필요할 수 있음")
                 return jsonify({'error': f'오디오 파일 처리 실패: {str(e)}. ffmpeg 설치가 필요할 수 있습니다.'}), 500
             except Exception as whisper_error:
-                print(f"Whisper 처리 오류: {str(whisper_error)}")
-                import traceback
-                error_trace = traceback.format_exc()
-                print(error_trace)
                 return jsonify({'error': f'STT 처리 실패: {str(whisper_error)}'}), 500
-            transcript = result['text'].strip()
-            print(f"Whisper STT 완료: {transcript}")
-        
-        print(f"최종 사용 텍스트: {transcript}")
-        print(f"텍스트 길이: {len(transcript)}")
-        
-        # ChatGPT로 키워드 및 감정 분석
-        print("=" * 50)
-        print("GPT 분석 시작...")
-        print(f"분석할 텍스트: {transcript}")
-        print("=" * 50)
-        analysis = analyze_text_with_gpt(transcript)
-        print("=" * 50)
-        print(f"GPT 분석 완료 - 키워드: {analysis['keywords']}, 감정: {analysis['emotion'].value}")
-        print("=" * 50)
         
-        # 키워드가 없으면 간단한 키워드 추출 사용
-        if not analysis['keywords']:
-            analysis['keywords'] = extract_keywords_simple(transcript)
-        
-        keywords_str = ','.join(analysis['keywords'])
-        emotion = analysis['emotion']
-        
-        print(f"분석 완료 - 키워드: {keywords_str}, 감정: {emotion.value}")
+        keywords_str, emotion = analyze_transcript(transcript)
         
         # DB에 녹음 기록 저장
         recording = Recording(
@@ -346,6 +507,9 @@ def create_recording():
         )
         
         db.session.add(recording)
+        rollups.add_recording(recording)
+        keyword_index.add_recording(recording)
+        index_recording(recording)
         db.session.commit()
         
         return jsonify({
@@ -354,16 +518,18 @@ def create_recording():
             'recording': recording.to_dict()
         }), 201
         
+    except RequestEntityTooLarge as e:
+        return request_entity_too_large(e)
     except Exception as e:
         db.session.rollback()
         import traceback
         error_trace = traceback.format_exc()
         print(f"오류 발생: {str(e)}")
         print(f"상세 오류:\n{error_trace}")
-        # 실패 시 업로드된 파일 삭제
-        if 'filepath' in locals() and os.path.exists(filepath):
+        # 실패 시 업로드된 파일 삭제 (최종 경로로 옮기기 전이면 임시 파일)
+        if audio is not None and os.path.exists(audio.filepath):
             try:
-                os.remove(filepath)
+                os.remove(audio.filepath)
             except:
                 pass
         return jsonify({
@@ -378,15 +544,37 @@ def get_all_recordings():
     모든 녹음 조회 (피드)
     Query params:
     - user_id: 특정 사용자만 조회 (선택)
-    - limit: 개수 제한 (기본 50)
+    - limit: 페이지 크기 (기본 50, 최대 MAX_PAGE_SIZE)
+    - cursor: 이전 응답의 next_cursor (선택, 없으면 첫 페이지)
     - is_uploaded: 업로드된 기록만 조회 (선택, true/false)
+    - emotion: 감정 (선택, 행복/화남/슬픔/보통/놀람/신남)
+    - district: 동네 (선택)
+    - start_date / end_date: 녹음 기간 (선택, YYYY-MM-DD, 양 끝 포함)
     """
     try:
         user_id = request.args.get('user_id', type=int)
-        limit = request.args.get('limit', default=50, type=int)
+        limit = clamp_page_size(request.args.get('limit', type=int))
+        cursor = request.args.get('cursor', type=str)
         is_uploaded = request.args.get('is_uploaded', type=str)
+        emotion = request.args.get('emotion') or None
+        
+        if emotion is not None:
+            try:
+                emotion_type = EmotionType(emotion)
+            except ValueError:
+                return jsonify({'error': f'알 수 없는 감정입니다: {emotion}'}), 400
+        
+        try:
+            conditions = recording_filters(
+                start_date=parse_date(request.args.get('start_date'), 'start_date'),
+                end_date=parse_date(request.args.get('end_date'), 'end_date'),
+                district=request.args.get('district') or None
+            )
+        except StatsQueryError as e:
+            return jsonify({'error': str(e)}), 400
         
-        query = Recording.query
+        # 작성자 이름을 같은 쿼리에서 함께 조회 (행마다 사용자 조회 방지)
+        query = Recording.query.options(joinedload(Recording.user))
         
         if user_id:
             query = query.filter_by(user_id=user_id)
@@ -396,12 +584,116 @@ def get_all_recordings():
             is_uploaded_bool = is_uploaded.lower() == 'true'
             query = query.filter_by(is_uploaded=is_uploaded_bool)
         
-        recordings = query.order_by(Recording.recorded_at.desc()).limit(limit).all()
+        # 감정/동네/기간 필터 (사용자 지정 시 (user_id, emotion|district, recorded_at, id) 인덱스 순서로 처리)
+        if emotion is not None:
+            query = query.filter(Recording.emotion == emotion_type)
+        query = query.filter(*conditions)
+        
+        try:
+            recordings, next_cursor = paginate_recordings(query, Recording, limit, cursor)
+        except InvalidCursorError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'count': len(recordings),
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'recordings': merge_pending_likes([rec.to_dict() for rec in recordings])
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/recordings/search', methods=['GET'])
+def search_recordings_api():
+    """
+    녹음 검색 (내용 + 키워드, search.py)
+    Query params:
+    - q: 검색어 (필수, 공백으로 구분한 단어를 모두 포함하는 녹음)
+    - sort: relevance(관련도순, 기본) 또는 recent(최신순)
+    - user_id / is_uploaded / limit / cursor: 피드와 같음
+    """
+    try:
+        limit = clamp_page_size(request.args.get('limit', type=int))
+        is_uploaded = request.args.get('is_uploaded', type=str)
+        
+        try:
+            recordings, next_cursor, sort, truncated = search_recordings(
+                request.args.get('q'), limit,
+                cursor=request.args.get('cursor', type=str),
+                sort=request.args.get('sort') or 'relevance',
+                user_id=request.args.get('user_id', type=int),
+                is_uploaded=is_uploaded.lower() == 'true' if is_uploaded is not None else None
+            )
+        except (SearchQueryError, InvalidCursorError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'query': request.args.get('q').strip(),
+            'sort': sort,
+            'truncated': truncated,  # 관련도순에서 가장 최근 SEARCH_RANK_WINDOW개보다 오래된 일치 항목을 뺐는지
+            'count': len(recordings),
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'recordings': merge_pending_likes([rec.to_dict() for rec in recordings])
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ==================== 키워드 API ====================
+
+@app.route('/api/keywords', methods=['GET'])
+def get_top_keywords():
+    """
+    자주 나온 키워드 (녹음 수 내림차순, keyword_index.py)
+    Query params:
+    - limit: 개수 (기본 50, 최대 MAX_PAGE_SIZE)
+    """
+    try:
+        limit = clamp_page_size(request.args.get('limit', type=int))
+        keywords = keyword_index.top_keywords(limit)
+        return jsonify({
+            'success': True,
+            'count': len(keywords),
+            'keywords': [keyword.to_dict() for keyword in keywords]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/keywords/<path:name>/recordings', methods=['GET'])
+def get_keyword_recordings(name):
+    """
+    키워드가 연결된 녹음 (최신순, 피드와 같은 필터/커서)
+    Query params:
+    - user_id / is_uploaded / limit / cursor: 피드와 같음
+    """
+    try:
+        keyword = keyword_index.find_keyword(name)
+        if not keyword:
+            return jsonify({'error': '키워드를 찾을 수 없습니다.'}), 404
+        
+        user_id = request.args.get('user_id', type=int)
+        limit = clamp_page_size(request.args.get('limit', type=int))
+        cursor = request.args.get('cursor', type=str)
+        is_uploaded = request.args.get('is_uploaded', type=str)
+        
+        query = Recording.query.options(joinedload(Recording.user))
+        if is_uploaded is not None:
+            query = query.filter_by(is_uploaded=is_uploaded.lower() == 'true')
+        
+        try:
+            recordings, next_cursor = keyword_index.keyword_recordings(query, keyword, limit, cursor, user_id=user_id)
+        except InvalidCursorError as e:
+            return jsonify({'error': str(e)}), 400
         
         return jsonify({
             'success': True,
+            'keyword': keyword.to_dict(),
             'count': len(recordings),
-            'recordings': [rec.to_dict() for rec in recordings]
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'recordings': merge_pending_likes([rec.to_dict() for rec in recordings])
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -416,7 +708,7 @@ def get_recording(recording_id):
         
         return jsonify({
             'success': True,
-            'recording': recording.to_dict()
+            'recording': merge_pending_likes([recording.to_dict()])[0]
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -434,7 +726,10 @@ def delete_recording(recording_id):
         if os.path.exists(filepath):
             os.remove(filepath)
         
-        # DB에서 삭제
+        # DB에서 삭제 (집계 테이블/키워드 색인/검색 조각 색인도 같은 트랜잭션에서 차감)
+        rollups.remove_recording(recording)
+        keyword_index.remove_recording(recording)
+        unindex_recording(recording)
         db.session.delete(recording)
         db.session.commit()
         
@@ -448,39 +743,46 @@ def delete_recording(recording_id):
 
 @app.route('/api/recordings/<int:recording_id>/like', methods=['POST'])
 def like_recording(recording_id):
-    """좋아요 추가"""
-    try:
-        recording = db.session.get(Recording, recording_id)
-        if not recording:
-            return jsonify({'error': '녹음을 찾을 수 없습니다.'}), 404
-        
-        recording.likes += 1
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'likes': recording.likes
-        })
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+    """
+    좋아요 추가
+    Body (선택): { "user_id": 1 } - 주면 같은 사용자의 중복 좋아요는 무시
+    """
+    return change_like(recording_id, like_buffer.like if like_buffer else likes.like)
 
 @app.route('/api/recordings/<int:recording_id>/unlike', methods=['POST'])
 def unlike_recording(recording_id):
-    """좋아요 취소"""
+    """
+    좋아요 취소 (0 아래로 내려가지 않음)
+    Body (선택): { "user_id": 1 } - 주면 좋아요한 사용자만 취소 가능
+    """
+    return change_like(recording_id, like_buffer.unlike if like_buffer else likes.unlike)
+
+def change_like(recording_id, action):
+    """좋아요/취소 공통 처리 (한 UPDATE 문으로 증감 - likes.py, 버퍼 사용 시 모아서 반영 - like_buffer.py)"""
     try:
-        recording = db.session.get(Recording, recording_id)
-        if not recording:
+        data = request.get_json(silent=True) or {}
+        user_id = data.get('user_id')
+        if user_id is not None:
+            try:
+                user_id = int(user_id)
+            except (ValueError, TypeError):
+                return jsonify({'error': '사용자 ID가 올바르지 않습니다.'}), 400
+            if not db.session.get(User, user_id):
+                return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
+        
+        count, changed = action(recording_id, user_id)
+        if count is None:
+            db.session.rollback()
             return jsonify({'error': '녹음을 찾을 수 없습니다.'}), 404
+        db.session.commit()
         
-        if recording.likes > 0:
-            recording.likes -= 1
-            db.session.commit()
-        
-        return jsonify({
+        result = {
             'success': True,
-            'likes': recording.likes
-        })
+            'likes': count
+        }
+        if user_id is not None:
+            result['changed'] = changed
+        return jsonify(result)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -494,6 +796,7 @@ def update_recording(recording_id):
             return jsonify({'error': '녹음을 찾을 수 없습니다.'}), 404
         
         data = request.get_json()
+        before = rollups.snapshot(recording)
         
         # 하이라이트 시간 업데이트
         if 'highlight_time' in data:
@@ -508,41 +811,71 @@ def update_recording(recording_id):
             # 업로드 여부가 False로 설정되면 업로드 날짜는 null로 유지 (기존 값 유지)
         
         recording.updated_at = get_kst_now()
+        rollups.update_recording(before, recording)
         db.session.commit()
         
         return jsonify({
             'success': True,
             'message': '녹음 정보가 업데이트되었습니다.',
-            'recording': recording.to_dict()
+            'recording': merge_pending_likes([recording.to_dict()])[0]
         })
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+# ==================== 처리 작업 API ====================
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """비동기 처리 작업 상태 조회 (폴링용)"""
+    try:
+        job = db.session.get(ProcessingJob, job_id)
+        if not job:
+            return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+        
+        return jsonify({
+            'success': True,
+            'job': job.to_dict(),
+            'recording': job.recording.to_dict() if job.recording else None
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ==================== 오디오 파일 API ====================
 
 @app.route('/api/audio/<filename>', methods=['GET'])
 def get_audio(filename):
-    """오디오 파일 다운로드/재생"""
+    """
+    오디오 파일 다운로드/재생
+    - Range 요청 시 206 부분 응답 (플레이어 탐색 시 전체 재다운로드 방지)
+    - ETag/Last-Modified 기반 조건부 요청 시 304
+    - 파일명이 uuid라 내용이 바뀌지 않으므로 장기 캐시(immutable)
+    """
     try:
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        if not os.path.exists(filepath):
+        upload_dir = os.path.abspath(UPLOAD_FOLDER)
+        filepath = safe_join(upload_dir, filename)
+        if filepath is None or not os.path.isfile(filepath):
             return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
         
         # 파일 확장자에 따라 MIME 타입 설정
-        mimetype = None
         file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
-        mime_types = {
-            'wav': 'audio/wav',
-            'mp3': 'audio/mpeg',
-            'm4a': 'audio/mp4',
-            'ogg': 'audio/ogg',
-            'webm': 'audio/webm',
-            'mp4': 'audio/mp4',
-        }
-        mimetype = mime_types.get(file_ext, 'application/octet-stream')
-        
-        return send_file(filepath, mimetype=mimetype)
+        mimetype = AUDIO_MIME_TYPES.get(file_ext, 'application/octet-stream')
+        
+        # 강한 ETag: 파일명 + 크기 + 수정 시각 (바이트 단위 Range 응답에 사용 가능)
+        stat = os.stat(filepath)
+        etag = hashlib.sha1(f"{filename}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8')).hexdigest()
+        
+        response = send_file(
+            filepath,
+            mimetype=mimetype,
+            conditional=True,
+            etag=etag,
+            last_modified=stat.st_mtime,
+            max_age=AUDIO_CACHE_MAX_AGE
+        )
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -550,26 +883,32 @@ def get_audio(filename):
 
 @app.route('/api/emotions/stats', methods=['GET'])
 def get_emotion_stats():
-    """감정별 통계"""
+    """
+    감정별 통계 (DB에서 GROUP BY로 집계)
+    Query params:
+    - user_id: 특정 사용자만 (선택)
+    - start_date / end_date: 기간 (선택, YYYY-MM-DD, 양 끝 포함)
+    - district: 동네 (선택)
+    - is_uploaded: 업로드 여부 (선택, true/false)
+    - bucket: day 또는 month (선택, 지정 시 구간별 집계 포함)
+    """
     try:
-        user_id = request.args.get('user_id', type=int)
-        
-        query = Recording.query
-        if user_id:
-            query = query.filter_by(user_id=user_id)
-        
-        recordings = query.all()
-        
-        # 감정별 카운트
-        emotion_counts = {}
-        for emotion_type in EmotionType:
-            count = sum(1 for rec in recordings if rec.emotion == emotion_type)
-            emotion_counts[emotion_type.value] = count
+        is_uploaded = request.args.get('is_uploaded', type=str)
+        try:
+            result = emotion_stats(
+                bucket=request.args.get('bucket') or None,
+                user_id=request.args.get('user_id', type=int),
+                start_date=parse_date(request.args.get('start_date'), 'start_date'),
+                end_date=parse_date(request.args.get('end_date'), 'end_date'),
+                district=request.args.get('district') or None,
+                is_uploaded=is_uploaded.lower() == 'true' if is_uploaded is not None else None
+            )
+        except StatsQueryError as e:
+            return jsonify({'error': str(e)}), 400
         
         return jsonify({
             'success': True,
-            'total': len(recordings),
-            'emotions': emotion_counts
+            **result
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
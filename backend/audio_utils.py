@@ -0,0 +1,438 @@
+"""
+오디오 파일 유틸리티
+- 파일 헤더(컨테이너 메타데이터)만 읽어서 재생 시간 계산 (전체 디코딩 없음, 보통 수 KB만 읽음)
+- 지원 형식: WAV(RIFF), MP3(Xing/Info/VBRI 또는 CBR), MP4/M4A(mvhd), Ogg(Vorbis/Opus), WebM/Matroska
+- 헤더 파싱에 실패하면 ffprobe로 대체
+"""
+import json
+import os
+import struct
+import subprocess
+
+# 형식 판별용 매직 바이트
+EBML_MAGIC = b'\x1a\x45\xdf\xa3'
+
+# ==================== 형식 판별 ====================
+
+def sniff_format(head):
+    """
+    파일 앞부분 바이트로 오디오 형식 판별
+
+    Args:
+        head: 파일 앞부분 (최소 12바이트 권장)
+    Returns:
+        str | None: 'wav', 'mp3', 'm4a', 'ogg', 'webm' 중 하나 (알 수 없으면 None)
+    """
+    if len(head) >= 12 and head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'wav'
+    if head[:4] == b'OggS':
+        return 'ogg'
+    if head[:4] == EBML_MAGIC:
+        return 'webm'
+    if len(head) >= 8 and head[4:8] == b'ftyp':
+        return 'm4a'
+    if head[:3] == b'ID3':
+        return 'mp3'
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0 and (head[1] >> 1) & 0x03 != 0:
+        return 'mp3'
+    return None
+
+# ==================== WAV ====================
+
+def _wav_duration(f, file_size):
+    f.seek(12)
+    byte_rate = None
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack('<4sI', header)
+        if chunk_id == b'fmt ':
+            fmt = f.read(min(chunk_size, 16))
+            byte_rate = struct.unpack('<I', fmt[8:12])[0]
+            f.seek(chunk_size - len(fmt) + (chunk_size & 1), os.SEEK_CUR)
+        elif chunk_id == b'data':
+            if not byte_rate:
+                return None
+            # 스트리밍 녹음은 data 크기가 0 또는 0xFFFFFFFF로 남아 있을 수 있음
+            remaining = file_size - f.tell()
+            if chunk_size == 0 or chunk_size > remaining:
+                chunk_size = remaining
+            return chunk_size / byte_rate
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+# ==================== MP3 ====================
+
+_MP3_BITRATES = {
+    # (MPEG1 여부, layer) -> kbps
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG1
+    2: [22050, 24000, 16000],  # MPEG2
+    0: [11025, 12000, 8000],   # MPEG2.5
+}
+
+def _parse_mp3_frame_header(header):
+    """MP3 프레임 헤더 4바이트 파싱 (유효하지 않으면 None)"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = 4 - ((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 2 or mpeg1:
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+    return {
+        'mpeg1': mpeg1,
+        'layer': layer,
+        'bitrate': _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000,
+        'sample_rate': _MP3_SAMPLE_RATES[version][sample_rate_index],
+        'samples_per_frame': samples_per_frame,
+        'mono': (header[3] >> 6) == 3,
+    }
+
+def _mp3_duration(f, file_size):
+    # ID3v2 태그 건너뛰기
+    f.seek(0)
+    head = f.read(10)
+    offset = 0
+    if head[:3] == b'ID3' and len(head) == 10:
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        offset = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+
+    # 첫 프레임 찾기 (태그 뒤의 패딩을 고려해 앞부분 일부만 검색)
+    f.seek(offset)
+    buf = f.read(64 * 1024)
+    frame = None
+    pos = 0
+    while pos < len(buf) - 4:
+        pos = buf.find(b'\xff', pos)
+        if pos < 0 or pos > len(buf) - 4:
+            break
+        frame = _parse_mp3_frame_header(buf[pos:pos + 4])
+        if frame:
+            break
+        pos += 1
+    if not frame:
+        return None
+
+    audio_start = offset + pos
+    frame_data = buf[pos:pos + 192]
+
+    # VBR 헤더 (Xing/Info: side info 뒤, VBRI: 헤더 + 32바이트 뒤)
+    if frame['mpeg1']:
+        side_info = 17 if frame['mono'] else 32
+    else:
+        side_info = 9 if frame['mono'] else 17
+    xing_offset = 4 + side_info
+    tag = frame_data[xing_offset:xing_offset + 4]
+    if tag in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', frame_data[xing_offset + 4:xing_offset + 8])[0]
+        if flags & 0x01:
+            frames = struct.unpack('>I', frame_data[xing_offset + 8:xing_offset + 12])[0]
+            return frames * frame['samples_per_frame'] / frame['sample_rate']
+    if frame_data[36:40] == b'VBRI':
+        frames = struct.unpack('>I', frame_data[50:54])[0]
+        return frames * frame['samples_per_frame'] / frame['sample_rate']
+
+    # CBR: 오디오 바이트 수 / 비트레이트 (끝의 ID3v1 태그 제외)
+    audio_end = file_size
+    if file_size >= 128:
+        f.seek(file_size - 128)
+        if f.read(3) == b'TAG':
+            audio_end -= 128
+    return (audio_end - audio_start) * 8 / frame['bitrate']
+
+# ==================== MP4 / M4A ====================
+
+def _iter_mp4_boxes(f, start, end):
+    """[start, end) 구간의 MP4 박스 (type, 본문 시작, 박스 끝) 순회"""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        body = pos + 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            body += 8
+        elif size == 0:
+            size = end - pos
+        if size < body - pos:
+            return
+        yield box_type, body, pos + size
+        pos += size
+
+def _mp4_duration(f, file_size):
+    for box_type, body, box_end in _iter_mp4_boxes(f, 0, file_size):
+        if box_type != b'moov':
+            continue
+        for child_type, child_body, _ in _iter_mp4_boxes(f, body, box_end):
+            if child_type != b'mvhd':
+                continue
+            f.seek(child_body)
+            version = f.read(4)[0]
+            if version == 1:
+                timescale, duration = struct.unpack('>IQ', f.read(28)[16:28])
+            else:
+                timescale, duration = struct.unpack('>II', f.read(16)[8:16])
+            return duration / timescale if timescale else None
+        return None
+    return None
+
+# ==================== Ogg (Vorbis / Opus) ====================
+
+def _ogg_duration(f, file_size):
+    # 첫 페이지의 식별 헤더에서 샘플레이트(Vorbis) 또는 pre-skip(Opus) 읽기
+    f.seek(0)
+    first_page = f.read(27 + 255 + 64)
+    if first_page[:4] != b'OggS':
+        return None
+    segments = first_page[26]
+    packet = first_page[27 + segments:]
+    if packet[:8] == b'OpusHead':
+        sample_rate = 48000  # Opus granule은 항상 48kHz 기준
+        pre_skip = struct.unpack('<H', packet[10:12])[0]
+    elif packet[:7] == b'\x01vorbis':
+        sample_rate = struct.unpack('<I', packet[12:16])[0]
+        pre_skip = 0
+    else:
+        return None
+    if not sample_rate:
+        return None
+
+    # 뒤에서부터 granule position이 있는 마지막 페이지 찾기
+    tail_size = min(file_size, 64 * 1024)
+    f.seek(file_size - tail_size)
+    tail = f.read(tail_size)
+    pos = tail.rfind(b'OggS')
+    while pos >= 0:
+        if pos + 14 <= len(tail):
+            granule = struct.unpack('<q', tail[pos + 6:pos + 14])[0]
+            if granule >= 0:
+                return max(granule - pre_skip, 0) / sample_rate
+        pos = tail.rfind(b'OggS', 0, pos)
+    return None
+
+# ==================== WebM / Matroska ====================
+
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_TIMECODE_SCALE = 0x2AD7B1
+_EBML_DURATION = 0x4489
+_EBML_CLUSTER = 0x1F43B675
+_EBML_CLUSTER_TIMECODE = 0xE7
+_EBML_SIMPLE_BLOCK = 0xA3
+_EBML_BLOCK_GROUP = 0xA0
+_EBML_BLOCK = 0xA1
+
+def _read_vint(data, pos, keep_marker=False):
+    """EBML 가변 길이 정수 읽기 -> (값, 다음 위치, 크기 미정 여부)"""
+    if pos >= len(data):
+        raise ValueError('EBML 데이터 부족')
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not (first & mask):
+        mask >>= 1
+        length += 1
+    if length > 8 or pos + length > len(data):
+        raise ValueError('잘못된 EBML 정수')
+    value = first if keep_marker else first & (mask - 1)
+    for byte in data[pos + 1:pos + length]:
+        value = (value << 8) | byte
+    unknown = not keep_marker and value == (1 << (7 * length)) - 1
+    return value, pos + length, unknown
+
+def _read_ebml_element(data, pos):
+    """요소 헤더 읽기 -> (ID, 본문 시작, 본문 크기 또는 None(크기 미정))"""
+    element_id, pos, _ = _read_vint(data, pos, keep_marker=True)
+    size, pos, unknown = _read_vint(data, pos)
+    return element_id, pos, None if unknown else size
+
+def _webm_duration(f, file_size):
+    f.seek(0)
+    data = f.read(min(file_size, 64 * 1024))
+
+    # EBML 헤더 건너뛰기
+    element_id, body, size = _read_ebml_element(data, 0)
+    if element_id != 0x1A45DFA3 or size is None:
+        return None
+    element_id, segment_body, _ = _read_ebml_element(data, body + size)
+    if element_id != _EBML_SEGMENT:
+        return None
+
+    # Segment 안에서 Info 찾기 (Cluster가 나오면 중단)
+    timecode_scale = 1000000
+    pos = segment_body
+    while pos < len(data):
+        element_id, body, size = _read_ebml_element(data, pos)
+        if element_id == _EBML_CLUSTER or size is None:
+            break
+        if element_id == _EBML_INFO:
+            child = body
+            duration = None
+            while child < min(body + size, len(data)):
+                child_id, child_body, child_size = _read_ebml_element(data, child)
+                value = data[child_body:child_body + child_size]
+                if child_id == _EBML_TIMECODE_SCALE:
+                    timecode_scale = int.from_bytes(value, 'big')
+                elif child_id == _EBML_DURATION:
+                    duration = struct.unpack('>f' if child_size == 4 else '>d', value)[0]
+                child = child_body + child_size
+            if duration:
+                return duration * timecode_scale / 1e9
+            break
+        pos = body + size
+
+    # 브라우저 MediaRecorder로 만든 webm은 Duration이 없음 -> 마지막 Cluster의 블록 시간으로 계산
+    return _webm_duration_from_tail(f, file_size, timecode_scale)
+
+def _webm_duration_from_tail(f, file_size, timecode_scale):
+    tail_size = min(file_size, 512 * 1024)
+    f.seek(file_size - tail_size)
+    tail = f.read(tail_size)
+    cluster_id = _EBML_CLUSTER.to_bytes(4, 'big')
+
+    pos = tail.rfind(cluster_id)
+    while pos >= 0:
+        try:
+            last_timecode = _parse_cluster_last_timecode(tail, pos)
+        except (ValueError, IndexError, struct.error):
+            last_timecode = None
+        if last_timecode is not None:
+            return last_timecode * timecode_scale / 1e9
+        pos = tail.rfind(cluster_id, 0, pos)
+    return None
+
+def _parse_cluster_last_timecode(data, pos):
+    """Cluster 위치에서 마지막 블록의 절대 타임코드 계산 (Cluster가 아니면 None)"""
+    element_id, body, size = _read_ebml_element(data, pos)
+    end = len(data) if size is None else min(body + size, len(data))
+
+    # Cluster의 첫 요소는 Timecode여야 함 (오디오 데이터 안의 우연한 ID 일치 걸러내기)
+    child_id, child_body, child_size = _read_ebml_element(data, body)
+    if child_id != _EBML_CLUSTER_TIMECODE or child_size is None or child_size > 8:
+        return None
+    cluster_timecode = int.from_bytes(data[child_body:child_body + child_size], 'big')
+
+    last = cluster_timecode
+    child = child_body + child_size
+    while child < end:
+        try:
+            child_id, child_body, child_size = _read_ebml_element(data, child)
+        except ValueError:
+            break
+        if child_size is None or child_body + child_size > len(data):
+            break
+        if child_id == _EBML_BLOCK_GROUP:
+            block_id, block_body, _ = _read_ebml_element(data, child_body)
+            if block_id == _EBML_BLOCK:
+                last = max(last, cluster_timecode + _block_relative_timecode(data, block_body))
+        elif child_id == _EBML_SIMPLE_BLOCK:
+            last = max(last, cluster_timecode + _block_relative_timecode(data, child_body))
+        elif child_id == _EBML_CLUSTER:
+            break
+        child = child_body + child_size
+    return last
+
+def _block_relative_timecode(data, pos):
+    _, pos, _ = _read_vint(data, pos)  # 트랙 번호
+    return struct.unpack('>h', data[pos:pos + 2])[0]
+
+# ==================== 공개 함수 ====================
+
+_PARSERS = {
+    'wav': _wav_duration,
+    'mp3': _mp3_duration,
+    'm4a': _mp4_duration,
+    'ogg': _ogg_duration,
+    'webm': _webm_duration,
+}
+
+def read_header_duration(filepath, audio_format=None):
+    """
+    헤더만 읽어서 재생 시간(초) 계산
+
+    Args:
+        filepath: 오디오 파일 경로
+        audio_format: 알고 있는 형식 (없으면 매직 바이트로 판별)
+    Returns:
+        float | None: 재생 시간 (파싱 실패 시 None)
+    """
+    file_size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        audio_format = sniff_format(f.read(12)) or audio_format
+        parser = _PARSERS.get(audio_format)
+        if parser is None:
+            return None
+        try:
+            duration = parser(f, file_size)
+        except (ValueError, IndexError, TypeError, struct.error):
+            return None
+    if duration is None or duration <= 0:
+        return None
+    return duration
+
+def ffprobe_duration(filepath):
+    """ffprobe로 재생 시간(초) 계산 (실패 시 None)"""
+    cmd = [
+        'ffprobe',
+        '-v', 'quiet',
+        '-print_format', 'json',
+        '-show_format',
+        filepath
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        print(f"오디오 duration 계산 실패: ffprobe 실행 불가 - {str(e)}")
+        return None
+    if result.returncode != 0:
+        print(f"오디오 duration 계산 실패: ffprobe 실행 실패 - {result.stderr}")
+        return None
+    duration_str = json.loads(result.stdout).get('format', {}).get('duration')
+    if not duration_str or duration_str == 'N/A':
+        print("오디오 duration 계산 실패: ffprobe에서 duration을 찾을 수 없음")
+        return None
+    return float(duration_str)
+
+def get_audio_duration(filepath, audio_format=None):
+    """
+    오디오 재생 시간(초) 계산
+    1. 컨테이너 헤더 파싱 (수 KB만 읽음)
+    2. 실패 시 ffprobe
+
+    Returns:
+        float | None: 재생 시간 (실패 시 None)
+    """
+    try:
+        duration = read_header_duration(filepath, audio_format)
+        if duration is not None:
+            print(f"오디오 duration 계산 완료 (헤더): {duration:.3f}초")
+            return duration
+
+        duration = ffprobe_duration(filepath)
+        if duration is not None:
+            print(f"오디오 duration 계산 완료 (ffprobe): {duration}초")
+        return duration
+    except Exception as duration_error:
+        print(f"오디오 duration 계산 실패 (계속 진행): {str(duration_error)}")
+        # duration 계산 실패해도 계속 진행 (기존 녹음과의 호환성을 위해)
+        return None
@@ -0,0 +1,69 @@
+"""
+키워드가 비어 있는 녹음에 로컬 추출 키워드를 채우는 스크립트
+GPT 분석 전에 저장된 기록이나 분석이 키워드 없이 끝난 기록에 사용합니다.
+녹음을 묶음으로 읽어 extract_keywords_batch로 한 번에 추출하고, 집계 테이블/키워드 색인도 같은 트랜잭션에서 갱신합니다.
+--gpt를 주면 analyze_texts_with_gpt로 GPT_BATCH_SIZE개씩 ChatGPT 요청 하나에 묶어 키워드를 뽑습니다 (감정은 그대로).
+사용법: python backfill_keywords.py [묶음 크기] [--gpt]
+"""
+import sys
+
+from sqlalchemy import or_
+
+from app import app, db
+from models import Recording, ProcessingStatus
+from services import extract_keywords_batch, analyze_texts_with_gpt
+import rollups
+import keyword_index
+from search import index_recording
+
+DEFAULT_BATCH_SIZE = 500
+
+def gpt_keywords_batch(texts):
+    """텍스트 목록 -> GPT 배치 분석 키워드 목록 (캐시/로컬 분류 결과 포함)"""
+    return [analysis['keywords'] for analysis in analyze_texts_with_gpt(texts)]
+
+def backfill_keywords(batch_size=DEFAULT_BATCH_SIZE, use_gpt=False):
+    """키워드 백필 (묶음마다 커밋)"""
+    extract = gpt_keywords_batch if use_gpt else extract_keywords_batch
+    with app.app_context():
+        filled = 0
+        last_id = 0
+        while True:
+            # 처리 완료된 녹음 중 키워드가 없는 것 (id 순서로 이어서 조회)
+            recordings = (
+                Recording.query
+                .filter(Recording.id > last_id,
+                        Recording.status == ProcessingStatus.DONE,
+                        or_(Recording.keywords.is_(None), Recording.keywords == ''))
+                .order_by(Recording.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not recordings:
+                break
+            last_id = recordings[-1].id
+
+            try:
+                for recording, keywords in zip(recordings, extract([r.content for r in recordings])):
+                    if not keywords:
+                        continue
+                    before = rollups.snapshot(recording)
+                    recording.keywords = ','.join(keywords)
+                    rollups.update_recording(before, recording)
+                    keyword_index.update_recording(recording)
+                    index_recording(recording)
+                    filled += 1
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"[오류] {str(e)}")
+                return
+
+            print(f"녹음 ID {last_id}까지 확인 (키워드 채움 {filled}개)")
+
+        print(f"키워드가 없던 기록 {filled}개에 키워드를 채웠습니다.")
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if arg != '--gpt']
+    batch_size = int(args[0]) if args else DEFAULT_BATCH_SIZE
+    backfill_keywords(batch_size, use_gpt='--gpt' in sys.argv[1:])
@@ -0,0 +1,318 @@
+"""
+콘텐츠 해시 기반 STT/분석 결과 캐시
+- 오디오 해시(sha256) -> STT 텍스트
+- 텍스트 해시(sha256) -> {키워드, 감정}
+재업로드된 동일 오디오는 Whisper와 OpenAI 호출을 모두 건너뜁니다.
+별도 SQLite 파일에 저장하며, 테이블별 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제(LRU)합니다.
+캐시는 최선 노력(best-effort): 조회는 읽기만 하고(사용 시각/히트 수는 메모리에 모았다가 저장할 때 함께 기록),
+SQLite 오류(잠금 대기 초과 등)는 캐시 미스/저장 생략으로 처리해 업로드를 실패시키지 않습니다.
+
+MemoCache는 프로세스 메모리 안의 TTL + LRU 캐시입니다. (GPT 분석 메모이제이션에 사용)
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from models import EmotionType
+
+CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+CACHE_DB_PATH = os.getenv('CACHE_DB_PATH', os.path.join('instance', 'cache.db'))
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '10000'))  # 테이블별 최대 항목 수
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def hash_text(text):
+    """텍스트 sha256 해시"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def hash_file(filepath):
+    """파일 sha256 해시 (청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentCache:
+    """SQLite 기반 영구 캐시 (프로세스/스레드 간 공유)"""
+
+    TABLES = ('transcripts', 'analyses')
+
+    def __init__(self, path=CACHE_DB_PATH, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        # 조회 때 쓰지 않고 모아 둔 값 (다음 저장 트랜잭션에서 기록)
+        self._pending_lock = threading.Lock()
+        self._pending_counts = Counter()  # 카운터 이름 -> 증가량
+        self._pending_touches = {table: {} for table in self.TABLES}  # 키 -> 마지막 사용 시각
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+    def _connect(self):
+        """스레드별 연결"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    key TEXT PRIMARY KEY,
+                    transcript TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    key TEXT PRIMARY KEY,
+                    keywords TEXT NOT NULL,
+                    emotion TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    created_at REAL
+                )
+            """)
+            # 이전 버전 캐시 파일에는 created_at이 없음
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(analyses)')]
+            if 'created_at' not in columns:
+                conn.execute('ALTER TABLE analyses ADD COLUMN created_at REAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_transcripts_last_used ON transcripts (last_used)')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_analyses_last_used ON analyses (last_used)')
+
+    def _count(self, name):
+        """히트/미스 카운터 증가 (메모리에 모았다가 저장할 때 DB에 반영 - 다른 워커는 그 뒤에 같은 값을 봄)"""
+        with self._pending_lock:
+            self._pending_counts[name] += 1
+
+    def _touch(self, table, key):
+        """사용 시각 갱신 (메모리에 모았다가 저장할 때 DB에 반영 - LRU 삭제 전에 기록됨)"""
+        with self._pending_lock:
+            self._pending_touches[table][key] = time.time()
+
+    def _take_pending(self):
+        """모아 둔 (카운터, 사용 시각)을 꺼냄 (기록에 실패하면 _restore_pending으로 되돌림)"""
+        with self._pending_lock:
+            pending = (self._pending_counts, self._pending_touches)
+            self._pending_counts = Counter()
+            self._pending_touches = {table: {} for table in self.TABLES}
+        return pending
+
+    def _write_pending(self, conn, pending):
+        """꺼낸 카운터/사용 시각을 호출한 쪽의 쓰기 트랜잭션에서 기록"""
+        counts, touches = pending
+        if counts:
+            conn.executemany(
+                'INSERT INTO cache_stats (name, value) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                list(counts.items())
+            )
+        for table, used in touches.items():
+            if used:
+                conn.executemany(f'UPDATE {table} SET last_used = ? WHERE key = ?',
+                                 [(last_used, key) for key, last_used in used.items()])
+
+    def _restore_pending(self, pending):
+        counts, touches = pending
+        with self._pending_lock:
+            self._pending_counts.update(counts)
+            for table, used in touches.items():
+                for key, last_used in used.items():
+                    self._pending_touches[table].setdefault(key, last_used)
+
+    def _write(self, table, statement, params):
+        """항목 저장 + 모아 둔 값 기록 + LRU 삭제 (한 트랜잭션, 실패하면 저장 생략)"""
+        pending = self._take_pending()
+        try:
+            conn = self._connect()
+            with conn:
+                self._write_pending(conn, pending)
+                conn.execute(statement, params)
+                self._evict(conn, table)
+        except sqlite3.Error as e:
+            self._restore_pending(pending)
+            print(f"⚠️ [캐시] {table} 저장 생략 ({type(e).__name__}: {e})")
+
+    def _evict(self, conn, table):
+        """최대 개수를 넘으면 오래 사용되지 않은 항목부터 삭제"""
+        count = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                f'DELETE FROM {table} WHERE key IN '
+                f'(SELECT key FROM {table} ORDER BY last_used LIMIT ?)',
+                (overflow,)
+            )
+            conn.execute(
+                'INSERT INTO cache_stats (name, value) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                (f'{table}_evictions', overflow)
+            )
+
+    # ==================== STT 캐시 ====================
+
+    def _read(self, table, query, params):
+        """조회 (읽기 전용, SQLite 오류는 미스로 처리)"""
+        try:
+            return self._connect().execute(query, params).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ [캐시] {table} 조회 실패 - 캐시 미스로 처리 ({type(e).__name__}: {e})")
+            return None
+
+    def get_transcript(self, audio_hash):
+        row = self._read('transcripts', 'SELECT transcript FROM transcripts WHERE key = ?', (audio_hash,))
+        if row is None:
+            self._count('transcripts_misses')
+            return None
+        self._touch('transcripts', audio_hash)
+        self._count('transcripts_hits')
+        return row[0]
+
+    def set_transcript(self, audio_hash, transcript):
+        self._write(
+            'transcripts',
+            'INSERT OR REPLACE INTO transcripts (key, transcript, last_used) VALUES (?, ?, ?)',
+            (audio_hash, transcript, time.time())
+        )
+
+    # ==================== 분석 캐시 ====================
+
+    def get_analysis(self, text_hash, max_age=None):
+        """
+        Args:
+            max_age: 이 시간(초)보다 오래된 결과는 없는 것으로 취급 (None이면 제한 없음, 다시 저장하면 교체)
+        Returns:
+            dict | None: {'keywords': [...], 'emotion': EmotionType}
+        """
+        row = self._read('analyses', 'SELECT keywords, emotion, created_at FROM analyses WHERE key = ?', (text_hash,))
+        if row is not None and max_age is not None and (row[2] or 0) < time.time() - max_age:
+            row = None
+        if row is None:
+            self._count('analyses_misses')
+            return None
+        self._touch('analyses', text_hash)
+        self._count('analyses_hits')
+        keywords, emotion, _ = row
+        return {
+            'keywords': keywords.split(',') if keywords else [],
+            'emotion': EmotionType[emotion]
+        }
+
+    def set_analysis(self, text_hash, keywords, emotion):
+        now = time.time()
+        self._write(
+            'analyses',
+            'INSERT OR REPLACE INTO analyses (key, keywords, emotion, last_used, created_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (text_hash, ','.join(keywords), emotion.name, now, now)
+        )
+
+    # ==================== 통계 ====================
+
+    def stats(self):
+        conn = self._connect()
+        counters = Counter(dict(conn.execute('SELECT name, value FROM cache_stats').fetchall()))
+        with self._pending_lock:
+            counters.update(self._pending_counts)  # 이 프로세스에서 아직 기록하지 않은 값
+        result = {'max_entries': self.max_entries}
+        for table in self.TABLES:
+            hits = counters.get(f'{table}_hits', 0)
+            misses = counters.get(f'{table}_misses', 0)
+            result[table] = {
+                'entries': conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0],
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                'evictions': counters.get(f'{table}_evictions', 0)
+            }
+        return result
+
+
+class MemoCache:
+    """스레드 안전한 메모리 캐시 (최대 크기 초과 시 LRU 삭제, TTL 지나면 만료)"""
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl  # 초 (None이면 만료 없음)
+        self._data = OrderedDict()  # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            stored_at, value = item
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'expirations': self.expirations,
+                'evictions': self.evictions
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 공용 캐시 (CACHE_ENABLED=false면 None)"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ContentCache()
+    return _cache
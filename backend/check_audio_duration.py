@@ -0,0 +1,267 @@
+"""
+오디오 재생 시간(헤더 파싱) 확인 스크립트 (오프라인, 오디오 파일/ffmpeg 불필요)
+형식마다 작은 합성 헤더를 만들어 audio_utils.read_header_duration 결과를 기대값과 비교합니다.
+- WAV (fmt/data, 스트리밍 녹음처럼 data 크기 0), MP3 (CBR + ID3v2/ID3v1, Xing, VBRI),
+  M4A (mvhd 버전 0/1, moov가 mdat 뒤), Ogg (Opus pre-skip, Vorbis), WebM (Info Duration, Duration 없는 MediaRecorder 형식)
+- 잘린 파일/형식이 다른 바이트/매직 바이트 뒤가 무작위인 파일: 예외 없이 None (또는 양수 재생 시간)
+- 헤더 파싱에 실패하면 get_audio_duration이 ffprobe로 대체하는지
+
+사용법:
+    python check_audio_duration.py
+"""
+import io
+import math
+import os
+import random
+import struct
+import sys
+import tempfile
+import wave
+
+import audio_utils
+from audio_utils import get_audio_duration, read_header_duration, sniff_format
+
+TOLERANCE = 1e-3  # 초
+
+
+# ==================== 합성 헤더 ====================
+
+def wav_file(seconds, rate=8000, streaming=False):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b'\x00\x00' * int(rate * seconds))
+    data = buffer.getvalue()
+    if streaming:
+        # MediaRecorder/스트리밍 녹음: RIFF/data 크기를 채우지 않고 끝남
+        data = data[:4] + b'\x00\x00\x00\x00' + data[8:40] + b'\x00\x00\x00\x00' + data[44:]
+    return data
+
+
+MP3_FRAME_SIZE = 417  # MPEG1 Layer III, 128kbps, 44.1kHz
+
+
+def mp3_frame(mono=False, payload=b''):
+    header = bytes([0xFF, 0xFB, 0x90, 0xC0 if mono else 0x00])
+    frame = header + payload
+    return frame + b'\x00' * (MP3_FRAME_SIZE - len(frame))
+
+
+def id3v2_tag(size):
+    # 크기는 7비트씩 4바이트 (synchsafe)
+    synchsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b'ID3\x04\x00\x00' + synchsafe + b'\x00' * size
+
+
+def mp3_cbr(frames, id3=False):
+    data = (id3v2_tag(300) if id3 else b'') + mp3_frame() * frames
+    if id3:
+        data += b'TAG' + b'\x00' * 125  # ID3v1
+    return data
+
+
+def mp3_xing(frames):
+    # MPEG1 스테레오: 헤더 4바이트 + side info 32바이트 뒤에 Xing 태그
+    payload = b'\x00' * 32 + b'Xing' + struct.pack('>II', 0x01, frames)
+    return mp3_frame(payload=payload) + mp3_frame() * 3
+
+
+def mp3_vbri(frames):
+    # VBRI: 헤더 + 32바이트 뒤 (모노라 Xing 위치와 겹치지 않음)
+    payload = b'\x00' * 32 + b'VBRI' + b'\x00' * 10 + struct.pack('>I', frames)
+    return mp3_frame(mono=True, payload=payload) + mp3_frame(mono=True) * 3
+
+
+def mp4_box(box_type, payload):
+    return struct.pack('>I', 8 + len(payload)) + box_type + payload
+
+
+def m4a_file(timescale, duration, version=0, moov_last=False):
+    if version == 1:
+        mvhd = b'\x01\x00\x00\x00' + struct.pack('>QQIQ', 0, 0, timescale, duration)
+    else:
+        mvhd = b'\x00\x00\x00\x00' + struct.pack('>IIII', 0, 0, timescale, duration)
+    mvhd += b'\x00' * 80
+    ftyp = mp4_box(b'ftyp', b'M4A \x00\x00\x00\x00M4A isom')
+    moov = mp4_box(b'moov', mp4_box(b'mvhd', mvhd))
+    mdat = mp4_box(b'mdat', b'\x00' * 2000)
+    return ftyp + (mdat + moov if moov_last else moov + mdat)
+
+
+def ogg_page(payload, granule, sequence, header_type=0):
+    segments = []
+    remaining = len(payload)
+    while remaining >= 255:
+        segments.append(255)
+        remaining -= 255
+    segments.append(remaining)
+    return (b'OggS' + struct.pack('<BBqIII', 0, header_type, granule, 1, sequence, 0)
+            + bytes([len(segments)]) + bytes(segments) + payload)
+
+
+def ogg_opus(seconds, pre_skip=312):
+    head = b'OpusHead' + struct.pack('<BBHIhB', 1, 1, pre_skip, 48000, 0, 0)
+    pages = [ogg_page(head, 0, 0, header_type=2), ogg_page(b'OpusTags' + b'\x00' * 8, 0, 1)]
+    pages.append(ogg_page(b'\x00' * 400, 48000 * seconds // 2 + pre_skip, 2))
+    pages.append(ogg_page(b'\x00' * 400, int(48000 * seconds) + pre_skip, 3, header_type=4))
+    return b''.join(pages)
+
+
+def ogg_vorbis(seconds, rate=44100):
+    ident = b'\x01vorbis' + struct.pack('<IBIiiiB', 0, 2, rate, 0, 128000, 0, 0xB8) + b'\x01'
+    pages = [ogg_page(ident, 0, 0, header_type=2)]
+    pages.append(ogg_page(b'\x00' * 300, int(rate * seconds), 1, header_type=4))
+    return b''.join(pages)
+
+
+def ebml(element_id, payload, unknown_size=False):
+    if unknown_size:
+        size = b'\x01\xff\xff\xff\xff\xff\xff\xff'
+    elif len(payload) < 0x7F:
+        size = bytes([0x80 | len(payload)])
+    else:
+        size = struct.pack('>H', 0x4000 | len(payload))
+    return element_id + size + payload
+
+
+def webm_file(duration_ms=None, clusters=()):
+    """
+    Args:
+        duration_ms: Info의 Duration (None이면 MediaRecorder처럼 생략)
+        clusters: [(cluster 타임코드, [블록 상대 타임코드, ...]), ...]
+    """
+    header = ebml(b'\x1a\x45\xdf\xa3', ebml(b'\x42\x82', b'webm'))
+    info = ebml(b'\x2a\xd7\xb1', (1000000).to_bytes(3, 'big'))
+    if duration_ms is not None:
+        info += ebml(b'\x44\x89', struct.pack('>f', duration_ms))
+    body = ebml(b'\x15\x49\xa9\x66', info)
+    for timecode, blocks in clusters:
+        cluster = ebml(b'\xe7', timecode.to_bytes(2, 'big'))
+        for relative in blocks:
+            cluster += ebml(b'\xa3', b'\x81' + struct.pack('>h', relative) + b'\x80' + b'\x00' * 40)
+        body += ebml(b'\x1f\x43\xb6\x75', cluster, unknown_size=True)
+    return header + ebml(b'\x18\x53\x80\x67', body, unknown_size=True)
+
+
+# (이름, 바이트, 형식, 기대 재생 시간)
+CASES = [
+    ('WAV 1.5초', wav_file(1.5), 'wav', 1.5),
+    ('WAV data 크기 0 (스트리밍)', wav_file(2.0, streaming=True), 'wav', 2.0),
+    ('MP3 CBR', mp3_cbr(100), 'mp3', 100 * MP3_FRAME_SIZE * 8 / 128000),
+    ('MP3 CBR + ID3v2/ID3v1', mp3_cbr(100, id3=True), 'mp3', 100 * MP3_FRAME_SIZE * 8 / 128000),
+    ('MP3 Xing', mp3_xing(200), 'mp3', 200 * 1152 / 44100),
+    ('MP3 VBRI', mp3_vbri(300), 'mp3', 300 * 1152 / 44100),
+    ('M4A mvhd v0', m4a_file(1000, 2500), 'm4a', 2.5),
+    ('M4A mvhd v1, moov가 끝에', m4a_file(44100, 44100 * 3, version=1, moov_last=True), 'm4a', 3.0),
+    ('Ogg Opus (pre-skip)', ogg_opus(2), 'ogg', 2.0),
+    ('Ogg Vorbis', ogg_vorbis(1.25), 'ogg', 1.25),
+    ('WebM Info Duration', webm_file(3500.0), 'webm', 3.5),
+    ('WebM Duration 없음 (MediaRecorder)', webm_file(None, [(0, [0, 20, 40]), (2000, [0, 500])]), 'webm', 2.5),
+]
+
+# (이름, 바이트) - 예외 없이 None
+BROKEN = [
+    ('잘린 WAV (fmt 중간)', wav_file(1.0)[:30]),
+    ('잘린 WAV (data 전)', wav_file(1.0)[:36]),
+    ('잘린 MP3 Xing', mp3_xing(200)[:42]),
+    ('잘린 M4A (mvhd 중간)', m4a_file(1000, 2500)[:50]),
+    ('잘린 Ogg (첫 페이지)', ogg_opus(2)[:20]),
+    ('잘린 WebM (EBML 헤더)', webm_file(3500.0)[:6]),
+    ('오디오가 아닌 파일', b'%PDF-1.7 ' + b'not audio ' * 100),
+    ('빈 파일', b''),
+    ('RIFF인데 WAVE가 아님', b'RIFF\x00\x00\x00\x00AVI LIST' + b'\x00' * 100),
+    ('Ogg 식별 헤더가 아님', ogg_page(b'\x80theora' + b'\x00' * 40, 0, 0)),
+    ('M4A moov 없음', mp4_box(b'ftyp', b'M4A ') + mp4_box(b'mdat', b'\x00' * 100)),
+    ('M4A timescale 0', m4a_file(0, 2500)),
+]
+
+# 매직 바이트 뒤를 무작위로 채운 파일 (파서가 예외를 밖으로 던지지 않아야 함)
+MAGICS = [b'RIFF\x00\x00\x00\x00WAVE', b'ID3\x04\x00\x00', b'\xff\xfb\x90\x00', b'\x00\x00\x00\x20ftypM4A ',
+          b'OggS', b'\x1a\x45\xdf\xa3']
+FUZZ_PER_MAGIC = 300
+
+
+def write_temp(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def main():
+    failed = False
+
+    def check(name, ok, detail=''):
+        nonlocal failed
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} {name}" + (f" - {detail}" if detail and not ok else ''))
+
+    directory = tempfile.mkdtemp(prefix='revo-duration-')
+
+    print("\n[형식별 헤더 파싱]")
+    print("-" * 70)
+    for i, (name, data, audio_format, expected) in enumerate(CASES):
+        path = write_temp(directory, f'case{i}', data)
+        sniffed = sniff_format(data[:12])
+        duration = read_header_duration(path)
+        ok = sniffed == audio_format and duration is not None and abs(duration - expected) < TOLERANCE
+        check(f"{name}: {audio_format} {expected:.3f}초", ok, f'판별 {sniffed}, 결과 {duration}')
+
+    print("\n[잘린/잘못된 파일]")
+    print("-" * 70)
+    for i, (name, data) in enumerate(BROKEN):
+        path = write_temp(directory, f'broken{i}', data)
+        try:
+            duration = read_header_duration(path)
+            check(f"{name}: None", duration is None, f'결과 {duration}')
+        except Exception as e:
+            check(f"{name}: None", False, f'{type(e).__name__}: {e}')
+
+    rng = random.Random(6)
+    errors = []
+    for magic in MAGICS:
+        for n in range(FUZZ_PER_MAGIC):
+            data = magic + bytes(rng.getrandbits(8) for _ in range(rng.randrange(0, 600)))
+            path = write_temp(directory, 'fuzz', data)
+            try:
+                duration = read_header_duration(path)
+            except Exception as e:
+                errors.append(f'{magic[:4]!r} #{n}: {type(e).__name__}: {e}')
+                continue
+            if duration is not None and not (duration > 0 and math.isfinite(duration)):
+                errors.append(f'{magic[:4]!r} #{n}: 결과 {duration}')
+    check(f"매직 바이트 + 무작위 바이트 {len(MAGICS) * FUZZ_PER_MAGIC}개: 예외 없이 None 또는 양수",
+          not errors, '; '.join(errors[:3]))
+
+    print("\n[ffprobe 대체]")
+    print("-" * 70)
+    garbage = write_temp(directory, 'garbage', BROKEN[6][1])
+    valid = write_temp(directory, 'valid.wav', CASES[0][1])
+    try:
+        real = audio_utils.ffprobe_duration(garbage)
+        check(f"ffprobe: 오디오가 아닌 파일은 예외 없이 None ({real})", real is None)
+    except Exception as e:
+        check("ffprobe: 오디오가 아닌 파일은 예외 없이 None", False, f'{type(e).__name__}: {e}')
+
+    calls = []
+    original = audio_utils.ffprobe_duration
+    audio_utils.ffprobe_duration = lambda path: calls.append(path) or 4.2
+    try:
+        fallback = get_audio_duration(garbage)
+        header = get_audio_duration(valid)
+    finally:
+        audio_utils.ffprobe_duration = original
+    check(f"헤더 파싱 실패 -> ffprobe 결과 사용 ({fallback})", fallback == 4.2 and calls == [garbage])
+    check(f"헤더 파싱 성공 -> ffprobe 호출 없음 ({header})", abs(header - 1.5) < TOLERANCE and calls == [garbage])
+    print("-" * 70)
+
+    if failed:
+        print("\n[결과] 재생 시간 계산이 기대와 다릅니다.")
+        sys.exit(1)
+    print("\n[결과] 모든 형식의 재생 시간을 헤더에서 계산하고, 잘못된 파일은 예외 없이 처리합니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""
+ChatGPT 회로 차단기 확인 스크립트 (오프라인)
+- 상태 전이 (가짜 시계): 최소 호출 수, 실패율/느린 호출 기준, open 유지 시간, half_open 시험 호출 하나, 복구,
+  결과 없이 중단된 시험 호출(release) 뒤 다음 시험 호출 허용, 이전 세대 호출의 늦은 결과(record/release)는 무시
+- 배치 분석 (가짜 OpenAI 서버): half_open에서 첫 요청만 시험 호출, 중단된 시험 호출이 half_open에 남지 않음
+- 동기 업로드 지연 (가짜 OpenAI 서버 + 임시 DB): API 장애(503, 응답 지연) 동안 차단 전/후 업로드 시간 비교
+  차단 후에는 ChatGPT를 호출하지 않고 --max-open-ms 안에 응답해야 통과
+- GET /api/health의 gpt.circuit 상태
+
+사용법:
+    python check_circuit_breaker.py
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+_temp_dir = tempfile.mkdtemp(prefix='revo-circuit-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_temp_dir, 'revo.db')
+os.environ['JOB_WORKERS'] = '0'
+os.environ['CACHE_DB_PATH'] = os.path.join(_temp_dir, 'cache.db')
+os.environ['OPENAI_API_KEY'] = 'sk-fake-' + 'x' * 40
+os.environ['GPT_MEMO_PERSIST'] = 'false'
+os.environ['LOCAL_EMOTION_ENABLED'] = 'false'  # 모든 텍스트를 GPT(가짜 서버)로
+# 실제 기본값(마감 20초, 재시도 3회, 차단 30초)을 줄인 값 - 비율은 같음
+os.environ['GPT_DEADLINE'] = '1'
+os.environ['GPT_MAX_RETRIES'] = '2'
+os.environ['GPT_BACKOFF_BASE'] = '0.2'
+os.environ['GPT_CIRCUIT_WINDOW'] = '10'
+os.environ['GPT_CIRCUIT_MIN_CALLS'] = '5'
+os.environ['GPT_CIRCUIT_OPEN_SECONDS'] = '2'
+
+import app as app_module  # noqa: E402 (환경변수 설정 후 불러옴)
+import services  # noqa: E402
+from services import CircuitBreaker  # noqa: E402
+from check_backends import wav_bytes  # noqa: E402
+from check_keyword_extraction import make_corpus  # noqa: E402
+from fake_openai_server import FakeOpenAIServer  # noqa: E402
+
+server = FakeOpenAIServer().start()
+os.environ['OPENAI_BASE_URL'] = server.url  # 클라이언트는 첫 분석 때 생성
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ChatGPT 회로 차단기 확인')
+    parser.add_argument('--max-open-ms', type=float, default=50.0, help='차단 중 업로드 p95 상한 (ms)')
+    args = parser.parse_args()
+
+    failed = False
+
+    def check(name, ok, detail=''):
+        nonlocal failed
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} {name}" + (f" - {detail}" if detail and not ok else ''))
+
+    print("\n[상태 전이] (가짜 시계, 최소 5회, 실패율 50%, 느린 호출 10초, 차단 30초)")
+    print("-" * 70)
+    clock = FakeClock()
+    with contextlib.redirect_stdout(io.StringIO()):
+        breaker = CircuitBreaker(enabled=True, window=10, min_calls=5, failure_rate=0.5,
+                                 slow_seconds=10, open_seconds=30, clock=clock)
+        for _ in range(4):
+            breaker.record(breaker.allow(), 1.0, RuntimeError('503'))
+        before_min_calls = breaker.state
+        breaker.record(breaker.allow(), 1.0, RuntimeError('503'))
+    check(f"실패 4회는 {before_min_calls}, 5회째 {breaker.state}",
+          before_min_calls == 'closed' and breaker.state == 'open')
+    check("open 동안 호출 거부", not breaker.allow() and breaker.stats()['rejected'] == 1)
+
+    clock.now += 30
+    with contextlib.redirect_stdout(io.StringIO()):
+        first, second = breaker.allow(), breaker.allow()
+    check(f"30초 뒤 {breaker.state}: 시험 호출 하나만 허용 ({first}, {second})",
+          breaker.state == 'half_open' and first and not second)
+    with contextlib.redirect_stdout(io.StringIO()):
+        breaker.record(first, 12.0)  # 성공했지만 느림 -> 실패
+    check(f"느린 시험 호출 -> 다시 {breaker.state}", breaker.state == 'open' and not breaker.allow())
+
+    clock.now += 30
+    with contextlib.redirect_stdout(io.StringIO()):
+        breaker.record(breaker.allow(), 0.5)
+    check(f"시험 호출 성공 -> {breaker.state}, 기록 초기화 ({breaker.stats()['recent_calls']}개)",
+          breaker.state == 'closed' and breaker.stats()['recent_calls'] == 0)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for error in (None, RuntimeError('503'), None, RuntimeError('503'), None):
+            breaker.record(breaker.allow(), 0.5, error)
+    check(f"5회 중 2회 실패(40%)는 {breaker.state}", breaker.state == 'closed')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(5):
+            breaker.record(breaker.allow(), 1.0, RuntimeError('503'))
+        clock.now += 30
+        probe = breaker.allow()
+        breaker.release(probe)  # 시험 호출이 결과 없이 중단됨
+        retry, extra = breaker.allow(), breaker.allow()
+    check(f"중단된 시험 호출 release -> {breaker.state}, 다음 시험 호출 하나 허용 ({probe}, {retry}, {extra})",
+          breaker.state == 'half_open' and probe and retry and not extra)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        breaker.record(probe, 12.0, RuntimeError('timeout'))  # 중단된 것으로 본 시험 호출이 늦게 끝남
+        breaker.release(probe)
+    check(f"이전 시험 호출의 늦은 실패/release 무시 -> {breaker.state}, 새 시험 호출 진행 중",
+          breaker.state == 'half_open' and not breaker.allow())
+    with contextlib.redirect_stdout(io.StringIO()):
+        breaker.record(retry, 0.5)
+        stale = breaker.allow()
+        for _ in range(5):
+            breaker.record(breaker.allow(), 1.0, RuntimeError('503'))
+        breaker.record(stale, 0.5)  # 열리기 전에 시작한 호출이 open 뒤에 끝남
+    check(f"시험 호출 성공 뒤 다시 open, 열리기 전에 시작한 호출의 늦은 결과는 기록 안 함 ({breaker.stats()['recent_calls']}개)",
+          breaker.state == 'open' and breaker.stats()['recent_calls'] == 5)
+    clock.now += 30
+    with contextlib.redirect_stdout(io.StringIO()):
+        probe = breaker.allow()
+        breaker.record(stale, 0.5)
+        held = breaker.state
+        breaker.record(probe, 0.5)
+    check(f"half_open에서 이전 세대 성공은 무시 ({held}), 시험 호출 결과로만 {breaker.state}",
+          held == 'half_open' and breaker.state == 'closed')
+
+    disabled = CircuitBreaker(enabled=False, min_calls=1)
+    disabled.record(disabled.allow(), 1.0, RuntimeError('503'))
+    check("GPT_CIRCUIT_ENABLED=false면 항상 호출", disabled.allow() and disabled.state == 'closed')
+
+    print(f"\n[배치 분석 시험 호출] 가짜 서버 {server.url}")
+    print("-" * 70)
+    circuit = services._circuit
+    batch_texts = iter(make_corpus(200, seed=29))
+
+    def open_circuit():
+        """실패를 기록해 회로를 열고 차단 시간이 지나기를 기다림 (다음 호출이 half_open 시험 호출)"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(circuit.min_calls):
+                circuit.record(circuit.allow(), 0.1, RuntimeError('503'))
+        time.sleep(circuit.open_seconds)
+
+    server.reset()
+    open_circuit()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = services.analyze_texts_with_gpt([next(batch_texts) for _ in range(6)], batch_size=2)
+    sources = [r['source'] for r in results]
+    check(f"half_open 배치 (요청 3개): 시험 호출 {server.requests}개, 회로 {circuit.state}, 결과 {sources}",
+          server.requests == 1 and circuit.state == 'closed'
+          and sources[:2] == ['gpt', 'gpt'] and sources[2:] == ['fallback'] * 4)
+
+    open_circuit()
+    gpt_client = services.get_client()
+    original = gpt_client.complete_many
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    gpt_client.complete_many = interrupted
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            services.analyze_texts_with_gpt([next(batch_texts) for _ in range(2)], batch_size=2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gpt_client.complete_many = original
+    server.reset()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = services.analyze_texts_with_gpt([next(batch_texts) for _ in range(2)], batch_size=2)
+    check(f"중단된 시험 호출 뒤 다음 시험 호출 {server.requests}개 -> {circuit.state}",
+          server.requests == 1 and circuit.state == 'closed' and all(r['source'] == 'gpt' for r in results))
+
+    print(f"\n[업로드 지연] 동기 업로드, 가짜 서버 {server.url}")
+    print(f"  (GPT_DEADLINE={os.environ['GPT_DEADLINE']}초, 재시도 {os.environ['GPT_MAX_RETRIES']}회, "
+          f"차단 {os.environ['GPT_CIRCUIT_OPEN_SECONDS']}초)")
+    print("-" * 70)
+    app_module.UPLOAD_FOLDER = os.path.join(_temp_dir, 'uploads')
+    client = app_module.app.test_client()
+    transcripts = iter(make_corpus(200, seed=23))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        user_id = client.post('/api/users', json={'name': '회로'}).get_json()['user']['id']
+
+    def upload():
+        """동기 업로드 하나 -> (걸린 시간 ms, 이 업로드 동안 가짜 서버가 받은 요청 수, 회로 상태)"""
+        requests_before = server.requests
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = client.post('/api/recordings', data={
+                'audio': (io.BytesIO(wav_bytes()), 'circuit.wav'),
+                'user_id': str(user_id),
+                'transcript': next(transcripts),
+                'async': 'false',
+            }, content_type='multipart/form-data')
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 201:
+            raise RuntimeError(f'업로드 실패 ({response.status_code}): {response.get_data(as_text=True)[:200]}')
+        return elapsed, server.requests - requests_before, services.get_gpt_stats()['circuit']['state']
+
+    def health_state():
+        return client.get('/api/health').get_json()['gpt']['circuit']['state']
+
+    def summarize(label, rows):
+        times = sorted(ms for ms, _, _ in rows)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(f"  {label:24} {len(rows):>3}회  평균 {sum(times) / len(times):8.1f}ms  p95 {p95:8.1f}ms  "
+              f"ChatGPT 요청 {sum(n for _, n, _ in rows)}개")
+        return p95
+
+    healthy = [upload() for _ in range(3)]
+    summarize('정상', healthy)
+    check(f"정상일 때 ChatGPT 사용, 회로 {health_state()}",
+          all(n == 1 for _, n, _ in healthy) and health_state() == 'closed')
+
+    for outage, setup in [('503 장애', lambda: server.fail_next(503, count=10000)),
+                          ('응답 지연 3초', lambda: setattr(server, 'latency', 3.0))]:
+        print(f"\n  [{outage}]")
+        server.reset()
+        setup()
+        rows = [upload() for _ in range(12)]
+        opened_at = next((i for i, (_, _, state) in enumerate(rows) if state == 'open'), None)
+        if opened_at is None:
+            check(f"{outage}: 회로가 열림", False, str([state for _, _, state in rows]))
+            server.reset()
+            server.latency = 0.0
+            continue
+        before = rows[:opened_at + 1]
+        after = rows[opened_at + 1:]
+        slow_p95 = summarize('차단 전 (호출 후 대체)', before)
+        fast_p95 = summarize('차단 중 (바로 대체)', after)
+        check(f"{outage}: {len(before)}번째 업로드에서 회로 open, /api/health {health_state()}",
+              health_state() == 'open')
+        check(f"{outage}: 차단 중 ChatGPT 요청 없음, p95 {fast_p95:.1f}ms (기준 {args.max_open_ms:.0f}ms, "
+              f"차단 전 {slow_p95 / 1000:.2f}초)",
+              all(n == 0 for _, n, _ in after) and fast_p95 <= args.max_open_ms)
+
+        time.sleep(services._circuit.open_seconds)
+        elapsed, requests, state = upload()
+        check(f"{outage}: 차단 {services._circuit.open_seconds:g}초 뒤 시험 호출 {requests}개 실패 -> {state}",
+              requests >= 1 and state == 'open')
+
+        server.reset()
+        server.latency = 0.0
+        time.sleep(services._circuit.open_seconds)
+        recovered = [upload() for _ in range(3)]
+        check(f"{outage}: 복구 후 시험 호출 성공 -> {recovered[0][2]}, 이후 업로드도 ChatGPT 사용",
+              recovered[0][2] == 'closed' and all(n == 1 for _, n, _ in recovered) and health_state() == 'closed')
+    print("-" * 70)
+
+    server.stop()
+    if failed:
+        print("\n[결과] 회로 차단기가 기준에 맞지 않습니다.")
+        sys.exit(1)
+    print("\n[결과] API 장애 중에는 ChatGPT를 호출하지 않고 바로 로컬 분석을 사용합니다.")
+
+
+if __name__ == '__main__':
+    main()
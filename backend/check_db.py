@@ -1,51 +1,74 @@
 """
 데이터베이스 스키마 확인 스크립트
+models.py에 정의된 테이블/컬럼/인덱스가 실제 DB에 있는지 확인
+DATABASE_URL 기준으로 SQLite, PostgreSQL 모두 지원 (db_config.py)
 """
-import sqlite3
 import os
 
-def check_database():
+from sqlalchemy import inspect
+
+from db_config import create_db_engine, sqlite_database_path
+from models import db
+
+
+def missing_schema(engine):
+    """
+    모델과 비교해 DB에 없는 항목
+
+    Returns:
+        list: ('table' | 'column' | 'index', 이름) 목록
+    """
+    inspector = inspect(engine)
+    missing = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            missing.append(('table', table.name))
+            continue
+        columns = {column['name'] for column in inspector.get_columns(table.name)}
+        missing += [('column', f'{table.name}.{c.name}') for c in table.columns if c.name not in columns]
+        indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        missing += [('index', index.name) for index in table.indexes if index.name not in indexes]
+    return missing
+
+
+def check_database(engine=None):
     """데이터베이스 컬럼 확인"""
-    db_path = os.path.join('instance', 'revo.db')
-    
-    if not os.path.exists(db_path):
+    engine = engine or create_db_engine()
+
+    db_path = sqlite_database_path(engine)
+    if db_path and not os.path.exists(db_path):
         print("[오류] 데이터베이스 파일이 없습니다.")
-        return
-    
+        return False
+
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # 기존 컬럼 확인
-        cursor.execute("PRAGMA table_info(recordings)")
-        columns = cursor.fetchall()
-        
-        print("\n[recordings 테이블 컬럼 목록]")
-        print("-" * 60)
-        for col in columns:
-            print(f"  {col[1]:20} {col[2]:15} (nullable: {not col[3]})")
-        print("-" * 60)
-        
-        column_names = [col[1] for col in columns]
-        
-        # 필요한 컬럼 확인
-        has_is_uploaded = 'is_uploaded' in column_names
-        has_uploaded_at = 'uploaded_at' in column_names
-        
-        print(f"\n[is_uploaded 컬럼]: {'존재함' if has_is_uploaded else '없음'}")
-        print(f"[uploaded_at 컬럼]: {'존재함' if has_uploaded_at else '없음'}")
-        
-        if has_is_uploaded and has_uploaded_at:
+        inspector = inspect(engine)
+        print(f"\n[데이터베이스] {engine.url.render_as_string(hide_password=True)}")
+
+        if inspector.has_table('recordings'):
+            print("\n[recordings 테이블 컬럼 목록]")
+            print("-" * 60)
+            for col in inspector.get_columns('recordings'):
+                print(f"  {col['name']:20} {str(col['type']):15} (nullable: {col['nullable']})")
+            print("-" * 60)
+
+        missing = missing_schema(engine)
+        for kind, name in missing:
+            print(f"[{kind} 없음]: {name}")
+
+        if not missing:
             print("\n[결과] 데이터베이스 스키마가 정상입니다!")
-        else:
-            print("\n[경고] 마이그레이션이 필요합니다.")
-            print("   서버를 종료한 후 migrate_db.py를 실행하세요.")
-        
-        conn.close()
-        
+            return True
+
+        print("\n[경고] 마이그레이션이 필요합니다.")
+        print("   서버를 종료한 후 migrate_db.py를 실행하세요.")
+        print("   (새 테이블은 앱을 실행하면 자동으로 생성됩니다)")
+        return False
+
     except Exception as e:
         print(f"[오류] {str(e)}")
+        return False
+    finally:
+        engine.dispose()
 
 if __name__ == '__main__':
     check_database()
-
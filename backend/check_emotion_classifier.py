@@ -0,0 +1,110 @@
+"""
+로컬 감정 분류 확인 스크립트 (정확도 + 응답 시간)
+감정을 붙여 둔 녹음 문장(emotion_samples.jsonl)으로 emotion_classifier를 평가합니다.
+- 전체 정확도 (신뢰도와 관계없이 가장 점수가 높은 감정)
+- GPT를 생략하는 문장 비율과 그 문장들의 정확도 (LOCAL_EMOTION_MIN_CONFIDENCE 기준, --min-precision 이상이어야 통과)
+- 신뢰도 기준별 생략 비율/정확도 (기준값 조정용)
+- 문장 하나 분류 시간 (p99가 --max-us 이하여야 통과)
+
+사용법:
+    python check_emotion_classifier.py
+    python check_emotion_classifier.py --samples other_samples.jsonl --min-precision 0.9
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from emotion_classifier import LOCAL_EMOTION_MIN_CONFIDENCE, classify_emotion
+from models import EmotionType
+
+DEFAULT_SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'emotion_samples.jsonl')
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+def load_samples(path):
+    """jsonl ({"text": ..., "emotion": "행복"}) -> [(문장, EmotionType)]"""
+    by_value = {emotion.value: emotion for emotion in EmotionType}
+    samples = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                samples.append((item['text'], by_value[item['emotion']]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 감정 분류 확인')
+    parser.add_argument('--samples', default=DEFAULT_SAMPLES, help='감정을 붙인 문장 파일 (jsonl)')
+    parser.add_argument('--min-precision', type=float, default=0.9,
+                        help='GPT를 생략하는 문장의 최소 정확도')
+    parser.add_argument('--max-us', type=float, default=1000.0, help='문장 하나 분류 시간 p99 상한 (µs)')
+    parser.add_argument('--repeat', type=int, default=50, help='응답 시간 측정 반복 횟수')
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples)
+    predictions = [(text, classify_emotion(text), expected) for text, expected in samples]
+    failed = False
+
+    def check(name, ok):
+        nonlocal failed
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} {name}")
+
+    print(f"\n[정확도] 문장 {len(samples)}개 ({args.samples})")
+    print("-" * 70)
+    correct = sum(p.emotion == expected for _, p, expected in predictions)
+    print(f"  전체 정확도 {correct / len(samples):.1%} ({correct}/{len(samples)})")
+
+    print(f"\n  {'감정':6} {'문장':>4} {'정확도':>8}  자주 틀린 예측")
+    for emotion in EmotionType:
+        rows = [p for _, p, expected in predictions if expected == emotion]
+        if not rows:
+            continue
+        hits = sum(p.emotion == emotion for p in rows)
+        wrong = Counter(p.emotion.value for p in rows if p.emotion != emotion).most_common(2)
+        print(f"  {emotion.value:6} {len(rows):>4} {hits / len(rows):>8.0%}  "
+              + ', '.join(f'{value} {n}' for value, n in wrong))
+
+    print(f"\n  {'신뢰도 기준':10} {'GPT 생략':>10} {'생략한 문장 정확도':>18}")
+    for threshold in sorted(set(THRESHOLDS + [LOCAL_EMOTION_MIN_CONFIDENCE])):
+        confident = [(p, e) for _, p, e in predictions if p.scores and p.confidence >= threshold]
+        hits = sum(p.emotion == e for p, e in confident)
+        precision = hits / len(confident) if confident else 1.0
+        mark = ' <- 현재 기준' if threshold == LOCAL_EMOTION_MIN_CONFIDENCE else ''
+        print(f"  {threshold:10.2f} {len(confident) / len(samples):>10.0%} {precision:>18.1%}{mark}")
+
+    confident = [(t, p, e) for t, p, e in predictions if p.scores and p.confidence >= LOCAL_EMOTION_MIN_CONFIDENCE]
+    precision = sum(p.emotion == e for _, p, e in confident) / len(confident) if confident else 1.0
+    check(f"GPT 생략 문장 정확도 {precision:.1%} (기준 {args.min_precision:.0%}, "
+          f"생략 {len(confident)}/{len(samples)})", precision >= args.min_precision)
+    for text, p, expected in confident:
+        if p.emotion != expected:
+            print(f"      오답: '{text}' -> {p.emotion.value} ({p.confidence}), 정답 {expected.value}")
+
+    print(f"\n[응답 시간] 문장 {len(samples)}개 x {args.repeat}회")
+    print("-" * 70)
+    timings = []
+    for _ in range(args.repeat):
+        for text, _ in samples:
+            started = time.perf_counter()
+            classify_emotion(text)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"  평균 {sum(timings) / len(timings):.1f}µs, 중앙값 {p50:.1f}µs, p99 {p99:.1f}µs, 최대 {timings[-1]:.1f}µs")
+    check(f"p99 {p99:.1f}µs (기준 {args.max_us:.0f}µs)", p99 <= args.max_us)
+    print("-" * 70)
+
+    if failed:
+        print("\n[결과] 로컬 감정 분류가 기준에 맞지 않습니다.")
+        sys.exit(1)
+    print("\n[결과] 로컬 감정 분류의 정확도와 응답 시간이 기준 이내입니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+GPT 배치 분석 확인 스크립트 (오프라인)
+가짜 OpenAI 호환 서버(fake_openai_server.py)를 띄우고 services.analyze_texts_with_gpt를 확인합니다.
+- 배치 결과 = 한 건씩 분석한 결과 (감정/키워드)
+- 요청 수와 보낸 프롬프트 글자 수 (한 건씩 대비 --min-saving 이상 줄어야 통과)
+- 같은 텍스트는 한 번만 보냄, 두 번째 호출은 캐시 사용
+- 답변에서 항목이 빠지거나 잘못되면 그 텍스트만, JSON이 아니면 전부 로컬 분석으로 대체
+
+사용법:
+    python check_gpt_batch.py
+    python check_gpt_batch.py --texts 200 --batch-size 10
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+os.environ['OPENAI_API_KEY'] = 'sk-fake-' + 'x' * 40
+os.environ['GPT_MEMO_PERSIST'] = 'false'  # 캐시 DB를 쓰지 않고 메모리 캐시만
+os.environ['LOCAL_EMOTION_ENABLED'] = 'false'  # 모든 텍스트를 GPT(가짜 서버)로
+
+import services  # noqa: E402 (환경변수 설정 후 불러옴)
+from check_keyword_extraction import make_corpus  # noqa: E402
+from fake_openai_server import FakeOpenAIServer  # noqa: E402
+
+server = FakeOpenAIServer().start()
+os.environ['OPENAI_BASE_URL'] = server.url  # OpenAI 클라이언트는 첫 분석 때 생성
+
+
+def quiet(func, *args, **kwargs):
+    """분석 로그 없이 실행"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def summary(result):
+    return result['emotion'], result['keywords']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GPT 배치 분석 확인 (가짜 서버)')
+    parser.add_argument('--texts', type=int, default=100, help='분석할 문장 수')
+    parser.add_argument('--batch-size', type=int, default=services.GPT_BATCH_SIZE, help='요청 하나에 묶는 텍스트 수')
+    parser.add_argument('--min-saving', type=float, default=0.5,
+                        help='한 건씩 대비 줄어야 하는 프롬프트 글자 비율')
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.texts, seed=11)
+    failed = False
+
+    def check(name, ok, detail=''):
+        nonlocal failed
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} {name}" + (f" - {detail}" if detail and not ok else ''))
+
+    def run(func, *func_args, **kwargs):
+        services._analysis_memo.clear()
+        server.reset()
+        return quiet(func, *func_args, **kwargs)
+
+    print(f"\n[배치 분석] 문장 {len(corpus)}개, 묶음 {args.batch_size}개 (가짜 서버 {server.url})")
+    print("-" * 70)
+    single = run(lambda: [services.analyze_text_with_gpt(text) for text in corpus])
+    single_requests, single_chars = server.requests, server.prompt_chars
+    batch = run(services.analyze_texts_with_gpt, corpus, batch_size=args.batch_size)
+    batch_requests, batch_chars = server.requests, server.prompt_chars
+
+    check("배치 결과 = 한 건씩 결과", [summary(r) for r in batch] == [summary(r) for r in single])
+    check("모두 GPT 결과", all(r['source'] == 'gpt' for r in batch + single),
+          str({r['source'] for r in batch + single}))
+    expected_requests = -(-len(corpus) // args.batch_size)
+    check(f"요청 수 {single_requests} -> {batch_requests}", batch_requests == expected_requests,
+          f'기대 {expected_requests}')
+    saving = 1 - batch_chars / single_chars
+    check(f"프롬프트 글자 수 {single_chars:,} -> {batch_chars:,} ({saving:.0%} 감소, 기준 {args.min_saving:.0%})",
+          saving >= args.min_saving)
+
+    again = quiet(services.analyze_texts_with_gpt, corpus, batch_size=args.batch_size)
+    check(f"두 번째 호출은 캐시 사용 (추가 요청 {server.requests - batch_requests}개)",
+          server.requests == batch_requests and all(r['source'] == 'cache' for r in again))
+
+    texts = corpus[:3] + [corpus[0], '  ' + corpus[1] + '!!']
+    results = run(services.analyze_texts_with_gpt, texts, batch_size=args.batch_size)
+    check(f"같은 텍스트는 한 번만 ({len(texts)}개 -> {server.texts}개 전송)",
+          server.requests == 1 and server.texts == 3 and summary(results[3]) == summary(results[0])
+          and summary(results[4]) == summary(results[1]))
+
+    print("\n[항목별 대체]")
+    print("-" * 70)
+    texts = corpus[:4]
+    for fault, expected in [('drop_item', ['gpt', 'fallback', 'gpt', 'gpt']),
+                            ('bad_item', ['gpt', 'fallback', 'gpt', 'gpt']),
+                            ('invalid_json', ['fallback'] * 4)]:
+        server.fault = fault
+        results = run(services.analyze_texts_with_gpt, texts, batch_size=args.batch_size)
+        server.fault = None
+        sources = [r['source'] for r in results]
+        check(f"{fault}: {sources}", sources == expected, f'기대 {expected}')
+        check(f"{fault}: 대체 결과도 감정/키워드 있음",
+              all(r['emotion'] is not None and r['keywords'] for r in results))
+    print("-" * 70)
+
+    server.stop()
+    if failed:
+        print("\n[결과] GPT 배치 분석이 기준에 맞지 않습니다.")
+        sys.exit(1)
+    print("\n[결과] GPT 배치 분석 결과가 한 건씩 분석과 같고 요청이 줄었습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+ChatGPT 호출 클라이언트 확인 스크립트 (오프라인)
+지연과 오류를 넣은 가짜 OpenAI 호환 서버(fake_openai_server.py)로 gpt_client.GPTClient를 확인합니다.
+- 동시 호출 수 제한 (동기 호출 여러 스레드 / complete_many)
+- 429/5xx는 재시도, 400은 바로 실패, 재시도를 모두 실패하면 마지막 오류
+- Retry-After 이상 대기, 백오프 지터 범위
+- 시도 시간 초과는 재시도, 마감 시간(대기 포함)을 넘으면 GPTDeadlineExceeded
+- services.analyze_text_with_gpt: API가 느려도 마감 시간 뒤에 로컬 분석으로 대체
+
+사용법:
+    python check_gpt_client.py
+"""
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+os.environ['OPENAI_API_KEY'] = 'sk-fake-' + 'x' * 40
+os.environ['GPT_MEMO_PERSIST'] = 'false'
+os.environ['LOCAL_EMOTION_ENABLED'] = 'false'  # 모든 텍스트를 GPT(가짜 서버)로
+os.environ['GPT_DEADLINE'] = '0.5'  # services의 클라이언트 마감 시간
+
+import openai  # noqa: E402
+import services  # noqa: E402 (환경변수 설정 후 불러옴)
+from fake_openai_server import FakeOpenAIServer  # noqa: E402
+from gpt_client import GPTClient, GPTDeadlineExceeded  # noqa: E402
+
+server = FakeOpenAIServer(seed=7).start()
+os.environ['OPENAI_BASE_URL'] = server.url  # services의 클라이언트는 첫 분석 때 생성
+
+MESSAGES = [{'role': 'user', 'content': '다음 텍스트를 분석해주세요:\n\n"친구랑 카페에 갔다"\n\n1. 감정 분석'}]
+
+
+def make_client(**options):
+    options.setdefault('backoff_base', 0.02)
+    options.setdefault('deadline', 5)
+    return GPTClient('sk-fake', base_url=server.url, **options)
+
+
+def attempt(client, quiet=True):
+    """호출 -> (결과 또는 예외, 걸린 시간), quiet면 재시도 로그 생략 (sys.stdout을 바꾸므로 스레드에서는 False)"""
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            result = client.complete(MESSAGES, max_tokens=200)
+    except Exception as e:
+        result = e
+    return result, time.perf_counter() - started
+
+
+def scenario(latency=0.0):
+    server.reset()
+    server.latency = latency
+
+
+def main():
+    failed = False
+
+    def check(name, ok, detail=''):
+        nonlocal failed
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} {name}" + (f" - {detail}" if detail and not ok else ''))
+
+    print(f"\n[동시 호출 제한] (가짜 서버 {server.url})")
+    print("-" * 70)
+    client = make_client(max_concurrency=4)
+    scenario(latency=0.2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(attempt(client, quiet=False))) for _ in range(16)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    check(f"동기 호출 16개 (스레드) -> 최대 동시 요청 {server.max_active}개 (제한 4), {elapsed:.2f}초",
+          server.max_active == 4 and all(isinstance(r, str) for r, _ in results))
+
+    scenario(latency=0.2)
+    responses = client.complete_many([{'messages': MESSAGES, 'max_tokens': 200}] * 16)
+    check(f"complete_many 16개 -> 최대 동시 요청 {server.max_active}개 (제한 4)",
+          server.max_active == 4 and all(isinstance(r, str) for r in responses))
+    client.close()
+
+    print("\n[재시도]")
+    print("-" * 70)
+    client = make_client(max_retries=3)
+    for status in (429, 500, 503):
+        scenario()
+        server.fail_next(status, count=2)
+        result, _ = attempt(client)
+        check(f"{status} 2번 후 성공 (요청 {server.requests}개)", isinstance(result, str) and server.requests == 3,
+              repr(result))
+
+    scenario()
+    server.fail_next(503, count=10)
+    result, _ = attempt(client)
+    check(f"503 계속 -> 재시도 3번 후 실패 (요청 {server.requests}개, {type(result).__name__})",
+          isinstance(result, openai.InternalServerError) and server.requests == 4)
+
+    scenario()
+    server.fail_next(400)
+    result, _ = attempt(client)
+    check(f"400은 재시도하지 않음 (요청 {server.requests}개, {type(result).__name__})",
+          isinstance(result, openai.BadRequestError) and server.requests == 1)
+
+    scenario()
+    server.fail_next(429, retry_after=0.3)
+    result, elapsed = attempt(client)
+    check(f"Retry-After 0.3초 이상 대기 ({elapsed:.2f}초)", isinstance(result, str) and elapsed >= 0.3)
+    check(f"재시도 통계 {client.stats()['retries']}회", client.stats()['retries'] == 2 * 3 + 3 + 1)
+    client.close()
+
+    client = make_client(backoff_base=0.5, backoff_max=8)
+    delays = [client.backoff(3) for _ in range(1000)]
+    check(f"백오프 지터: 3번째 재시도 대기 {min(delays):.2f}~{max(delays):.2f}초 (0~4초)",
+          0 <= min(delays) and max(delays) <= 4 and len(set(delays)) > 900)
+    capped = max(client.backoff(10) for _ in range(100))
+    check(f"백오프 상한: 10번째 재시도 대기 최대 {capped:.2f}초 (상한 8초)", capped <= 8)
+    client.close()
+
+    print("\n[마감 시간]")
+    print("-" * 70)
+    client = make_client(attempt_timeout=0.2, max_retries=1, deadline=5)
+    scenario(latency=0.5)
+    result, elapsed = attempt(client)
+    check(f"시도 시간 초과 -> 재시도 (요청 {server.requests}개, {type(result).__name__}, {elapsed:.2f}초)",
+          isinstance(result, openai.APITimeoutError) and server.requests == 2)
+    client.close()
+
+    client = make_client(deadline=0.3)
+    scenario(latency=2.0)
+    result, elapsed = attempt(client)
+    check(f"응답이 2초 걸려도 마감 0.3초에 실패 ({type(result).__name__}, {elapsed:.2f}초)",
+          isinstance(result, GPTDeadlineExceeded) and elapsed < 0.6)
+    client.close()
+
+    client = make_client(max_concurrency=1, deadline=0.6)
+    scenario(latency=0.4)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(attempt(client, quiet=False)[0])) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    kinds = sorted(type(r).__name__ for r in results)
+    check(f"자리를 기다리는 시간도 마감에 포함 ({kinds})", kinds == ['GPTDeadlineExceeded', 'str'])
+    check(f"마감 초과 통계 {client.stats()['deadline_exceeded']}회", client.stats()['deadline_exceeded'] == 1)
+    client.close()
+
+    print("\n[분석 대체] services.analyze_text_with_gpt (GPT_DEADLINE=0.5)")
+    print("-" * 70)
+    scenario(latency=3.0)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        analysis = services.analyze_text_with_gpt('오늘 친구랑 카페에서 이야기했다')
+    elapsed = time.perf_counter() - started
+    check(f"API 응답 3초 -> {elapsed:.2f}초 만에 {analysis['source']} ({analysis['emotion'].value}, {analysis['keywords']})",
+          analysis['source'] == 'fallback' and elapsed < 1.0)
+
+    scenario()
+    with contextlib.redirect_stdout(io.StringIO()):
+        analysis = services.analyze_text_with_gpt('오늘 동생이랑 공원에서 자전거를 탔다')
+    check(f"API가 정상이면 GPT 결과 ({analysis['source']})", analysis['source'] == 'gpt')
+    print("-" * 70)
+
+    server.stop()
+    if failed:
+        print("\n[결과] ChatGPT 호출 클라이언트가 기준에 맞지 않습니다.")
+        sys.exit(1)
+    print("\n[결과] 동시 호출 제한, 재시도, 마감 시간이 기대대로 동작합니다.")
+
+
+if __name__ == '__main__':
+    main()
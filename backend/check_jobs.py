@@ -0,0 +1,235 @@
+"""
+비동기 작업 큐 확인 스크립트 (jobs.py)
+임시 SQLite DB에서 워커 스레드 없이 claim_next_job/run_job을 직접 호출해 확인합니다.
+- 중복 점유 없음: 여러 스레드가 동시에 작업을 가져가도 작업마다 한 번만 점유
+- 점유 만료: 점유 중인 작업은 다른 워커가 가져가지 못하고, JOB_LEASE_SECONDS가 지나면 다시 가져감 (시도 횟수 증가)
+- 재시도 한도: 처리가 JOB_MAX_ATTEMPTS번 실패하면 작업/녹음이 failed (그 전에는 pending으로 다시 대기)
+  처리 중 워커가 죽어 점유 만료로 한도를 넘긴 작업도 처리하지 않고 failed
+- 임시 감정값: 비동기 업로드 직후 보통(CONFUSION)으로 집계된 녹음이 작업 완료 후 분석 결과로 바뀜
+  (녹음, 아카이브 감정 집계, 자주 나온 키워드)
+
+사용법:
+    python check_jobs.py
+    python check_jobs.py --threads 16 --jobs 200
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager, redirect_stdout
+from datetime import timedelta
+
+# app을 불러오기 전에 임시 DB와 워커 설정
+_temp_dir = tempfile.mkdtemp(prefix='revo-jobs-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_temp_dir, 'revo.db')
+os.environ['JOB_WORKERS'] = '0'
+os.environ['CACHE_DB_PATH'] = os.path.join(_temp_dir, 'cache.db')
+
+import app as app_module  # noqa: E402 (환경변수 설정 후 불러옴)
+import jobs  # noqa: E402
+from app import app  # noqa: E402
+from check_backends import wav_bytes  # noqa: E402
+from jobs import JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, claim_next_job, enqueue_job, run_job  # noqa: E402
+from models import db, EmotionType, ProcessingJob, ProcessingStatus, Recording  # noqa: E402
+from services import extract_keywords_simple  # noqa: E402
+
+
+@contextmanager
+def shifted_clock(seconds):
+    """작업 큐가 보는 현재 시각을 seconds만큼 뒤로 (점유 만료 확인)"""
+    original = jobs.get_kst_now
+    jobs.get_kst_now = lambda: original() + timedelta(seconds=seconds)
+    try:
+        yield
+    finally:
+        jobs.get_kst_now = original
+
+
+def add_jobs(user_id, count):
+    """pending 녹음 + 작업 count개 -> 작업 ID 목록"""
+    created = []
+    for i in range(count):
+        recording = Recording(user_id=user_id, content=f'작업 확인 {i}', audio_file=f'job_{i}.webm',
+                              emotion=EmotionType.CONFUSION, status=ProcessingStatus.PENDING)
+        db.session.add(recording)
+        created.append(enqueue_job(recording))
+    db.session.commit()
+    return [job.id for job in created]
+
+
+def finish(job_id):
+    """점유한 작업을 아무것도 하지 않는 처리 함수로 완료 (다음 확인에 남지 않도록)"""
+    run_job(job_id, lambda recording, job: None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='비동기 작업 큐 확인')
+    parser.add_argument('--threads', type=int, default=8, help='동시에 작업을 가져가는 스레드 수')
+    parser.add_argument('--jobs', type=int, default=100, help='동시 점유 확인에 쓸 작업 수')
+    args = parser.parse_args()
+
+    failed = False
+
+    def check(name, ok, detail=''):
+        nonlocal failed
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} {name}" + (f" - {detail}" if detail and not ok else ''))
+
+    app_module.UPLOAD_FOLDER = os.path.join(_temp_dir, 'uploads')
+    client = app.test_client()
+    with redirect_stdout(io.StringIO()):
+        user_id = client.post('/api/users', json={'name': '작업'}).get_json()['user']['id']
+
+    with app.app_context():
+        # 1. 중복 점유
+        print(f"\n[중복 점유] 작업 {args.jobs}개, 스레드 {args.threads}개")
+        print("-" * 70)
+        job_ids = add_jobs(user_id, args.jobs)
+        claimed = []
+        errors = []
+        start = threading.Barrier(args.threads)
+
+        def worker():
+            start.wait()
+            with app.app_context():
+                try:
+                    while True:
+                        job_id = claim_next_job()
+                        if job_id is None:
+                            # 경합으로 재시도를 다 쓴 경우와 구분: 남은 대기 작업이 없을 때만 종료
+                            if not db.session.query(ProcessingJob.id).filter(
+                                    ProcessingJob.status == ProcessingStatus.PENDING).first():
+                                break
+                            continue
+                        claimed.append(job_id)
+                except Exception as e:
+                    errors.append(f'{type(e).__name__}: {e}')
+                finally:
+                    db.session.remove()
+
+        threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duplicates = [job_id for job_id, n in Counter(claimed).items() if n > 1]
+        check(f"점유 {len(claimed)}개, 중복 {len(duplicates)}개, 오류 {len(errors)}개",
+              not duplicates and not errors and set(claimed) == set(job_ids), '; '.join(errors[:3]))
+        attempts = Counter(job.attempts for job in db.session.query(ProcessingJob).filter(ProcessingJob.id.in_(job_ids)))
+        check(f"모든 작업 시도 1회 ({dict(attempts)})", attempts == Counter({1: len(job_ids)}))
+        check("점유 중인 작업은 다시 가져가지 않음", claim_next_job() is None)
+        with redirect_stdout(io.StringIO()):
+            for job_id in job_ids:
+                finish(job_id)
+        db.session.remove()
+
+        # 2. 점유 만료
+        print(f"\n[점유 만료] JOB_LEASE_SECONDS={JOB_LEASE_SECONDS}")
+        print("-" * 70)
+        job_id = add_jobs(user_id, 1)[0]
+        first = claim_next_job()
+        with shifted_clock(JOB_LEASE_SECONDS - 1):
+            before_expiry = claim_next_job()
+        with shifted_clock(JOB_LEASE_SECONDS + 1):
+            reclaimed = claim_next_job()
+        db.session.remove()
+        job = db.session.get(ProcessingJob, job_id)
+        check(f"만료 전에는 가져가지 않음 ({before_expiry})", first == job_id and before_expiry is None)
+        check(f"만료 후 다시 점유, 시도 {job.attempts}회", reclaimed == job_id and job.attempts == 2
+              and job.status == ProcessingStatus.PROCESSING)
+        with redirect_stdout(io.StringIO()):
+            finish(job_id)
+        db.session.remove()
+
+        # 3. 재시도 한도
+        print(f"\n[재시도 한도] JOB_MAX_ATTEMPTS={JOB_MAX_ATTEMPTS}")
+        print("-" * 70)
+
+        def broken(recording, job):
+            raise RuntimeError('STT 서버 응답 없음')
+
+        job_id = add_jobs(user_id, 1)[0]
+        history = []
+        for _ in range(JOB_MAX_ATTEMPTS):
+            claimed_id = claim_next_job()
+            if claimed_id != job_id:
+                break
+            with redirect_stdout(io.StringIO()):
+                run_job(claimed_id, broken)
+            db.session.remove()
+            job = db.session.get(ProcessingJob, job_id)
+            history.append((job.attempts, job.status, job.recording.status))
+        pending = [(n, ProcessingStatus.PENDING, ProcessingStatus.PENDING) for n in range(1, JOB_MAX_ATTEMPTS)]
+        check(f"{JOB_MAX_ATTEMPTS - 1}회 실패까지 다시 대기 ({history[:-1]})", history[:-1] == pending)
+        check(f"{JOB_MAX_ATTEMPTS}회째 실패 -> {history[-1] if history else None}",
+              history[-1:] == [(JOB_MAX_ATTEMPTS, ProcessingStatus.FAILED, ProcessingStatus.FAILED)]
+              and job.error == 'STT 서버 응답 없음' and job.finished_at is not None)
+        check("실패한 작업은 다시 가져가지 않음", claim_next_job() is None)
+        db.session.remove()
+
+        # 처리 중 워커가 죽는 경우 (점유만 하고 결과 없이 만료) - 한도를 넘으면 처리하지 않고 실패
+        job_id = add_jobs(user_id, 1)[0]
+        calls = []
+        for attempt in range(JOB_MAX_ATTEMPTS + 1):
+            with shifted_clock(attempt * (JOB_LEASE_SECONDS + 1)):
+                claimed_id = claim_next_job()
+                if attempt == JOB_MAX_ATTEMPTS and claimed_id is not None:
+                    with redirect_stdout(io.StringIO()):
+                        run_job(claimed_id, lambda recording, job: calls.append(job.id))
+        db.session.remove()
+        job = db.session.get(ProcessingJob, job_id)
+        check(f"점유 만료로 한도 초과 -> 작업 {job.status}, 녹음 {job.recording.status}, 처리 함수 {len(calls)}회 호출",
+              claimed_id == job_id and not calls and job.status == ProcessingStatus.FAILED
+              and job.recording.status == ProcessingStatus.FAILED)
+        db.session.remove()
+
+        # 4. 임시 감정값 교체
+        print("\n[임시 감정값] 비동기 업로드 -> 작업 완료")
+        print("-" * 70)
+        app_module.analyze_transcript = lambda transcript: (
+            ','.join(extract_keywords_simple(transcript)), EmotionType.JOY
+        )
+        with redirect_stdout(io.StringIO()):
+            placeholder_user = client.post('/api/users', json={'name': '임시감정'}).get_json()['user']['id']
+            response = client.post('/api/recordings', data={
+                'audio': (io.BytesIO(wav_bytes()), 'placeholder.wav'),
+                'user_id': str(placeholder_user),
+                'transcript': '한강 공원에서 자전거를 타고 친구랑 치킨을 먹었다',
+                'async': 'true',
+            }, content_type='multipart/form-data')
+        body = response.get_json()
+        archive = client.get(f'/api/users/{placeholder_user}/archive').get_json()
+        check(f"접수 직후 {body['recording']['emotion']} (보통 {archive['emotions'][EmotionType.CONFUSION.value]}건 집계)",
+              response.status_code == 202 and body['recording']['emotion'] == EmotionType.CONFUSION.value
+              and archive['emotions'][EmotionType.CONFUSION.value] == 1 and not archive['top_keywords'])
+
+        with redirect_stdout(io.StringIO()):
+            job_id = claim_next_job()
+            run_job(job_id, app_module.process_recording_job)
+        db.session.remove()
+        job = client.get(f"/api/jobs/{body['job']['id']}").get_json()
+        archive = client.get(f'/api/users/{placeholder_user}/archive').get_json()
+        emotions = {emotion: n for emotion, n in archive['emotions'].items() if n}
+        check(f"작업 완료 -> 녹음 {job['recording']['emotion']}, 집계 {emotions}",
+              job_id == body['job']['id'] and job['job']['status'] == ProcessingStatus.DONE
+              and job['recording']['status'] == ProcessingStatus.DONE
+              and job['recording']['emotion'] == EmotionType.JOY.value
+              and emotions == {EmotionType.JOY.value: 1} and archive['total'] == 1)
+        check(f"분석 키워드 집계 ({[k['keyword'] for k in archive['top_keywords']]})",
+              bool(archive['top_keywords']) and all(k['count'] == 1 for k in archive['top_keywords']))
+
+        db.session.remove()
+        db.engine.dispose()
+
+    print("-" * 70)
+    if failed:
+        print("\n[결과] 작업 큐가 기준에 맞지 않습니다.")
+        sys.exit(1)
+    print("\n[결과] 작업을 한 번만 점유하고, 만료/재시도 한도/임시 감정값을 올바르게 처리합니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+로컬 키워드 추출 확인 스크립트 (결과 + 속도)
+한국어 녹음 문장 코퍼스로 services.extract_keywords_simple / extract_keywords_batch를
+이전 구현(조사 정규식 24개를 단어마다 차례로 적용, 호출마다 불용어 집합 생성)과 비교합니다.
+- 배치 추출 결과 = 한 건씩 추출한 결과
+- 기본 예문의 키워드
+- 한 건당 추출 시간과 배치 처리량 (이전 구현 대비 --min-speedup배 이상 빨라야 통과)
+- 이전 구현과 키워드가 다른 문장 비율 (참고 - 겹조사/'에'를 떼는 등 조사 처리가 달라진 부분)
+
+사용법:
+    python check_keyword_extraction.py
+    python check_keyword_extraction.py --texts 5000 --min-speedup 2
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+from services import extract_keywords_simple, extract_keywords_batch, strip_josa
+
+NOUNS = [
+    '친구', '학교', '회사', '카페', '커피', '산책', '고양이', '강아지', '하늘', '음악', '노래', '영화', '저녁',
+    '아침', '점심', '버스', '지하철', '공원', '바다', '여행', '엄마', '아빠', '동생', '선생님', '시험', '발표',
+    '회의', '야근', '퇴근', '주말', '생일', '선물', '케이크', '떡볶이', '라면', '김치찌개', '치킨', '한강',
+    '자전거', '운동', '도서관', '편의점', '택시', '우산', '벚꽃', '단풍', '콘서트', '전시회', '성북동', '강남구',
+]
+JOSA = ['', '', '은', '는', '이', '가', '을', '를', '에', '에서', '에서는', '으로', '로', '랑', '와', '과', '도',
+        '의', '까지', '부터', '처럼', '한테', '에게', '에는', '까지도']
+FILLERS = ['오늘', '정말', '너무', '그냥', '진짜', '아주', '좀', '지금']
+VERBS = ['갔다', '왔다', '먹었다', '만났다', '봤다', '들었다', '좋았다', '힘들었다', '행복했다', '웃었다', '울었다']
+
+# (문장, 기대 키워드)
+EXAMPLES = [
+    ('오늘 학교에서 친구와 카페에 갔다. 카페에서 커피를 마셨고 친구가 웃었다. 학교는 조용했다', ['학교', '친구', '카페']),
+    ('성북동 산책길에서 아기고양이를 만났다', ['성북동', '산책길', '아기고양이']),
+    ('주말에는 한강까지 자전거를 탔다', ['주말', '한강', '자전거']),
+    ('정말 너무 그냥 좋다', []),
+    ('', []),
+]
+
+
+def legacy_extract_keywords(text):
+    """이전 구현 (비교용으로 그대로 보관)"""
+    import re
+    from collections import Counter
+
+    josa_patterns = [
+        r'은$', r'는$', r'이$', r'가$', r'을$', r'를$', r'의$', r'와$', r'과$',
+        r'도$', r'로$', r'으로$', r'에서$', r'에게$', r'께$', r'한테$', r'에게서$',
+        r'만$', r'까지$', r'부터$', r'처럼$', r'같이$', r'보다$', r'마다$'
+    ]
+
+    stop_words = {'이', '가', '을', '를', '은', '는', '의', '와', '과', '도', '로', '으로',
+                  '에서', '에게', '께', '한', '한다', '하다', '되는', '되다', '있다', '없다',
+                  '그', '그것', '이것', '저것', '그런', '이런', '저런', '그렇게', '이렇게',
+                  '잘', '좀', '더', '매우', '너무', '정말', '진짜', '그냥', '아주',
+                  '오늘', '어제', '내일', '지금', '그때', '이때', '저때',
+                  '나갔다', '왔다', '갔다', '했다', '했다', '했다', '했다',
+                  '좋다', '나쁘다', '크다', '작다', '많다', '적다'}
+
+    words = re.findall(r'[가-힣]{2,}', text)
+
+    cleaned_words = []
+    for word in words:
+        cleaned = word
+        for pattern in josa_patterns:
+            cleaned = re.sub(pattern, '', cleaned)
+        if len(cleaned) >= 2 and cleaned not in stop_words:
+            cleaned_words.append(cleaned)
+
+    word_counts = Counter(cleaned_words)
+    return [word for word, count in word_counts.most_common(3)]
+
+
+def make_corpus(count, seed=7):
+    """녹음 문장 코퍼스 (문장 2~5개, 문장마다 명사+조사 2~4개와 동사)"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.randint(2, 5)):
+            words = [rng.choice(FILLERS)] if rng.random() < 0.5 else []
+            words += [rng.choice(NOUNS) + rng.choice(JOSA) for _ in range(rng.randint(2, 4))]
+            sentences.append(' '.join(words) + ' ' + rng.choice(VERBS))
+        corpus.append('. '.join(sentences) + '.')
+    return corpus
+
+
+def per_call_ms(extract, corpus):
+    """한 건씩 호출했을 때 건당 평균 시간 (ms)"""
+    started = time.perf_counter()
+    for text in corpus:
+        extract(text)
+    return (time.perf_counter() - started) * 1000 / len(corpus)
+
+
+def best_of(repeat, measure):
+    return min(measure() for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 키워드 추출 확인')
+    parser.add_argument('--texts', type=int, default=2000, help='코퍼스 문장 수')
+    parser.add_argument('--repeat', type=int, default=5, help='측정 반복 횟수 (가장 빠른 값 사용)')
+    parser.add_argument('--min-speedup', type=float, default=2.0,
+                        help='이전 구현 대비 한 건당 추출 속도 하한 (배, 0이면 확인 안 함)')
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.texts)
+    failed = False
+
+    def check(name, ok, detail=''):
+        nonlocal failed
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} {name}" + (f" - {detail}" if detail and not ok else ''))
+
+    print("\n[결과 확인]")
+    print("-" * 70)
+    for text, expected in EXAMPLES:
+        keywords = extract_keywords_simple(text)
+        check(f"'{text[:30]}' -> {keywords}", keywords == expected, f'기대 {expected}')
+    batch = extract_keywords_batch(corpus)
+    single = [extract_keywords_simple(text) for text in corpus]
+    check(f"배치 추출 = 한 건씩 추출 ({len(corpus)}건)", batch == single)
+
+    differs = [(text, old, new) for text, old, new in
+               zip(corpus, (legacy_extract_keywords(t) for t in corpus), single) if old != new]
+    print(f"  (참고) 이전 구현과 키워드가 다른 문장 {len(differs)}/{len(corpus)}건")
+    changed = Counter()
+    for word in {w for text in corpus for w in re.findall(r'[가-힣]{2,}', text)}:
+        old = legacy_extract_keywords(word)
+        new = [strip_josa(word)]
+        if old and old != new:
+            changed[f'{word}: {old[0]} -> {new[0]}'] += 1
+    for example in sorted(changed)[:5]:
+        print(f"         예: {example}")
+
+    print(f"\n[속도] 문장 {len(corpus)}개, {args.repeat}회 중 최솟값")
+    print("-" * 70)
+    legacy_ms = best_of(args.repeat, lambda: per_call_ms(legacy_extract_keywords, corpus))
+
+    def cold():
+        strip_josa.cache_clear()
+        return per_call_ms(extract_keywords_simple, corpus)
+
+    cold_ms = best_of(args.repeat, cold)
+    warm_ms = best_of(args.repeat, lambda: per_call_ms(extract_keywords_simple, corpus))
+
+    def batch_ms():
+        strip_josa.cache_clear()
+        started = time.perf_counter()
+        extract_keywords_batch(corpus)
+        return (time.perf_counter() - started) * 1000 / len(corpus)
+
+    batched_ms = best_of(args.repeat, batch_ms)
+
+    for label, ms in [('이전 구현', legacy_ms), ('한 건씩 (캐시 비움)', cold_ms),
+                      ('한 건씩 (캐시 사용)', warm_ms), ('배치 (캐시 비움)', batched_ms)]:
+        print(f"  {label:20} {ms * 1000:8.1f}µs/건  {1000 / ms:10.0f}건/초  x{legacy_ms / ms:5.1f}")
+
+    speedup = legacy_ms / cold_ms
+    if args.min_speedup:
+        check(f"한 건당 추출 {speedup:.1f}배 빠름 (기준 {args.min_speedup}배)", speedup >= args.min_speedup)
+    print("-" * 70)
+
+    if failed:
+        print("\n[결과] 키워드 추출 결과 또는 속도가 기준에 맞지 않습니다.")
+        sys.exit(1)
+    print("\n[결과] 키워드 추출 결과가 일관되고 이전 구현보다 빠릅니다.")
+
+
+if __name__ == '__main__':
+    main()
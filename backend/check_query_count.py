@@ -0,0 +1,124 @@
+"""
+목록 API 쿼리 수 확인 스크립트 (N+1 회귀 확인용)
+임시 SQLite DB에 데이터 양을 달리해 채운 뒤, 목록 API가 실행하는 SQL 문 수가
+행 수와 관계없이 같은지 확인합니다.
+
+사용법:
+    python check_query_count.py
+"""
+import os
+import sys
+import tempfile
+
+# app을 불러오기 전에 임시 DB와 워커 설정 (실제 DB와 백그라운드 워커 쿼리 영향 방지)
+_temp_dir = tempfile.mkdtemp(prefix='revo-querycount-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_temp_dir, 'revo.db')
+os.environ['JOB_WORKERS'] = '0'
+os.environ['CACHE_DB_PATH'] = os.path.join(_temp_dir, 'cache.db')
+
+from sqlalchemy import event  # noqa: E402
+
+from app import app  # noqa: E402
+from models import db, User, Recording, EmotionType  # noqa: E402
+import rollups  # noqa: E402
+import keyword_index  # noqa: E402
+
+# (사용자 수, 사용자당 녹음 수)
+DATASETS = [(3, 2), (30, 20)]
+
+ENDPOINTS = [
+    '/api/users',
+    '/api/recordings?limit=100',
+    '/api/recordings?limit=100&is_uploaded=true',
+    '/api/users/1',
+    '/api/users/1/archive',
+    '/api/keywords?limit=100',
+    '/api/keywords/녹음/recordings?limit=100',
+]
+
+
+class QueryCounter:
+    """엔진에서 실행되는 SQL 문 수 세기"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def seed(num_users, recordings_per_user):
+    """테이블을 비우고 데이터 채우기"""
+    db.drop_all()
+    db.create_all()
+    emotions = list(EmotionType)
+    for i in range(num_users):
+        user = User(name=f'사용자{i}')
+        db.session.add(user)
+        db.session.flush()
+        for j in range(recordings_per_user):
+            db.session.add(Recording(
+                user_id=user.id,
+                content=f'테스트 녹음 {i}-{j}',
+                keywords='테스트,녹음',
+                audio_file=f'test_{i}_{j}.webm',
+                emotion=emotions[j % len(emotions)],
+                is_uploaded=j % 2 == 0
+            ))
+    db.session.flush()
+    rollups.rebuild()
+    keyword_index.rebuild(db.session.connection())
+    db.session.commit()
+
+
+def measure():
+    """엔드포인트별 쿼리 수"""
+    client = app.test_client()
+    results = {}
+    for url in ENDPOINTS:
+        # 요청마다 세션이 새로 열리므로 이전 요청의 identity map 영향 없음
+        with QueryCounter(db.engine) as counter:
+            response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f'{url} 응답 오류: {response.status_code} {response.get_data(as_text=True)}')
+        results[url] = counter.count
+    return results
+
+
+def main():
+    measurements = []
+    with app.app_context():
+        for num_users, per_user in DATASETS:
+            seed(num_users, per_user)
+            db.session.remove()
+            measurements.append(measure())
+
+    print("\n[목록 API 쿼리 수]")
+    print("-" * 70)
+    header = ''.join(f'{f"{u}명x{r}개":>14}' for u, r in DATASETS)
+    print(f"  {'엔드포인트':40}{header}")
+    failed = False
+    for url in ENDPOINTS:
+        counts = [m[url] for m in measurements]
+        ok = len(set(counts)) == 1
+        failed = failed or not ok
+        print(f"  {url:40}{''.join(f'{c:>14}' for c in counts)}  {'OK' if ok else '증가함 (N+1 의심)'}")
+    print("-" * 70)
+
+    if failed:
+        print("\n[결과] 행 수에 따라 쿼리 수가 늘어나는 엔드포인트가 있습니다.")
+        sys.exit(1)
+    print("\n[결과] 모든 목록 API의 쿼리 수가 데이터 양과 무관합니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+녹음 조회 쿼리 실행 계획 확인 스크립트 (인덱스 회귀 확인용)
+임시 SQLite DB에 데이터를 채우고 각 API가 실행하는 SQL을 그대로 수집한 뒤
+EXPLAIN QUERY PLAN으로 녹음/집계 테이블을 SCAN(인덱스를 순서대로 훑는 SCAN ... USING INDEX 포함)하거나
+행 정렬을 위해 임시 B-tree를 만드는 쿼리가 있으면 실패합니다.
+- 예외: LIMIT이 있는 최신 피드 쿼리가 최신순 인덱스를 역순으로 훑는 경우 (limit개를 찾으면 멈춤)
+- GROUP BY 결과를 정렬하는 것은 구간 수만큼만 정렬하므로 허용
+
+사용법:
+    python check_query_plan.py
+"""
+import os
+import re
+import sys
+import tempfile
+
+# app을 불러오기 전에 임시 DB와 워커 설정 (실제 DB와 백그라운드 워커 쿼리 영향 방지)
+_temp_dir = tempfile.mkdtemp(prefix='revo-queryplan-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_temp_dir, 'revo.db')
+os.environ['JOB_WORKERS'] = '0'
+os.environ['CACHE_DB_PATH'] = os.path.join(_temp_dir, 'cache.db')
+
+from datetime import datetime, timedelta  # noqa: E402
+
+from sqlalchemy import event, text  # noqa: E402
+
+from app import app  # noqa: E402
+from models import db, User, Recording, EmotionType  # noqa: E402
+from delete_today_records import today_records_query  # noqa: E402
+import rollups  # noqa: E402
+import keyword_index  # noqa: E402
+
+NUM_USERS = 50
+RECORDINGS_PER_USER = 40
+DISTRICTS = ['성북동', '강남구', '종로구', '마포구', None]
+
+# 전체 스캔이 있으면 안 되는 테이블
+CHECKED_TABLES = {
+    'recordings',
+    'user_month_emotion_stats',
+    'user_month_district_stats',
+    'user_month_keyword_stats',
+    'keywords',
+    'recording_keywords',
+}
+
+# "SCAN recordings" (3.36+) / "SCAN TABLE recordings" (이전 버전)
+# USING INDEX / USING COVERING INDEX도 인덱스 전체를 훑으므로 SCAN이면 모두 검사 (SEARCH만 범위 조회)
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+))?')
+
+# 허용하는 SCAN: 최신 피드 (최신순 인덱스를 역순으로 따라가다 LIMIT개에서 멈춤)
+RECENCY_FEED_SCANS = {('recordings', 'ix_recordings_recorded_at_id')}
+RECENCY_FEED_ORDER = re.compile(r'ORDER BY recordings\.recorded_at DESC, recordings\.id DESC LIMIT ', re.IGNORECASE)
+TEMP_SORT = re.compile(r'USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY')
+
+
+class StatementRecorder:
+    """엔진에서 실행되는 SELECT 문과 파라미터 수집"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def seed():
+    """테스트 데이터 채우기 + 플래너 통계 갱신"""
+    db.drop_all()
+    db.create_all()
+    emotions = list(EmotionType)
+    base = datetime.now() - timedelta(days=RECORDINGS_PER_USER)
+    for i in range(NUM_USERS):
+        user = User(name=f'사용자{i}')
+        db.session.add(user)
+        db.session.flush()
+        for j in range(RECORDINGS_PER_USER):
+            db.session.add(Recording(
+                user_id=user.id,
+                content=f'테스트 녹음 {i}-{j}',
+                keywords='테스트,녹음',
+                audio_file=f'test_{i}_{j}.webm',
+                emotion=emotions[(i + j) % len(emotions)],
+                district=DISTRICTS[j % len(DISTRICTS)],
+                recorded_at=base + timedelta(days=j, minutes=i),
+                is_uploaded=j % 4 == 0
+            ))
+    db.session.flush()
+    rollups.rebuild()
+    keyword_index.rebuild(db.session.connection())
+    db.session.commit()
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+
+def collect_cases():
+    """(이름, 수집한 SQL 목록) - 앱 컨텍스트 안에서 호출"""
+    client = app.test_client()
+    month = datetime.now().strftime('%Y-%m')
+    start = (datetime.now() - timedelta(days=14)).strftime('%Y-%m-%d')
+    end = datetime.now().strftime('%Y-%m-%d')
+
+    first_page = client.get('/api/recordings?user_id=1&limit=10').get_json()
+    cursor = first_page['next_cursor']
+
+    urls = [
+        '/api/recordings?limit=20',
+        '/api/recordings?limit=20&user_id=1',
+        '/api/recordings?limit=20&is_uploaded=true',
+        f'/api/recordings?limit=10&user_id=1&cursor={cursor}',
+        '/api/recordings?limit=20&user_id=1&emotion=행복',
+        f'/api/recordings?limit=20&user_id=1&emotion=행복&start_date={start}&end_date={end}',
+        '/api/recordings?limit=20&user_id=1&district=성북동',
+        f'/api/recordings?limit=20&user_id=1&start_date={start}&end_date={end}',
+        '/api/users/1',
+        '/api/users',
+        '/api/emotions/stats?user_id=1',
+        f'/api/emotions/stats?user_id=1&bucket=day&start_date={start}&end_date={end}',
+        '/api/emotions/stats?user_id=1&district=성북동',
+        '/api/users/1/archive',
+        f'/api/users/1/archive?month={month}',
+        '/api/keywords?limit=10',
+        '/api/keywords/녹음/recordings?limit=20',
+        '/api/keywords/녹음/recordings?limit=20&user_id=1',
+        '/api/keywords/녹음/recordings?limit=20&is_uploaded=true',
+    ]
+
+    cases = []
+    for url in urls:
+        with StatementRecorder(db.engine) as recorder:
+            response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f'{url} 응답 오류: {response.status_code} {response.get_data(as_text=True)}')
+        cases.append((f'GET {url}', recorder.statements))
+
+    with StatementRecorder(db.engine) as recorder:
+        today_records_query(1).all()
+        today_records_query().all()
+    cases.append(('delete_today_records', recorder.statements))
+
+    return cases
+
+
+def explain(statement, parameters):
+    """EXPLAIN QUERY PLAN 결과의 detail 목록"""
+    conn = db.engine.raw_connection()
+    try:
+        rows = conn.cursor().execute(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+        return [row[-1] for row in rows]
+    finally:
+        conn.close()
+
+
+def is_recency_feed(statement, table_name, index_name):
+    """LIMIT이 있는 최신 피드 쿼리가 최신순 인덱스를 훑는 SCAN인지"""
+    return (table_name, index_name) in RECENCY_FEED_SCANS \
+        and RECENCY_FEED_ORDER.search(' '.join(statement.split())) is not None
+
+
+def problems_in(statement, plan):
+    """문제가 되는 실행 계획 항목"""
+    grouped = 'GROUP BY' in statement.upper()
+    problems = []
+    for detail in plan:
+        match = FULL_SCAN.match(detail)
+        if match and match.group(1) in CHECKED_TABLES:
+            if not is_recency_feed(statement, match.group(1), match.group(2)):
+                problems.append(detail)
+        elif TEMP_SORT.search(detail) and not grouped:
+            problems.append(detail)
+    return problems
+
+
+def main():
+    with app.app_context():
+        seed()
+        db.session.remove()
+        cases = collect_cases()
+
+    failed = False
+    print("\n[쿼리 실행 계획]")
+    print("-" * 70)
+    with app.app_context():
+        for name, statements in cases:
+            print(f"\n{name}")
+            for statement, parameters in statements:
+                plan = explain(statement, parameters)
+                problems = problems_in(statement, plan)
+                failed = failed or bool(problems)
+                summary = ' / '.join(plan)
+                print(f"  {'✗' if problems else '✓'} {summary}")
+                if problems:
+                    print(f"      문제: {', '.join(problems)}")
+                    print(f"      SQL: {' '.join(statement.split())[:200]}")
+    print("-" * 70)
+
+    if failed:
+        print("\n[결과] 인덱스로 범위를 좁히지 않는 쿼리가 있습니다.")
+        sys.exit(1)
+    print("\n[결과] 모든 쿼리가 인덱스로 범위를 좁혀 조회합니다.")
+
+
+if __name__ == '__main__':
+    main()
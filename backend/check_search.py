@@ -0,0 +1,358 @@
+"""
+녹음 검색 확인 스크립트 (정확도 + 응답 시간)
+임시 SQLite DB에 녹음을 채운 뒤 /api/recordings/search 결과를 전체 녹음을 직접 훑은 결과와 비교하고,
+검색어 종류별 첫 페이지 응답 시간을 잽니다.
+- 검색 결과 = 내용/키워드에 모든 단어가 포함된 녹음 (누락/중복 없음, 정렬 순서 유지)
+- 관련도순 범위(SEARCH_RANK_WINDOW)를 넘는 일치 항목이 있을 때만 모든 페이지의 truncated가 true
+- 녹음 추가/수정/삭제가 색인에 바로 반영되는지 (trigram은 트리거, 조각 색인은 앱 코드)
+- 앱을 거치지 않은 연결(sqlite3)로 녹음을 추가/수정/삭제해도 오류가 없고, 검색 결과가 틀리지 않는지
+  (추가된 녹음은 다음 ensure_search_index 때 조각 색인), 이전 버전 조각 색인(search_grams 트리거) 교체
+- 필터 없는 검색의 첫 페이지 중앙값이 --max-ms 이하인지 (3글자 이상은 trigram, 1~2글자는 조각 색인)
+  (사용자/업로드 필터를 함께 쓰는 경우는 필터 조건을 색인 밖에서 확인하므로 참고용으로만 출력)
+
+사용법:
+    python check_search.py
+    python check_search.py --rows 300000 --max-ms 10
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+# app을 불러오기 전에 임시 DB와 워커 설정
+_temp_dir = tempfile.mkdtemp(prefix='revo-search-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_temp_dir, 'revo.db')
+os.environ['JOB_WORKERS'] = '0'
+os.environ['CACHE_DB_PATH'] = os.path.join(_temp_dir, 'cache.db')
+
+from datetime import datetime, timedelta  # noqa: E402
+
+from sqlalchemy import insert, text  # noqa: E402
+
+import search  # noqa: E402
+from app import app  # noqa: E402
+from models import db, User, Recording, EmotionType  # noqa: E402
+from search import (GRAMS_TABLE, RANK_WINDOW, ensure_search_index, index_missing_grams,  # noqa: E402
+                    index_recording)
+
+NUM_USERS = 100
+PAGE_SIZE = 20
+
+# 녹음 내용을 만들 단어 (뒤쪽 단어일수록 드물게 나옴 - 순위에 반비례하는 빈도)
+WORDS = [
+    '오늘', '친구', '회사', '학교', '카페', '커피', '산책', '고양이', '강아지', '비', '눈', '바람', '하늘',
+    '음악', '노래', '영화', '책', '저녁', '아침', '점심', '버스', '지하철', '공원', '바다', '여행',
+    '엄마', '아빠', '동생', '선생님', '시험', '발표', '회의', '야근', '퇴근', '주말', '생일', '선물',
+    '케이크', '떡볶이', '라면', '김치찌개', '비빔밥', '치킨', '맥주', '한강', '자전거', '운동', '헬스장',
+    '도서관', '편의점', '택시', '우산', '벚꽃', '단풍', '눈사람', '불꽃놀이', '콘서트', '전시회',
+    '미술관', '박물관', '놀이공원', '캠핑', '등산', '수영장', '노을', '무지개', '별자리', '보름달',
+]
+WEIGHTS = [1 / rank for rank in range(1, len(WORDS) + 1)]
+JOSA = ['', '이', '가', '을', '를', '은', '는', '에서', '에', '랑', '과', '와', '도', '의', '으로']
+ENDINGS = ['좋았다', '행복했다', '힘들었다', '신났다', '슬펐다', '놀랐다', '그냥 그랬다', '화가 났다']
+DISTRICTS = ['성북동', '강남구', '종로구', '마포구', None]
+
+
+def make_content(rng):
+    """단어 + 조사로 녹음 내용/키워드 만들기"""
+    words = rng.choices(WORDS, weights=WEIGHTS, k=rng.randint(4, 10))
+    content = ' '.join(word + rng.choice(JOSA) for word in words) + ' ' + rng.choice(ENDINGS)
+    keywords = ','.join(dict.fromkeys(words[:3]))
+    return content, keywords
+
+
+def seed(rows):
+    """
+    녹음 채우기 (trigram 색인은 트리거, 조각 색인은 채운 뒤 한 번에 생성)
+
+    Returns:
+        dict: recording_id -> (user_id, 내용, 키워드, 업로드 여부)
+    """
+    rng = random.Random(42)
+    emotions = list(EmotionType)
+    users = [User(name=f'사용자{i}') for i in range(NUM_USERS)]
+    db.session.add_all(users)
+    db.session.flush()
+    user_ids = [u.id for u in users]
+
+    base = datetime(2024, 1, 1)
+    batch = []
+    started = time.perf_counter()
+    for i in range(rows):
+        content, keywords = make_content(rng)
+        batch.append({
+            'user_id': user_ids[i % NUM_USERS],
+            'content': content,
+            'keywords': keywords,
+            'audio_file': f'search_{i}.webm',
+            'recorded_at': base + timedelta(minutes=i * 7 // 3),  # 일부는 같은 시각 (정렬 동률)
+            'emotion': emotions[i % len(emotions)],
+            'district': DISTRICTS[i % len(DISTRICTS)],
+            'likes': 0,
+            'is_uploaded': i % 4 == 0,
+            'status': 'done',
+            'created_at': base,
+            'updated_at': base,
+        })
+        if len(batch) == 10000:
+            db.session.execute(insert(Recording), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(Recording), batch)
+    db.session.commit()
+    with db.engine.begin() as conn:
+        index_missing_grams(conn)
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    print(f"[검색 확인] 녹음 {rows}개 생성 ({time.perf_counter() - started:.1f}초)")
+
+    return {
+        r.id: (r.user_id, r.content, r.keywords, r.is_uploaded)
+        for r in db.session.execute(db.select(
+            Recording.id, Recording.user_id, Recording.content, Recording.keywords, Recording.is_uploaded
+        ))
+    }
+
+
+def expected_ids(data, q, user_id=None, is_uploaded=None):
+    """전체 녹음을 직접 훑어 모든 단어를 포함하는 녹음 ID"""
+    terms = q.lower().split()
+    result = set()
+    for rid, (uid, content, keywords, uploaded) in data.items():
+        if user_id and uid != user_id:
+            continue
+        if is_uploaded is not None and uploaded != is_uploaded:
+            continue
+        haystacks = (content.lower(), (keywords or '').lower())
+        if all(any(term in h for h in haystacks) for term in terms):
+            result.add(rid)
+    return result
+
+
+def search_url(q, **params):
+    return '/api/recordings/search?' + urlencode({'q': q, **params})
+
+
+def fetch_all(client, url, truncated=None):
+    """
+    커서를 따라 모든 페이지 조회 -> (녹음 목록, 정렬)
+    truncated 목록을 주면 페이지마다 응답의 truncated를 담음
+    """
+    items, cursor, sort = [], None, None
+    for _ in range(10000):
+        page = client.get(url + (f'&cursor={cursor}' if cursor else '')).get_json()
+        items += page['recordings']
+        sort = page['sort']
+        if truncated is not None:
+            truncated.append(page['truncated'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    return items, sort
+
+
+def main():
+    parser = argparse.ArgumentParser(description='녹음 검색 확인')
+    parser.add_argument('--rows', type=int, default=200000, help='생성할 녹음 수')
+    parser.add_argument('--repeat', type=int, default=20, help='검색어마다 반복 횟수 (응답 시간)')
+    parser.add_argument('--max-ms', type=float, default=10.0,
+                        help='필터 없는 검색 첫 페이지 응답 시간 중앙값 상한 (ms, 0이면 확인 안 함)')
+    args = parser.parse_args()
+
+    client = app.test_client()
+    failed = False
+
+    def check(name, ok, detail=''):
+        nonlocal failed
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} {name}" + (f" - {detail}" if detail and not ok else ''))
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        with db.engine.begin() as conn:
+            ensure_search_index(conn)  # drop_all로 트리거가 지워졌으므로 다시 생성
+        data = seed(args.rows)
+        db.session.remove()
+
+        # 1. 결과 비교 (사용자 한 명 범위에서 모든 페이지)
+        print("\n[정확도]")
+        print("-" * 70)
+        user_id = 7
+        for q in ['고양이', '고양이를', '카페 커피', '비', '산책 비', '비 지하철', '김치찌개', '불꽃놀이 노을',
+                  '무지개다리', '100%', '친구', '노을', '회사 눈', '다리']:
+            expected = expected_ids(data, q, user_id)
+            for sort in ('relevance', 'recent'):
+                truncated = []
+                items, used = fetch_all(client, search_url(q, sort=sort, user_id=user_id, limit=50), truncated)
+                ids = [r['id'] for r in items]
+                ok = set(ids) == expected and len(ids) == len(set(ids)) and not any(truncated)
+                if used == 'recent':
+                    keys = [(r['recorded_at'], r['id']) for r in items]
+                    ok = ok and keys == sorted(keys, reverse=True)
+                check(f"'{q}' ({sort} -> {used}): {len(ids)}건", ok,
+                      f'기대 {len(expected)}, 누락 {len(expected - set(ids))}, 추가 {len(set(ids) - expected)}')
+
+        # 흔한 단어의 관련도순은 가장 최근 RANK_WINDOW개 일치 항목 안에서
+        # (범위 밖 일치 항목이 있으면 모든 페이지의 truncated가 true, 최신순은 false)
+        expected = expected_ids(data, '고양이')
+        truncated = []
+        items, _ = fetch_all(client, search_url('고양이', limit=100), truncated)
+        ids = [r['id'] for r in items]
+        newest = set(sorted(expected, reverse=True)[:RANK_WINDOW])
+        check(f"관련도순 범위 (일치 {len(expected)}건 중 최근 {RANK_WINDOW}건): {len(ids)}건, truncated {set(truncated)}",
+              set(ids) == newest and len(ids) == len(set(ids))
+              and (all(truncated) if len(expected) > RANK_WINDOW else not any(truncated)))
+        recent = client.get(search_url('고양이', sort='recent')).get_json()
+        check("최신순은 truncated 없음", recent['truncated'] is False)
+
+        # 범위 경계: 일치 항목이 범위와 같으면 빠진 항목 없음, 하나 많으면 truncated
+        expected = expected_ids(data, '불꽃놀이')
+        for window, should_truncate in ((len(expected), False), (len(expected) - 1, True)):
+            search.RANK_WINDOW = window
+            truncated = []
+            items, _ = fetch_all(client, search_url('불꽃놀이', limit=7), truncated)
+            check(f"일치 {len(expected)}건, 범위 {window}건 -> {len(items)}건, truncated {set(truncated)}",
+                  len(items) == min(window, len(expected)) and set(truncated) == {should_truncate})
+        search.RANK_WINDOW = RANK_WINDOW
+
+        expected = expected_ids(data, '바다 여행', is_uploaded=True)
+        items, _ = fetch_all(client, search_url('바다 여행', is_uploaded='true', limit=100))
+        check(f"업로드 필터: {len(items)}건", {r['id'] for r in items} == expected)
+
+        # 2. 색인 동기화
+        print("\n[색인 동기화]")
+        print("-" * 70)
+
+        def found(q):
+            return {r['id'] for r in client.get(search_url(q, limit=100)).get_json()['recordings']}
+
+        recording = Recording(user_id=1, content='오늘 무지개다리를 건넜다', keywords='무지개다리',
+                              audio_file='sync.webm', emotion=EmotionType.JOY)
+        db.session.add(recording)
+        index_recording(recording)
+        db.session.commit()
+        new_id = recording.id
+        check('추가한 녹음 검색', found('무지개다리') == {new_id} and new_id in found('개다'))
+        recording.content = '오늘 징검다리를 건넜다'
+        recording.keywords = '징검다리'
+        index_recording(recording)
+        db.session.commit()
+        check('수정한 내용으로 검색', found('징검다리') == {new_id} and new_id in found('징검')
+              and not found('무지개다리') and new_id not in found('개다'))
+        client.delete(f'/api/recordings/{new_id}')
+        check('삭제한 녹음 제외', not found('징검다리') and not found('징검'))
+        db.session.remove()
+
+        # 앱을 거치지 않은 연결 (SQL 함수 등록 없음)
+        raw = sqlite3.connect(db.engine.url.database)
+        try:
+            raw_id = raw.execute(
+                "INSERT INTO recordings (user_id, content, keywords, audio_file, recorded_at, emotion, likes, "
+                "is_uploaded, status, created_at, updated_at) VALUES (1, '오늘 구름다리를 건넜다', '구름다리', "
+                "'raw.webm', :at, 'JOY', 0, 0, 'done', :at, :at)", {'at': '2030-01-01 00:00:00.000000'}
+            ).lastrowid
+            raw.commit()
+            check('sqlite3 연결로 녹음 추가', found('구름다리') == {raw_id})
+            with db.engine.begin() as conn:
+                ensure_search_index(conn)
+            check('다음 ensure_search_index 때 짧은 검색어 색인', raw_id in found('구름'))
+            raw.execute("UPDATE recordings SET content = '오늘 돌다리를 건넜다', keywords = '돌다리' WHERE id = ?",
+                        (raw_id,))
+            raw.commit()
+            check('sqlite3 연결로 수정 - 이전 내용의 짧은 검색어로 나오지 않음',
+                  found('돌다리') == {raw_id} and raw_id not in found('구름'))
+            raw.execute('DELETE FROM recordings WHERE id = ?', (raw_id,))
+            raw.commit()
+            check('sqlite3 연결로 삭제', not found('돌다리') and raw_id not in found('다리'))
+        except sqlite3.Error as e:
+            check('sqlite3 연결로 녹음 추가/수정/삭제', False, str(e))
+        finally:
+            raw.close()
+
+        # 이전 버전 조각 색인 (내용 없는 테이블 + search_grams 트리거) -> 새 형식으로 교체
+        with db.engine.begin() as conn:
+            conn.execute(text(f'DROP TABLE {GRAMS_TABLE}'))
+            conn.execute(text(f"CREATE VIRTUAL TABLE {GRAMS_TABLE} USING fts5(content, keywords, content='')"))
+            conn.execute(text(f"CREATE TRIGGER recordings_grams_ai AFTER INSERT ON recordings BEGIN "
+                              f"INSERT INTO {GRAMS_TABLE}(rowid, content, keywords) "
+                              f"VALUES (new.id, search_grams(new.content), search_grams(new.keywords)); END"))
+        with db.engine.begin() as conn:
+            ensure_search_index(conn)
+            triggers = conn.execute(text(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'recordings_grams%'"
+            )).scalar()
+        raw = sqlite3.connect(db.engine.url.database)
+        try:
+            raw.execute("DELETE FROM recordings WHERE id = (SELECT max(id) FROM recordings)")
+            raw.rollback()
+            legacy_ok = True
+        except sqlite3.Error:
+            legacy_ok = False
+        finally:
+            raw.close()
+        expected = expected_ids(data, '회사 눈')
+        check('이전 버전 조각 색인 교체 (트리거 제거, 다시 색인)',
+              legacy_ok and triggers == 0 and {r['id'] for r in fetch_all(client, search_url('회사 눈'))[0]} == expected)
+        db.session.remove()
+
+        # 3. 잘못된 요청
+        check('검색어 없음 400', client.get('/api/recordings/search').status_code == 400)
+        check('잘못된 정렬 400', client.get(search_url('카페', sort='oldest')).status_code == 400)
+        check('잘못된 커서 400', client.get(search_url('고양이', cursor='abc')).status_code == 400)
+        check('FTS 특수문자 그대로 검색', client.get(search_url('"OR" NEAR(*')).status_code == 200)
+
+        # 4. 응답 시간 (전체 녹음 대상 첫 페이지)
+        print(f"\n[응답 시간] 녹음 {args.rows}개, 첫 페이지 {PAGE_SIZE}개, {args.repeat}회 중앙값/최대")
+        print("-" * 70)
+        cases = [
+            ('흔한 단어', '고양이', {}),
+            ('조사 포함', '고양이를', {}),
+            ('드문 단어', '불꽃놀이', {}),
+            ('두 단어', '카페 커피', {}),
+            ('드문 두 단어', '별자리 보름달', {}),
+            ('2글자 단어', '친구', {}),
+            ('드문 2글자 단어', '노을', {}),
+            ('2글자 두 단어', '회사 눈', {}),
+            ('1글자 단어', '비', {}),
+            ('1글자 + 3글자', '비 지하철', {}),
+            ('없는 단어', '우주정거장', {}),
+            ('없는 2글자 단어', '우주', {}),
+            ('사용자 필터', '고양이', {'user_id': user_id}),
+            ('업로드 필터', '고양이', {'is_uploaded': 'true'}),
+        ]
+        for label, q, params in cases:
+            # 필터 없는 검색만 기준 적용 (필터 조합은 참고)
+            gated = not params
+            for sort in ('relevance', 'recent'):
+                url = search_url(q, sort=sort, limit=PAGE_SIZE, **params)
+                client.get(url)  # 준비 실행
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    assert response.status_code == 200, response.get_data(as_text=True)
+                timings.sort()
+                median = timings[len(timings) // 2]
+                slow = bool(args.max_ms) and gated and median > args.max_ms
+                failed = failed or slow
+                print(f"  {'✗' if slow else '✓'} {label:18} '{q}' {sort:9} "
+                      f"{median:6.2f}ms / {timings[-1]:6.2f}ms" + ('' if gated else ' (참고)'))
+
+        db.session.remove()
+        db.engine.dispose()
+
+    print("-" * 70)
+    if failed:
+        print("\n[결과] 검색 결과 또는 응답 시간이 기준에 맞지 않습니다.")
+        sys.exit(1)
+    print("\n[결과] 검색 결과가 정확하고 응답 시간이 기준 이내입니다.")
+
+
+if __name__ == '__main__':
+    main()
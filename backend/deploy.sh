@@ -139,12 +139,16 @@ if [ -f migrate_duration.py ]; then
     
     # 호스트에서 실행 (Python 환경이 있는 경우)
     if command -v python3 &> /dev/null; then
-        # pydub가 설치되어 있는지 확인
-        if python3 -c "import pydub" 2>/dev/null; then
+        # 마이그레이션 스크립트가 쓰는 백엔드 모듈(SQLAlchemy 등)을 불러올 수 있는지 확인
+        # (duration은 헤더 파싱으로 계산 - 추가 패키지 불필요, ffprobe는 헤더를 못 읽은 파일에만 사용)
+        if python3 -c "import migrate_duration" 2>/dev/null; then
+            if ! command -v ffprobe &> /dev/null; then
+                echo "   ℹ️  호스트에 ffprobe가 없음 - 헤더를 읽지 못한 파일은 duration 없이 남습니다"
+            fi
             echo "   📝 호스트에서 마이그레이션 실행 중..."
             python3 migrate_duration.py || echo "   ⚠️  마이그레이션 실행 실패 (수동 실행 필요)"
         else
-            echo "   ⚠️  호스트에 pydub가 설치되지 않음"
+            echo "   ⚠️  호스트에 백엔드 의존성(requirements.txt)이 설치되지 않음"
             echo "   💡 컨테이너가 완전히 시작된 후 수동 실행:"
             echo "      docker-compose exec backend python migrate_duration.py"
         fi
@@ -0,0 +1,116 @@
+"""
+로컬 감정 분류 (감정 사전 + 점수, CPU만 사용)
+- 녹음 문장에서 감정 단서(어간)를 찾아 감정별 점수를 더함
+  (앞에 '너무/정말' 등이 있으면 가중치 1.5배, '안 좋았다/좋지 않았다'처럼 부정되면 무시)
+- 신뢰도 = 가장 높은 감정 점수 / (전체 점수 + 1) - 단서가 많고 한 감정에 몰릴수록 1에 가까움
+- 신뢰도가 LOCAL_EMOTION_MIN_CONFIDENCE 이상이면 GPT를 호출하지 않고 이 결과 사용 (services.py)
+- 단서 사전은 불러올 때 정규식 하나로 컴파일 (문장 하나 분류에 수십 µs)
+
+사용 예:
+    prediction = classify_emotion('친구랑 떡볶이 먹어서 너무 행복했다')
+    prediction.emotion, prediction.confidence   # EmotionType.JOY, 0.75
+"""
+import os
+import re
+from collections import namedtuple
+
+from models import EmotionType
+
+LOCAL_EMOTION_ENABLED = os.getenv('LOCAL_EMOTION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# 이 신뢰도 이상이면 GPT 호출 생략 (1.0보다 크게 설정하면 항상 GPT 사용)
+LOCAL_EMOTION_MIN_CONFIDENCE = float(os.getenv('LOCAL_EMOTION_MIN_CONFIDENCE', '0.7'))
+
+# 감정별 단서 (어간 -> 가중치) - 문장에 부분 문자열로 나오면 일치
+# 활용하면 글자가 바뀌는 어간은 따로 등록 (설레다 -> 설렌다/설렜다, 신나다 -> 신난다)
+# 다른 단어 안에 흔히 나오는 두 글자는 띄어쓰기까지 포함 ('운동화가'의 '화가' 대신 '화가 나')
+LEXICON = {
+    EmotionType.JOY: {
+        '행복': 2, '기쁘': 2, '기뻤': 2, '기뻐': 2, '기쁨': 2, '즐거': 2, '즐겁': 2, '뿌듯': 2, '만족': 1.5,
+        '감사': 1.5,
+        '고마': 1.5, '맛있': 1.5, '좋았': 1.5, '좋아': 1, '좋은': 1, '좋다': 1, '웃었': 1.5, '웃음': 1,
+        '귀여': 1, '따뜻': 1, '편안': 1.5, '다행': 1.5, '사랑': 1, '흐뭇': 2, '힐링': 1.5,
+    },
+    EmotionType.ANGER: {
+        '화나': 2, '화가 나': 2, '화가 났': 2, '화났': 2, '화난': 2, '짜증': 2, '분노': 2, '열받': 2,
+        '어이없': 2, '빡치': 2, '억울': 2,
+        '싸웠': 1.5, '따졌': 1.5, '불친절': 1.5, '새치기': 1.5, '무시': 1, '답답': 1, '황당': 1.5, '괘씸': 2,
+    },
+    EmotionType.SADNESS: {
+        '슬프': 2, '슬펐': 2, '슬퍼': 2, '슬픔': 2, '우울': 2, '힘들': 1.5, '힘든': 1.5, '외롭': 2, '외로': 2, '그립': 2,
+        '그리워': 2, '그리운': 2, '그리움': 2, '아쉽': 1.5, '아쉬웠': 1.5, '눈물': 2, '울었': 2, '서운': 2, '속상': 2,
+        '쓸쓸': 2, '허전': 1.5, '보고 싶': 1.5, '이별': 1.5, '헤어졌': 2, '떨어졌': 1, '지쳤': 1.5, '지친': 1.5,
+    },
+    EmotionType.SURPRISE: {
+        '놀랐': 2, '놀라': 2, '놀란': 2, '놀랍': 2, '놀람': 2, '깜짝': 2, '신기': 2, '믿기지': 2, '뜻밖': 2, '갑자기': 1,
+        '설마': 1.5, '어떻게 이런': 1.5, '예상 못': 2, '예상치 못': 2, '처음 봤': 1,
+    },
+    EmotionType.EXCITEMENT: {
+        '신나': 2, '신난': 2, '신났': 2, '신남': 2, '설레': 2, '설렌': 2, '설렜': 2, '설렘': 2, '두근': 2,
+        '기대돼': 2, '기대된': 2, '기대가': 1.5,
+        '들뜬': 2, '들떠': 2, '짜릿': 2, '최고': 1, '드디어': 1, '흥분': 1.5, '빨리 가고': 1.5,
+    },
+    EmotionType.CONFUSION: {
+        '그냥': 0.5, '평범': 1.5, '별일 없': 1.5, '무난': 1.5, '그저 그': 2, '그럭저럭': 2, '평소처럼': 1.5,
+        '특별한 건 없': 2, '특별한 일 없': 2, '늘 그렇듯': 1.5, '똑같': 1, '무덤덤': 2,
+    },
+}
+
+# 단서 앞에 오면 가중치를 키우는 말 / 단서 뒤에 오면 부정하는 말
+INTENSIFIERS = ('너무', '정말', '진짜', '완전', '엄청', '매우', '무척', '많이', '아주')
+INTENSITY = 1.5
+NEGATION_BEFORE = ('안 ', '못 ')
+NEGATION_AFTER = re.compile(r'^[가-힣]{0,2}(?:지 ?않|지 ?못|지는 ?않|진 ?않)')
+CONTEXT_CHARS = 6  # 강조어를 찾을 단서 앞 글자 수
+
+Prediction = namedtuple('Prediction', 'emotion confidence scores')
+
+_CUES = {cue: (emotion, weight) for emotion, cues in LEXICON.items() for cue, weight in cues.items()}
+# 긴 단서부터 (예: '화가 났'과 '화가 나'가 겹치지 않도록 한 위치에서 가장 긴 단서 하나만)
+_CUE_PATTERN = re.compile('|'.join(re.escape(cue) for cue in sorted(_CUES, key=len, reverse=True)))
+
+
+def _negated(text, start, end):
+    """단서가 부정되었는지 ('안 좋았다', '좋지 않았다', '즐겁지 못했다')"""
+    if text[max(0, start - 2):start] in NEGATION_BEFORE:
+        return True
+    return NEGATION_AFTER.match(text, end) is not None
+
+
+def classify_emotion(text):
+    """
+    문장 -> 감정 예측
+
+    Returns:
+        Prediction: (EmotionType, 신뢰도 0~1, 감정별 점수 dict)
+                    단서가 없으면 보통(CONFUSION), 신뢰도 0
+    """
+    text = text or ''
+    scores = {}
+    for match in _CUE_PATTERN.finditer(text):
+        start, end = match.span()
+        if _negated(text, start, end):
+            continue
+        emotion, weight = _CUES[match.group()]
+        before = text[max(0, start - CONTEXT_CHARS):start]
+        if any(word in before for word in INTENSIFIERS):
+            weight *= INTENSITY
+        scores[emotion] = scores.get(emotion, 0) + weight
+
+    if not scores:
+        return Prediction(EmotionType.CONFUSION, 0.0, scores)
+    emotion = max(scores, key=scores.get)
+    confidence = scores[emotion] / (sum(scores.values()) + 1)
+    return Prediction(emotion, round(confidence, 3), scores)
+
+
+def confident_emotion(text):
+    """
+    GPT를 생략할 만큼 신뢰도가 높은 감정 (아니면 None)
+    LOCAL_EMOTION_ENABLED=false면 항상 None
+    """
+    if not LOCAL_EMOTION_ENABLED:
+        return None
+    prediction = classify_emotion(text)
+    if prediction.scores and prediction.confidence >= LOCAL_EMOTION_MIN_CONFIDENCE:
+        return prediction
+    return None
@@ -0,0 +1,221 @@
+"""
+오프라인 확인용 가짜 OpenAI 호환 서버 (Chat Completions만)
+services.py의 한 건/배치 분석 프롬프트에서 텍스트를 꺼내 로컬 감정 분류 + 로컬 키워드 추출 결과를
+GPT 답변 형식(JSON)으로 돌려줍니다. 같은 텍스트에는 항상 같은 답을 하므로 한 건 분석과 배치 분석 결과를 비교할 수 있습니다.
+API 키 없이 네트워크 없이 check_gpt_batch.py, check_gpt_client.py에서 사용합니다.
+
+사용법:
+    python fake_openai_server.py --port 8765
+    python fake_openai_server.py --latency 2 --error-rate 0.3 --error-status 429
+    (웹 서버에는 OPENAI_BASE_URL=http://127.0.0.1:8765/v1, OPENAI_API_KEY=sk-로 시작하는 40자 이상 아무 값)
+
+장애 흉내 (확인 스크립트에서 설정):
+    latency        - 모든 응답 전 대기 시간 (초)
+    fail_next()    - 다음 요청 몇 개를 지정한 상태 코드로 실패 (Retry-After 헤더 선택)
+    error_rate     - 이 비율의 요청을 error_status로 실패 (무작위)
+    fault          - 'invalid_json': JSON이 아닌 답변
+                     'drop_item': 배치 답변에서 1번 항목 빠뜨림
+                     'bad_item': 배치 답변의 1번 항목 감정을 빈 값으로
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from emotion_classifier import classify_emotion
+from services import extract_keywords_simple
+
+_SINGLE_TEXT = re.compile(r'^다음 텍스트를 분석해주세요:\n\n"(.*?)"\n\n1\. 감정 분석', re.DOTALL)
+_BATCH_TEXT = re.compile(r'^\[(\d+)\] (".*")$', re.MULTILINE)
+
+
+def fake_answer(text):
+    """텍스트 하나에 대한 가짜 GPT 답변"""
+    return {'emotion': classify_emotion(text).emotion.value, 'keywords': extract_keywords_simple(text)}
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 시간 초과로 먼저 연결을 끊은 경우는 정상 (지연 흉내)
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FakeOpenAIServer:
+    """백그라운드 스레드에서 도는 가짜 서버 (요청 수, 동시 요청 수, 받은 텍스트 수, 프롬프트 글자 수 기록)"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, error_status=500, seed=None):
+        handler = type('Handler', (FakeOpenAIHandler,), {'state': self})
+        self.httpd = _QuietHTTPServer((host, port), handler)
+        self.fault = None
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._failures = []  # fail_next()로 예약한 (상태 코드, Retry-After)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.reset()
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.texts = 0
+            self.prompt_chars = 0
+            self.errors = 0
+            self.active = 0
+            self.max_active = 0
+            self._failures = []
+
+    def fail_next(self, status, count=1, retry_after=None):
+        """다음 요청 count개를 status로 실패시킴"""
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * count)
+
+    def begin(self):
+        """요청 시작 -> 실패시킬 경우 (상태 코드, Retry-After), 아니면 None"""
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            if self._failures:
+                failure = self._failures.pop(0)
+            elif self.error_rate and self._random.random() < self.error_rate:
+                failure = (self.error_status, None)
+            else:
+                return None
+            self.errors += 1
+            return failure
+
+    def end(self):
+        with self._lock:
+            self.active -= 1
+
+    def record(self, prompt, texts):
+        with self._lock:
+            self.texts += texts
+            self.prompt_chars += len(prompt)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-openai', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    state = None  # FakeOpenAIServer (서버 생성 시 설정)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': '존재하지 않는 경로입니다.', 'type': 'invalid_request_error'}})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(length) or b'{}')
+            prompt = data['messages'][-1]['content']
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._send_json(400, {'error': {'message': '요청 형식이 올바르지 않습니다.', 'type': 'invalid_request_error'}})
+            return
+
+        failure = self.state.begin()
+        try:
+            if self.state.latency:
+                time.sleep(self.state.latency)
+            if failure is not None:
+                self._send_failure(*failure)
+                return
+            batch = _BATCH_TEXT.findall(prompt)
+            self.state.record(prompt, len(batch) or 1)
+            content = self._answer(prompt, batch)
+        finally:
+            self.state.end()
+        self._send_json(200, {
+            'id': f'chatcmpl-fake-{self.state.requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': data.get('model', 'fake'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            # 토큰 대신 글자 수 (비교용)
+            'usage': {'prompt_tokens': len(prompt), 'completion_tokens': len(content),
+                      'total_tokens': len(prompt) + len(content)}
+        })
+
+    def _send_failure(self, status, retry_after):
+        error_type = 'rate_limit_error' if status == 429 else 'server_error'
+        headers = {'Retry-After': str(retry_after)} if retry_after is not None else None
+        self._send_json(status, {'error': {'message': f'가짜 서버 오류 ({status})', 'type': error_type}}, headers)
+
+    def _answer(self, prompt, batch):
+        fault = self.state.fault
+        if fault == 'invalid_json':
+            return '분석 결과를 JSON으로 만들 수 없습니다.'
+
+        if batch:
+            items = [{'index': int(index), **fake_answer(json.loads(text))} for index, text in batch]
+            if fault == 'drop_item':
+                items = [item for item in items if item['index'] != 1]
+            elif fault == 'bad_item':
+                for item in items:
+                    if item['index'] == 1:
+                        item['emotion'] = ''
+            return '```json\n' + json.dumps({'results': items}, ensure_ascii=False) + '\n```'
+
+        match = _SINGLE_TEXT.match(prompt)
+        return json.dumps(fake_answer(match.group(1) if match else ''), ensure_ascii=False)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가짜 OpenAI 호환 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 전 대기 시간 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='실패시킬 요청 비율 (0~1)')
+    parser.add_argument('--error-status', type=int, default=500, help='실패 응답 상태 코드 (예: 429, 503)')
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.host, args.port, latency=args.latency,
+                              error_rate=args.error_rate, error_status=args.error_status)
+    print(f"가짜 OpenAI 서버 시작: {server.url} (OPENAI_BASE_URL로 설정)")
+    print(f"지연: {args.latency}초, 오류 비율: {args.error_rate:.0%} ({args.error_status})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("가짜 OpenAI 서버 종료")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
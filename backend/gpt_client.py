@@ -0,0 +1,198 @@
+"""
+ChatGPT 비동기 호출 클라이언트
+- 프로세스마다 백그라운드 이벤트 루프 스레드 하나에서 AsyncOpenAI로 호출
+- 동시 호출 수 제한 (GPT_MAX_CONCURRENCY, 세마포어) - 넘는 호출은 자리가 날 때까지 대기
+- 호출마다 마감 시간 (GPT_DEADLINE) - 대기 + 모든 시도 + 백오프를 포함, 넘으면 GPTDeadlineExceeded
+  (시도 하나는 GPT_ATTEMPT_TIMEOUT까지)
+- 429/5xx/연결 오류/시도 시간 초과는 지터를 준 지수 백오프 후 재시도 (GPT_MAX_RETRIES회)
+  Retry-After 헤더가 있으면 그 시간 이상 기다리고, 마감 전에 다시 시도할 수 없으면 바로 실패
+- 기존 동기 코드(Flask 요청, 작업 큐 워커 스레드)는 complete()/complete_many()로 호출
+
+사용 예:
+    client = GPTClient(api_key)
+    text = client.complete([{"role": "user", "content": "..."}], max_tokens=200)
+"""
+import asyncio
+import os
+import random
+import threading
+
+import openai
+
+GPT_MODEL = os.getenv('GPT_MODEL', 'gpt-3.5-turbo')
+GPT_MAX_CONCURRENCY = int(os.getenv('GPT_MAX_CONCURRENCY', '8'))  # 프로세스당 동시 호출 수
+GPT_DEADLINE = float(os.getenv('GPT_DEADLINE', '20'))  # 호출 하나의 마감 시간 (초, 대기/재시도 포함)
+GPT_ATTEMPT_TIMEOUT = float(os.getenv('GPT_ATTEMPT_TIMEOUT', '10'))  # 시도 하나의 응답 대기 시간 (초)
+GPT_MAX_RETRIES = int(os.getenv('GPT_MAX_RETRIES', '3'))  # 재시도 횟수 (첫 시도 제외)
+GPT_BACKOFF_BASE = float(os.getenv('GPT_BACKOFF_BASE', '0.5'))  # 첫 재시도 최대 대기 (초, 시도마다 2배)
+GPT_BACKOFF_MAX = float(os.getenv('GPT_BACKOFF_MAX', '8'))  # 재시도 대기 상한 (초)
+
+
+class GPTDeadlineExceeded(TimeoutError):
+    """마감 시간 안에 ChatGPT 응답을 받지 못함"""
+
+
+def is_retryable(error):
+    """다시 시도할 만한 오류인지 (429, 5xx, 연결 오류/시도 시간 초과)"""
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def _retry_after(error):
+    """오류 응답의 Retry-After (초, 없거나 날짜 형식이면 None)"""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class GPTClient:
+    """백그라운드 이벤트 루프에서 도는 ChatGPT 호출기 (동시 호출 수/마감 시간/재시도 관리)"""
+
+    def __init__(self, api_key, base_url=None, model=GPT_MODEL, max_concurrency=GPT_MAX_CONCURRENCY,
+                 deadline=GPT_DEADLINE, attempt_timeout=GPT_ATTEMPT_TIMEOUT, max_retries=GPT_MAX_RETRIES,
+                 backoff_base=GPT_BACKOFF_BASE, backoff_max=GPT_BACKOFF_MAX):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # 재시도는 여기서 직접 하므로 SDK 자체 재시도는 끔 (base_url이 None이면 OPENAI_BASE_URL 또는 기본 주소)
+        self._client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url,
+                                          timeout=attempt_timeout, max_retries=0)
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.deadline_exceeded = 0
+        self._thread = threading.Thread(target=self._loop.run_forever, name='gpt-client', daemon=True)
+        self._thread.start()
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def backoff(self, attempt, error=None):
+        """attempt번째 재시도 전 대기 시간 (0 ~ base * 2^attempt 중 무작위, Retry-After 이상)"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        retry_after = _retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    async def acomplete(self, messages, max_tokens, temperature=0.3, timing=None):
+        """
+        채팅 응답 텍스트 (이벤트 루프 안에서 호출)
+        timing에 dict를 주면 자리를 얻은 뒤 응답(또는 실패)까지 걸린 시간을 'latency'에 기록
+        Raises:
+            GPTDeadlineExceeded: 마감 시간 초과
+            openai.APIError: 재시도할 수 없는 오류이거나 재시도를 모두 실패
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        self._count('waiting')
+        admitted = False
+        try:
+            async with asyncio.timeout_at(deadline) as timeout:
+                async with self._semaphore:
+                    self._count('waiting', -1)
+                    self._count('active')
+                    admitted = True
+                    started = loop.time()
+                    try:
+                        content = await self._attempts(messages, max_tokens, temperature, deadline)
+                    finally:
+                        self._count('active', -1)
+                        if timing is not None:
+                            timing['latency'] = loop.time() - started
+            self._count('completed')
+            return content
+        except TimeoutError:
+            self._count('failed')
+            if not timeout.expired():
+                raise
+            self._count('deadline_exceeded')
+            raise GPTDeadlineExceeded(f'ChatGPT 응답을 {self.deadline:g}초 안에 받지 못했습니다.') from None
+        except BaseException:
+            self._count('failed')
+            raise
+        finally:
+            if not admitted:
+                self._count('waiting', -1)
+
+    async def _attempts(self, messages, max_tokens, temperature, deadline):
+        """첫 시도 + 재시도 (재시도할 수 없는 오류나 마지막 오류는 그대로 발생)"""
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                return response.choices[0].message.content
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt, e)
+                if loop.time() + delay >= deadline:
+                    raise  # 마감 전에 다시 시도할 수 없음
+                self._count('retries')
+                print(f"[GPT 호출] {type(e).__name__} - {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+
+    def complete(self, messages, max_tokens, temperature=0.3):
+        """acomplete의 동기 버전 (다른 스레드에서 호출, 결과가 나올 때까지 대기)"""
+        future = asyncio.run_coroutine_threadsafe(self.acomplete(messages, max_tokens, temperature), self._loop)
+        return future.result()
+
+    def complete_many(self, requests, timed=False):
+        """
+        여러 호출을 동시에 실행 (동시 호출 수 제한 안에서)
+
+        Args:
+            requests: [{'messages': [...], 'max_tokens': 200}, ...]
+            timed: True면 결과마다 (결과, 걸린 시간) - 자리를 얻기 전에 실패했으면 시간은 None
+        Returns:
+            list: 요청 순서대로 응답 텍스트 또는 발생한 예외
+        """
+        async def run(request):
+            timing = {}
+            try:
+                result = await self.acomplete(timing=timing, **request)
+            except Exception as e:
+                result = e
+            return (result, timing.get('latency')) if timed else result
+
+        async def run_all():
+            return await asyncio.gather(*(run(request) for request in requests))
+
+        return asyncio.run_coroutine_threadsafe(run_all(), self._loop).result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': self.active,
+                'waiting': self.waiting,
+                'completed': self.completed,
+                'failed': self.failed,
+                'retries': self.retries,
+                'deadline_exceeded': self.deadline_exceeded,
+                'max_concurrency': self.max_concurrency,
+                'deadline': self.deadline
+            }
+
+    def close(self):
+        """HTTP 연결을 닫고 이벤트 루프 스레드 종료"""
+        asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
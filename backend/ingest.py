@@ -0,0 +1,170 @@
+"""
+업로드 스트리밍 수신
+- multipart 요청 본문(request.stream)을 고정 크기 청크로 직접 읽으며 파싱
+  (request.files/request.form을 쓰지 않으므로 Werkzeug가 본문 전체를 임시 파일에 먼저 쓰지 않음)
+- 오디오 파트는 받는 즉시 임시 파일로 복사, 최대 크기를 넘는 순간 중단 (나머지 본문을 읽지 않음)
+- 같은 패스에서 sha256 해시 계산 + 매직 바이트로 오디오 형식 판별 (앞부분이 오디오가 아니면 바로 중단)
+- 다른 폼 필드는 메모리에 모음 (MAX_FORM_MEMORY 이하)
+- 검사를 모두 통과하면 호출한 쪽이 save()로 uploads/ 안의 최종 경로로 원자적으로 이름 변경
+
+사용 예:
+    form, audio = receive_upload(request.stream, request.mimetype_params, upload_dir, MAX_FILE_SIZE)
+    audio.save(filepath)      # 또는 audio.discard()
+"""
+import hashlib
+import os
+import tempfile
+
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+from audio_utils import sniff_format
+
+INGEST_CHUNK_SIZE = 256 * 1024  # 256KB
+SNIFF_SIZE = 12  # 형식 판별에 필요한 앞부분 바이트 수
+MAX_FORM_MEMORY = 1024 * 1024  # 파일이 아닌 폼 필드 하나의 최대 크기 (바이트)
+
+
+class UploadError(Exception):
+    """업로드 거부 (message는 그대로 클라이언트에 전달)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class IngestResult:
+    """받은 오디오 파트 정보 (save() 전에는 업로드 폴더 안의 임시 파일)"""
+
+    def __init__(self, filename, temp_path, size, sha256, audio_format):
+        self.filename = filename
+        self.filepath = temp_path
+        self.size = size
+        self.sha256 = sha256
+        self.audio_format = audio_format
+
+    def save(self, filepath):
+        """최종 경로로 이름 변경 (같은 폴더 안이므로 원자적)"""
+        os.replace(self.filepath, filepath)
+        self.filepath = filepath
+
+    def discard(self):
+        """임시 파일 삭제 (검증 실패 시)"""
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+
+class _AudioWriter:
+    """오디오 파트를 임시 파일로 복사하면서 크기/형식 검사 + 해시 계산"""
+
+    def __init__(self, filename, upload_dir, max_size):
+        self.filename = filename
+        self.max_size = max_size
+        fd, self.temp_path = tempfile.mkstemp(dir=upload_dir, prefix='.upload-', suffix='.part')
+        self.out = os.fdopen(fd, 'wb')
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.head = b''
+        self.audio_format = None
+
+    def write(self, chunk):
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise UploadError(f'파일 크기가 너무 큽니다. (최대 {self.max_size // (1024 * 1024)}MB)')
+
+        # 앞부분이 모이면 바로 형식 판별 (오디오가 아니면 나머지를 읽지 않고 중단)
+        if self.audio_format is None and len(self.head) < SNIFF_SIZE:
+            self.head += chunk[:SNIFF_SIZE - len(self.head)]
+            if len(self.head) >= SNIFF_SIZE:
+                self._sniff()
+
+        self.digest.update(chunk)
+        self.out.write(chunk)
+
+    def _sniff(self):
+        self.audio_format = sniff_format(self.head)
+        if self.audio_format is None:
+            raise UploadError('지원하지 않는 오디오 형식입니다.')
+
+    def finish(self):
+        self.out.close()
+        if self.size == 0:
+            raise UploadError('빈 파일입니다.')
+        if self.audio_format is None:
+            self._sniff()
+        return IngestResult(self.filename, self.temp_path, self.size, self.digest.hexdigest(), self.audio_format)
+
+    def abort(self):
+        self.out.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def receive_upload(stream, mimetype_params, upload_dir, max_size, file_field='audio',
+                   chunk_size=INGEST_CHUNK_SIZE):
+    """
+    multipart 요청 본문을 한 번 읽으면서 폼 필드를 모으고 오디오 파트는 검사하며 저장
+
+    Args:
+        stream: 요청 본문 스트림 (request.stream - request.form/files에 접근하기 전)
+        mimetype_params: Content-Type 파라미터 (request.mimetype_params, boundary 포함)
+        upload_dir: 임시 파일을 만들 폴더 (최종 경로와 같은 폴더여야 save()가 원자적)
+        max_size: 오디오 파일 최대 크기 (바이트)
+        file_field: 오디오 파일 필드 이름 (같은 이름이 여러 개면 첫 번째만)
+    Returns:
+        (form, audio): 폼 필드 dict (같은 이름은 첫 값), 오디오 파트가 없으면 audio는 None
+    Raises:
+        UploadError: 파일 미선택, 크기 초과, 빈 파일, 오디오가 아닌 파일
+        RequestEntityTooLarge: 폼 필드가 MAX_FORM_MEMORY보다 큼
+    """
+    boundary = (mimetype_params or {}).get('boundary')
+    if not boundary:
+        return {}, None
+
+    decoder = MultipartDecoder(boundary.encode('latin-1'), max_form_memory_size=MAX_FORM_MEMORY)
+    form = {}
+    audio = None
+    writer = None
+    part = None
+    field_chunks = []
+
+    try:
+        while True:
+            data = stream.read(chunk_size)
+            decoder.receive_data(data or None)  # None: 본문 끝
+            event = decoder.next_event()
+            while not isinstance(event, (NeedData, Epilogue)):
+                if isinstance(event, File):
+                    part = event
+                    if event.name == file_field and audio is None and writer is None:
+                        if not event.filename:
+                            raise UploadError('파일이 선택되지 않았습니다.')
+                        writer = _AudioWriter(event.filename, upload_dir, max_size)
+                elif isinstance(event, Field):
+                    part = event
+                    field_chunks = []
+                elif isinstance(event, Data):
+                    if isinstance(part, Field):
+                        field_chunks.append(event.data)
+                        if not event.more_data:
+                            form.setdefault(part.name, b''.join(field_chunks).decode('utf-8', 'replace'))
+                    elif writer is not None:
+                        writer.write(event.data)
+                        if not event.more_data:
+                            audio = writer.finish()
+                            writer = None
+                    # 그 밖의 파일 파트는 버림
+                event = decoder.next_event()
+            if not data or isinstance(event, Epilogue):
+                break
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        if audio is not None:
+            audio.discard()
+        raise
+
+    if writer is not None:
+        writer.abort()  # 본문이 파트 중간에서 끝남
+        raise UploadError('업로드가 중간에 끊겼습니다.')
+    return form, audio
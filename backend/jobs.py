@@ -0,0 +1,205 @@
+"""
+녹음 비동기 처리 작업 큐
+- processing_jobs 테이블(SQLite)을 큐로 사용 (외부 브로커 불필요)
+- 각 웹 워커 프로세스 안에서 백그라운드 스레드 풀이 작업을 가져가 처리
+- 작업 점유는 조건부 UPDATE로 원자적으로 처리하므로 여러 gunicorn 워커가 동시에 돌아도 안전
+"""
+import os
+import threading
+import traceback
+from datetime import timedelta
+from sqlalchemy import or_, and_, update
+
+from models import db, Recording, ProcessingJob, ProcessingStatus, get_kst_now
+
+# 작업 처리 설정 (환경변수로 조정)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))  # 프로세스당 워커 스레드 수 (0이면 비활성화)
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1.0'))  # 큐가 비었을 때 대기 시간 (초)
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '600'))  # 작업 점유 유지 시간 (초)
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))  # 최대 시도 횟수
+
+
+def enqueue_job(recording, transcript=None):
+    """
+    녹음 처리 작업 등록 (커밋은 호출한 쪽에서 수행)
+
+    Args:
+        recording: pending 상태의 Recording
+        transcript: 프론트엔드에서 인식한 텍스트 (선택)
+    Returns:
+        ProcessingJob
+    """
+    job = ProcessingJob(
+        recording=recording,
+        transcript=transcript or None,
+        status=ProcessingStatus.PENDING
+    )
+    db.session.add(job)
+    return job
+
+
+def _claimable_condition(now):
+    """가져갈 수 있는 작업 조건: 대기 중이거나, 점유 시간이 만료된 처리 중 작업"""
+    return or_(
+        ProcessingJob.status == ProcessingStatus.PENDING,
+        and_(
+            ProcessingJob.status == ProcessingStatus.PROCESSING,
+            ProcessingJob.locked_until < now
+        )
+    )
+
+
+def claim_next_job():
+    """
+    다음 작업을 원자적으로 점유
+
+    Returns:
+        str | None: 점유한 작업 ID (없으면 None)
+    """
+    for _ in range(3):  # 다른 워커와 경합하면 몇 번 재시도
+        now = get_kst_now()
+        job_id = db.session.query(ProcessingJob.id).filter(
+            _claimable_condition(now)
+        ).order_by(ProcessingJob.created_at).limit(1).scalar()
+
+        if job_id is None:
+            db.session.rollback()
+            return None
+
+        result = db.session.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id, _claimable_condition(now))
+            .values(
+                status=ProcessingStatus.PROCESSING,
+                attempts=ProcessingJob.attempts + 1,
+                locked_until=now + timedelta(seconds=JOB_LEASE_SECONDS),
+                started_at=now
+            )
+        )
+        db.session.commit()
+
+        if result.rowcount == 1:
+            return job_id
+    return None
+
+
+def run_job(job_id, handler):
+    """
+    점유한 작업 실행
+
+    Args:
+        job_id: 작업 ID
+        handler: handler(recording, job) - 녹음 처리 함수 (실패 시 예외 발생)
+    """
+    job = db.session.get(ProcessingJob, job_id)
+    if job is None:
+        return
+
+    recording = job.recording
+    if recording is None:
+        # 녹음이 이미 삭제된 경우
+        db.session.delete(job)
+        db.session.commit()
+        return
+
+    if job.attempts > JOB_MAX_ATTEMPTS:
+        # 처리 중에 워커가 죽어 점유 만료로 다시 가져간 작업 - 재시도 횟수를 넘었으면 처리하지 않고 실패 처리
+        print(f"[작업 큐] 작업 실패: {job.id} - 점유 만료로 재시도 횟수 초과 (시도: {job.attempts})")
+        job.status = ProcessingStatus.FAILED
+        job.error = job.error or '처리 중 점유 시간이 만료되어 재시도 횟수를 초과했습니다.'
+        job.finished_at = get_kst_now()
+        job.locked_until = None
+        recording.status = ProcessingStatus.FAILED
+        db.session.commit()
+        return
+
+    print(f"[작업 큐] 작업 시작: {job.id} (녹음 ID: {recording.id}, 시도: {job.attempts})")
+    recording.status = ProcessingStatus.PROCESSING
+    db.session.commit()
+
+    try:
+        handler(recording, job)
+
+        job.status = ProcessingStatus.DONE
+        job.error = None
+        job.finished_at = get_kst_now()
+        job.locked_until = None
+        recording.status = ProcessingStatus.DONE
+        recording.updated_at = get_kst_now()
+        db.session.commit()
+        print(f"[작업 큐] 작업 완료: {job.id}")
+    except Exception as e:
+        db.session.rollback()
+        error_trace = traceback.format_exc()
+        print(f"[작업 큐] 작업 실패: {job_id} - {str(e)}")
+        print(error_trace)
+
+        job = db.session.get(ProcessingJob, job_id)
+        if job is None:
+            return
+        job.error = str(e)
+        job.locked_until = None
+        if job.attempts >= JOB_MAX_ATTEMPTS:
+            # 재시도 횟수 초과 -> 실패 처리
+            job.status = ProcessingStatus.FAILED
+            job.finished_at = get_kst_now()
+            if job.recording is not None:
+                job.recording.status = ProcessingStatus.FAILED
+        else:
+            # 다시 대기열로
+            job.status = ProcessingStatus.PENDING
+            if job.recording is not None:
+                job.recording.status = ProcessingStatus.PENDING
+        db.session.commit()
+
+
+class JobWorkerPool:
+    """프로세스 내 백그라운드 작업 워커 풀"""
+
+    def __init__(self, app, handler, num_workers=JOB_WORKERS, poll_interval=JOB_POLL_INTERVAL):
+        self.app = app
+        self.handler = handler
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """워커 스레드 시작"""
+        if self._threads or self.num_workers <= 0:
+            return
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"[작업 큐] 워커 {self.num_workers}개 시작 (PID: {os.getpid()})")
+
+    def notify(self):
+        """새 작업이 등록되었음을 알림 (대기 중인 워커를 바로 깨움)"""
+        self._wakeup.set()
+
+    def stop(self, timeout=5):
+        """워커 스레드 종료"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        while not self._stop.is_set():
+            job_id = None
+            try:
+                with self.app.app_context():
+                    job_id = claim_next_job()
+                    if job_id is not None:
+                        run_job(job_id, self.handler)
+            except Exception as e:
+                print(f"[작업 큐] 워커 오류: {str(e)}")
+                print(traceback.format_exc())
+
+            if job_id is None:
+                # 큐가 비었으면 새 작업 알림 또는 폴링 간격까지 대기
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
@@ -0,0 +1,214 @@
+"""
+키워드 색인 관리 (keywords / recording_keywords 테이블)
+- 녹음의 keywords 문자열(쉼표 구분)을 키워드 행 + 녹음-키워드 연결 행으로 나눠 저장
+- 녹음이 생성/수정/삭제될 때 호출한 쪽의 트랜잭션 안에서 연결 행과 키워드별 녹음 수를 갱신 (rollups.py와 같은 방식)
+- 키워드별 녹음 조회는 (keyword_id, recording_id) 인덱스를 id 역순(최신순)으로 따라감
+  (사용자 필터가 있으면 사용자의 최신순 인덱스), 자주 나온 키워드는 (recording_count, id) 인덱스로 처리
+  (keywords 문자열을 LIKE로 훑지 않음)
+
+사용 예:
+    add_recording(recording)          # 새 녹음 (id가 없으면 flush)
+    update_recording(recording)       # keywords가 바뀌었을 수 있는 녹음 (바뀐 키워드만 반영)
+    remove_recording(recording)       # 삭제 전
+    top_keywords(10)                  # 녹음 수가 많은 키워드
+    keyword_recordings(query, keyword, limit=20, cursor=cursor)  # 키워드별 녹음 한 페이지
+    ensure_keyword_index(conn)        # 앱 시작/마이그레이션 시 (비어 있으면 기존 녹음으로 채움)
+"""
+from sqlalchemy import delete, exists, func, select, update
+
+from models import db, Keyword, Recording, RecordingKeyword, dialect_insert
+from pagination import paginate_by_id, paginate_recordings
+from rollups import split_keywords
+
+BATCH_SIZE = 10000  # 재계산 시 한 번에 INSERT할 행 수
+
+keywords_table = Keyword.__table__
+links_table = RecordingKeyword.__table__
+
+
+def _keyword_ids(conn, names, dialect_name=None):
+    """
+    키워드 이름 -> id (없는 이름은 새로 추가, 동시에 같은 이름을 추가해도 한 행)
+
+    Args:
+        conn: db.session 또는 Connection
+    """
+    if not names:
+        return {}
+    conn.execute(
+        dialect_insert(keywords_table, dialect_name).on_conflict_do_nothing(index_elements=['name']),
+        [{'name': name, 'recording_count': 0} for name in names]
+    )
+    return dict(conn.execute(
+        select(keywords_table.c.name, keywords_table.c.id).where(keywords_table.c.name.in_(names))
+    ).all())
+
+
+def _change_counts(conn, keyword_ids, delta):
+    """키워드별 녹음 수 증감 (한 UPDATE 문)"""
+    if keyword_ids:
+        conn.execute(
+            update(keywords_table).where(keywords_table.c.id.in_(keyword_ids))
+            .values(recording_count=keywords_table.c.recording_count + delta)
+        )
+
+
+def add_recording(recording):
+    """새 녹음의 키워드 연결 (녹음 id가 필요하므로 아직 없으면 flush)"""
+    names = split_keywords(recording.keywords)
+    if not names:
+        return
+    if recording.id is None:
+        db.session.flush()
+    ids = _keyword_ids(db.session, names)
+    db.session.execute(links_table.insert(), [
+        {'recording_id': recording.id, 'keyword_id': ids[name]} for name in names
+    ])
+    _change_counts(db.session, list(ids.values()), 1)
+
+
+def update_recording(recording):
+    """수정된 녹음 반영 (현재 연결과 비교해 추가/삭제된 키워드만)"""
+    if recording.id is None:
+        return add_recording(recording)
+    names = split_keywords(recording.keywords)
+    current = dict(db.session.execute(
+        select(keywords_table.c.name, keywords_table.c.id)
+        .join(links_table, links_table.c.keyword_id == keywords_table.c.id)
+        .where(links_table.c.recording_id == recording.id)
+    ).all())
+
+    removed = [keyword_id for name, keyword_id in current.items() if name not in names]
+    if removed:
+        db.session.execute(delete(links_table).where(
+            links_table.c.recording_id == recording.id, links_table.c.keyword_id.in_(removed)
+        ))
+        _change_counts(db.session, removed, -1)
+
+    added = [name for name in names if name not in current]
+    if added:
+        ids = _keyword_ids(db.session, added)
+        db.session.execute(links_table.insert(), [
+            {'recording_id': recording.id, 'keyword_id': ids[name]} for name in added
+        ])
+        _change_counts(db.session, list(ids.values()), 1)
+
+
+def remove_recording(recording):
+    """삭제할 녹음의 키워드 연결 제거 (삭제 전에 호출)"""
+    if recording.id is None:
+        return
+    linked = select(links_table.c.keyword_id).where(links_table.c.recording_id == recording.id)
+    db.session.execute(
+        update(keywords_table).where(keywords_table.c.id.in_(linked))
+        .values(recording_count=keywords_table.c.recording_count - 1)
+    )
+    db.session.execute(delete(links_table).where(links_table.c.recording_id == recording.id))
+
+
+# ==================== 조회 ====================
+
+def find_keyword(name):
+    """이름이 같은 키워드 (없으면 None)"""
+    name = (name or '').strip()
+    if not name:
+        return None
+    return Keyword.query.filter_by(name=name).first()
+
+
+def top_keywords(limit):
+    """녹음 수가 많은 키워드 limit개 (같으면 최근에 추가된 키워드 먼저, 녹음이 없는 키워드 제외)"""
+    return (
+        Keyword.query
+        .filter(Keyword.recording_count > 0)
+        .order_by(Keyword.recording_count.desc(), Keyword.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def keyword_recordings(query, keyword, limit, cursor=None, user_id=None):
+    """
+    키워드가 연결된 녹음 한 페이지 (최신순, 피드와 같은 커서)
+    - 기본: 역색인 (keyword_id, recording_id)을 recording_id 역순으로 따라가며 녹음과 조인
+      (키워드의 녹음이 오래됐거나 드물어도 녹음 전체의 최신순 인덱스를 훑지 않고 limit개를 찾으면 멈춤)
+    - 사용자 필터: 사용자의 최신순 인덱스를 따라가며 연결 행을 기본 키로 확인 (사용자의 녹음만 읽음)
+
+    Args:
+        query: 다른 필터(is_uploaded 등)를 적용한 Recording 쿼리
+        keyword: Keyword
+        limit / cursor: paginate_recordings와 같음
+        user_id: 사용자 필터 (선택)
+    Returns:
+        (items, next_cursor)
+    Raises:
+        InvalidCursorError: 잘못된 커서
+    """
+    if user_id:
+        linked = exists().where(links_table.c.keyword_id == keyword.id, links_table.c.recording_id == Recording.id)
+        return paginate_recordings(query.filter(Recording.user_id == user_id, linked), Recording, limit, cursor)
+
+    query = query.join(links_table, links_table.c.recording_id == Recording.id) \
+        .filter(links_table.c.keyword_id == keyword.id)
+    return paginate_by_id(query, links_table.c.recording_id, limit, cursor)
+
+
+# ==================== 색인 관리 ====================
+
+def rebuild(conn):
+    """
+    녹음 테이블에서 키워드 색인을 다시 만들기 (기존 데이터 백필/불일치 복구용)
+    호출한 쪽의 트랜잭션 안에서 실행
+
+    Args:
+        conn: Connection (앱 안에서는 db.session.connection())
+    Returns:
+        int: 키워드가 있는 녹음 수
+    """
+    conn.execute(delete(links_table))
+
+    links = []
+    names = {}
+    count = 0
+    rows = conn.execute(select(Recording.id, Recording.keywords).where(Recording.keywords.isnot(None))).all()
+    for recording_id, keywords in rows:
+        recording_names = split_keywords(keywords)
+        if recording_names:
+            count += 1
+        for name in recording_names:
+            names[name] = None
+            links.append((recording_id, name))
+
+    ids = dict(conn.execute(select(keywords_table.c.name, keywords_table.c.id)).all())
+    missing = [name for name in names if name not in ids]
+    for start in range(0, len(missing), BATCH_SIZE):
+        ids.update(_keyword_ids(conn, missing[start:start + BATCH_SIZE], conn.dialect.name))
+
+    for start in range(0, len(links), BATCH_SIZE):
+        conn.execute(links_table.insert(), [
+            {'recording_id': recording_id, 'keyword_id': ids[name]}
+            for recording_id, name in links[start:start + BATCH_SIZE]
+        ])
+
+    conn.execute(update(keywords_table).values(recording_count=(
+        select(func.count()).where(links_table.c.keyword_id == keywords_table.c.id).scalar_subquery()
+    )))
+    return count
+
+
+def ensure_keyword_index(conn):
+    """
+    키워드 색인 준비 (테이블이 없으면 만들고, 연결 행이 비어 있는데 키워드가 있는 녹음이 있으면 채움)
+    호출한 쪽의 트랜잭션 안에서 실행 (engine.begin())
+    """
+    for table in (keywords_table, links_table):
+        table.create(conn, checkfirst=True)
+
+    if conn.execute(select(links_table.c.recording_id).limit(1)).first() is not None:
+        return
+    has_keywords = conn.execute(
+        select(Recording.id).where(Recording.keywords.isnot(None), Recording.keywords != '').limit(1)
+    ).first()
+    if has_keywords:
+        count = rebuild(conn)
+        print(f"[키워드] 기존 녹음 {count}개로 키워드 색인 생성 완료")
@@ -0,0 +1,265 @@
+"""
+좋아요 쓰기 지연(write-behind) 버퍼
+- 요청마다 트랜잭션을 커밋하는 대신, 녹음별 좋아요 증감을 프로세스 메모리에 모았다가
+  LIKE_FLUSH_INTERVAL_MS마다 또는 LIKE_FLUSH_MAX_EVENTS개가 쌓이면 한 트랜잭션으로 반영
+  (인기 녹음에 좋아요가 몰릴 때 SQLite 쓰기 트랜잭션 수를 크게 줄임)
+- 응답과 조회 결과에는 아직 반영되지 않은 증감을 더해서 돌려줌 (같은 프로세스 기준)
+- 프로세스 종료 시(atexit) 남은 증감을 반영
+- LIKE_BUFFER=true일 때만 사용 (기본은 likes.py로 요청마다 바로 반영)
+
+주의: 버퍼는 워커 프로세스마다 따로 있으므로, 다른 워커의 미반영 증감은
+최대 LIKE_FLUSH_INTERVAL_MS 뒤에 보입니다. 프로세스가 강제 종료(SIGKILL)되면 미반영 증감은 사라집니다.
+"""
+import atexit
+import os
+import threading
+import traceback
+from collections import defaultdict
+
+from sqlalchemy import bindparam, case, func, select, update
+
+from models import db, Recording, RecordingLike
+from likes import current_likes, insert_like_record, delete_like_record
+
+LIKE_BUFFER = os.getenv('LIKE_BUFFER', 'false').lower() in ('1', 'true', 'yes')
+LIKE_FLUSH_INTERVAL_MS = int(os.getenv('LIKE_FLUSH_INTERVAL_MS', '200'))  # 반영 주기
+LIKE_FLUSH_MAX_EVENTS = int(os.getenv('LIKE_FLUSH_MAX_EVENTS', '500'))  # 이만큼 쌓이면 주기 전에 반영
+
+
+class LikeBuffer:
+    """프로세스 내 좋아요 증감 버퍼"""
+
+    def __init__(self, app, interval_ms=LIKE_FLUSH_INTERVAL_MS, max_events=LIKE_FLUSH_MAX_EVENTS):
+        self.app = app
+        self.interval = interval_ms / 1000.0
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # 익명 좋아요: recording_id -> 증감
+        self._deltas = defaultdict(int)
+        # 사용자별 좋아요: (user_id, recording_id) -> (원하는 상태, DB 상태)
+        self._user_states = {}
+        # 사용자별 좋아요로 생긴 recording_id -> 증감 (_user_states 합계)
+        self._user_deltas = defaultdict(int)
+        # 반영 중인 증감/사용자별 상태 (커밋 전까지 조회 결과에 포함)
+        self._inflight = defaultdict(int)
+        self._inflight_users = {}
+        self._events = 0
+        # 반영(커밋)이 끝날 때마다 증가 - 그 사이에 읽은 DB 값은 다시 읽음
+        self._generation = 0
+
+        self.flushes = 0
+        self.flushed_events = 0
+
+    # ==================== 요청 처리 ====================
+
+    def like(self, recording_id, user_id=None):
+        """likes.like와 같은 반환값: (좋아요 수 또는 None(녹음 없음), 이번 요청으로 바뀌었는지)"""
+        return self._change(recording_id, user_id, True)
+
+    def unlike(self, recording_id, user_id=None):
+        """likes.unlike와 같은 반환값"""
+        return self._change(recording_id, user_id, False)
+
+    def _change(self, recording_id, user_id, liked):
+        step = 1 if liked else -1
+        key = (user_id, recording_id)
+        while True:
+            generation = self._generation
+            stored = current_likes(recording_id)
+            if stored is None:
+                return None, False
+            if user_id is not None:
+                db_state = db.session.execute(
+                    select(RecordingLike.user_id).where(
+                        RecordingLike.user_id == user_id,
+                        RecordingLike.recording_id == recording_id
+                    )
+                ).first() is not None
+
+            with self._lock:
+                if generation != self._generation:
+                    # 읽는 도중 반영이 커밋됨 -> 반영된 값 기준으로 다시 읽기
+                    continue
+                count = stored + self._pending_locked(recording_id)
+                if user_id is not None:
+                    state = self._user_states.get(key)
+                    if state is None:
+                        known = self._inflight_users.get(key, db_state)
+                        state = (known, known)
+                    desired, base = state
+                    if desired == liked:
+                        return max(count, 0), False
+                    self._user_states[key] = (liked, base)
+                    self._user_deltas[recording_id] += step
+                elif not liked and count <= 0:
+                    # 0 아래로 내려가지 않음 (취소할 좋아요가 없으므로 바뀐 것 없음)
+                    return 0, False
+                else:
+                    self._deltas[recording_id] += step
+                self._events += 1
+                full = self._events >= self.max_events
+            break
+
+        if full:
+            self._wakeup.set()
+        return max(count + step, 0), True
+
+    # ==================== 조회 ====================
+
+    def _pending_locked(self, recording_id):
+        """아직 DB에 반영되지 않은 증감 (self._lock 안에서 호출)"""
+        return (self._deltas.get(recording_id, 0) + self._user_deltas.get(recording_id, 0)
+                + self._inflight.get(recording_id, 0))
+
+    def pending(self):
+        """녹음별 미반영 증감 전체"""
+        with self._lock:
+            recording_ids = set(self._deltas) | set(self._user_deltas) | set(self._inflight)
+            totals = {rid: self._pending_locked(rid) for rid in recording_ids}
+        return {rid: delta for rid, delta in totals.items() if delta}
+
+    def merge(self, recordings):
+        """to_dict() 결과 목록의 likes에 미반영 증감을 더함 (목록/상세 응답용)"""
+        pending = self.pending()
+        if pending:
+            for recording in recordings:
+                delta = pending.get(recording['id'])
+                if delta:
+                    recording['likes'] = max((recording['likes'] or 0) + delta, 0)
+        return recordings
+
+    # ==================== 반영 ====================
+
+    def flush(self):
+        """
+        모인 증감을 한 트랜잭션으로 반영
+
+        Returns:
+            int: 반영한 이벤트 수
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._events:
+                    return 0
+                deltas, self._deltas = self._deltas, defaultdict(int)
+                user_states, self._user_states = self._user_states, {}
+                user_deltas, self._user_deltas = self._user_deltas, defaultdict(int)
+                events, self._events = self._events, 0
+                inflight = defaultdict(int, deltas)
+                for rid, delta in user_deltas.items():
+                    inflight[rid] += delta
+                for rid, delta in inflight.items():
+                    self._inflight[rid] += delta
+                self._inflight_users.update({key: desired for key, (desired, _) in user_states.items()})
+
+            try:
+                with self.app.app_context():
+                    self._apply(deltas, user_states)
+                    db.session.commit()
+            except Exception as e:
+                print(f"[좋아요 버퍼] 반영 실패, 다음 주기에 다시 시도: {str(e)}")
+                print(traceback.format_exc())
+                with self._lock:
+                    for rid, delta in deltas.items():
+                        self._deltas[rid] += delta
+                    for key, (desired, base) in user_states.items():
+                        # 그 사이에 같은 사용자가 다시 눌렀으면 최신 상태 유지 (DB 상태는 그대로 base)
+                        previous = self._user_states.get(key)
+                        latest = desired
+                        if previous is not None:
+                            latest = previous[0]
+                            self._user_deltas[key[1]] -= int(previous[0]) - int(previous[1])
+                        self._user_states[key] = (latest, base)
+                        self._user_deltas[key[1]] += int(latest) - int(base)
+                    self._events += events
+                    self._inflight.clear()
+                    self._inflight_users.clear()
+                return 0
+            finally:
+                with self.app.app_context():
+                    db.session.remove()
+
+            with self._lock:
+                for rid, delta in inflight.items():
+                    self._inflight[rid] -= delta
+                    if not self._inflight[rid]:
+                        del self._inflight[rid]
+                for key in user_states:
+                    self._inflight_users.pop(key, None)
+                self._generation += 1
+                self.flushes += 1
+                self.flushed_events += events
+            return events
+
+    def _apply(self, deltas, user_states):
+        """사용자별 좋아요 기록 추가/삭제 후 녹음별 좋아요 수를 한 번의 executemany UPDATE로 반영"""
+        totals = defaultdict(int, deltas)
+        for (user_id, recording_id), (desired, db_state) in user_states.items():
+            if desired == db_state:
+                continue  # 눌렀다가 취소한 경우
+            # 다른 워커가 먼저 반영했거나 녹음이 삭제됐으면 0 -> 좋아요 수도 바꾸지 않음
+            if desired:
+                changed = insert_like_record(user_id, recording_id)
+            else:
+                changed = delete_like_record(user_id, recording_id)
+            if changed:
+                totals[recording_id] += 1 if desired else -1
+
+        rows = [{'rid': rid, 'delta': delta} for rid, delta in totals.items() if delta]
+        if not rows:
+            return
+        recordings = Recording.__table__
+        current = func.coalesce(recordings.c.likes, 0) + bindparam('delta')
+        db.session.execute(
+            update(recordings)
+            .where(recordings.c.id == bindparam('rid'))
+            .values(likes=case((current > 0, current), else_=0)),
+            rows
+        )
+
+    # ==================== 백그라운드 스레드 ====================
+
+    def start(self):
+        """주기적으로 반영하는 스레드 시작 (프로세스 종료 시 남은 증감 반영)"""
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name='like-buffer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        print(f"[좋아요 버퍼] 시작 ({int(self.interval * 1000)}ms 또는 {self.max_events}건마다 반영, PID: {os.getpid()})")
+
+    def stop(self, timeout=5):
+        """스레드 종료 후 남은 증감 반영"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[좋아요 버퍼] 오류: {str(e)}")
+
+    def stats(self):
+        """헬스체크용 통계"""
+        with self._lock:
+            pending_events = self._events
+        return {
+            'enabled': True,
+            'interval_ms': int(self.interval * 1000),
+            'max_events': self.max_events,
+            'pending_events': pending_events,
+            'flushes': self.flushes,
+            'flushed_events': self.flushed_events,
+        }
@@ -0,0 +1,113 @@
+"""
+좋아요 수 증감
+- 녹음을 읽어서 +1 하고 저장하는 대신, UPDATE ... SET likes = likes + 1 RETURNING likes 한 문장으로 처리
+  (여러 워커가 동시에 눌러도 증가분이 사라지지 않고, SELECT 없이 한 번에 끝남)
+- 취소는 0 아래로 내려가지 않도록 같은 문장 안에서 0으로 고정 (이미 0이면 바뀐 것이 없다고 응답)
+- 사용자 ID를 주면 recording_likes 기록으로 같은 사용자의 중복 좋아요/취소를 무시 (멱등)
+- 커밋은 호출한 쪽에서 수행
+"""
+from sqlalchemy import case, delete, func, literal, select, update
+
+from models import db, Recording, RecordingLike, dialect_insert, get_kst_now
+
+
+def change_likes(recording_id, delta, only_positive=False):
+    """
+    좋아요 수를 한 UPDATE 문으로 증감 (감소는 0에서 멈춤)
+
+    Args:
+        only_positive: True면 좋아요 수가 0보다 클 때만 변경 (이미 0이면 행을 바꾸지 않음)
+    Returns:
+        int | None: 변경 후 좋아요 수 (녹음이 없거나 only_positive인데 0이면 None)
+    """
+    current = func.coalesce(Recording.likes, 0)
+    if delta >= 0:
+        value = current + delta
+    else:
+        value = case((current + delta > 0, current + delta), else_=0)
+    stmt = (
+        update(Recording)
+        .where(Recording.id == recording_id)
+        .values(likes=value)
+        .execution_options(synchronize_session=False)
+    )
+    if only_positive:
+        stmt = stmt.where(current > 0)
+
+    if db.engine.dialect.update_returning:
+        # SQLite 3.35+, PostgreSQL
+        return db.session.execute(stmt.returning(Recording.likes)).scalar()
+
+    # RETURNING을 지원하지 않는 DB: 같은 트랜잭션에서 다시 읽음
+    if db.session.execute(stmt).rowcount == 0:
+        return None
+    return current_likes(recording_id)
+
+
+def current_likes(recording_id):
+    """현재 좋아요 수 (녹음이 없으면 None)"""
+    return db.session.execute(
+        select(func.coalesce(Recording.likes, 0)).where(Recording.id == recording_id)
+    ).scalar()
+
+
+def insert_like_record(user_id, recording_id):
+    """
+    사용자별 좋아요 기록 추가 (녹음이 있고 아직 좋아요하지 않은 경우만)
+
+    Returns:
+        int: 추가한 행 수 (0 또는 1)
+    """
+    stmt = dialect_insert(RecordingLike.__table__).from_select(
+        ['user_id', 'recording_id', 'created_at'],
+        select(literal(user_id), Recording.id, literal(get_kst_now(), db.DateTime))
+        .where(Recording.id == recording_id)
+    ).on_conflict_do_nothing(index_elements=['user_id', 'recording_id'])
+    return db.session.execute(stmt).rowcount
+
+
+def delete_like_record(user_id, recording_id):
+    """
+    사용자별 좋아요 기록 삭제
+
+    Returns:
+        int: 삭제한 행 수 (0 또는 1)
+    """
+    return db.session.execute(
+        delete(RecordingLike).where(
+            RecordingLike.user_id == user_id,
+            RecordingLike.recording_id == recording_id
+        ).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def like(recording_id, user_id=None):
+    """
+    좋아요 추가
+
+    Returns:
+        tuple: (좋아요 수 또는 None(녹음 없음), 이번 요청으로 바뀌었는지)
+    """
+    if user_id is not None and insert_like_record(user_id, recording_id) == 0:
+        # 이미 좋아요한 녹음 (또는 녹음 없음 -> None)
+        return current_likes(recording_id), False
+    likes = change_likes(recording_id, 1)
+    return likes, likes is not None
+
+
+def unlike(recording_id, user_id=None):
+    """
+    좋아요 취소
+
+    Returns:
+        tuple: (좋아요 수 또는 None(녹음 없음), 이번 요청으로 바뀌었는지)
+    """
+    if user_id is not None and delete_like_record(user_id, recording_id) == 0:
+        # 좋아요한 적 없는 녹음 (또는 녹음 없음 -> None)
+        return current_likes(recording_id), False
+    likes = change_likes(recording_id, -1, only_positive=True)
+    if likes is None:
+        # 녹음이 없거나 이미 0 (익명 취소는 바뀐 것이 없음, 사용자 기록은 지웠으므로 바뀜)
+        likes = current_likes(recording_id)
+        return likes, user_id is not None and likes is not None
+    return likes, True
@@ -1,65 +1,124 @@
 """
 데이터베이스 마이그레이션 스크립트
-기존 데이터베이스에 새로운 컬럼 추가
+기존 데이터베이스에 새로운 컬럼과 인덱스 추가
+DATABASE_URL 기준으로 SQLite, PostgreSQL 모두 지원 (db_config.py)
 """
-import sqlite3
 import os
-from pathlib import Path
 
-def migrate_database():
+from sqlalchemy import Boolean, DateTime, Float, String, inspect, literal, text
+from sqlalchemy.schema import CreateIndex
+
+from db_config import create_db_engine, sqlite_database_path
+from models import Recording
+from search import ensure_search_index
+from keyword_index import ensure_keyword_index
+from rollups import ensure_rollups
+
+# 나중에 추가된 recordings 컬럼: (이름, 타입, 기본값, NULL 허용)
+RECORDING_COLUMNS = [
+    ('is_uploaded', Boolean(), False, False),
+    ('uploaded_at', DateTime(), None, True),
+    ('district', String(50), None, True),
+    ('duration', Float(), None, True),
+    # 비동기 처리 상태 (기존 녹음은 모두 처리 완료)
+    ('status', String(20), 'done', False),
+]
+
+# 더 긴 인덱스로 대체된 recordings 인덱스 (있으면 삭제)
+REPLACED_INDEXES = [
+    'ix_recordings_user_emotion',  # -> ix_recordings_user_emotion_recorded_at
+    'ix_recordings_user_district',  # -> ix_recordings_user_district_recorded_at
+]
+
+
+def add_column(conn, table, name, column_type, default=None, nullable=True):
+    """DB 종류에 맞는 타입/기본값으로 ALTER TABLE ... ADD COLUMN 실행"""
+    dialect = conn.dialect
+    ddl = f"ALTER TABLE {table} ADD COLUMN {name} {column_type.compile(dialect=dialect)}"
+    if default is not None:
+        # SQLite는 0/1, PostgreSQL은 false/true 등 DB별 리터럴로 변환
+        value = literal(default, column_type).compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+        ddl += f" DEFAULT {value}"
+    if not nullable:
+        ddl += " NOT NULL"
+    conn.execute(text(ddl))
+
+
+def add_missing_columns(conn, table, specs):
+    """specs 중 테이블에 없는 컬럼 추가"""
+    columns = [column['name'] for column in inspect(conn).get_columns(table)]
+    print(f"현재 컬럼: {columns}")
+
+    for name, column_type, default, nullable in specs:
+        if name not in columns:
+            print(f"{name} 컬럼 추가 중...")
+            add_column(conn, table, name, column_type, default, nullable)
+            print(f"✓ {name} 컬럼 추가 완료")
+        else:
+            print(f"✓ {name} 컬럼 이미 존재")
+
+
+def add_missing_indexes(conn, table):
+    """models에 정의된 인덱스 중 DB에 없는 것 추가"""
+    indexes = {index['name'] for index in inspect(conn).get_indexes(table.name)}
+    for index in sorted(table.indexes, key=lambda i: i.name):
+        if index.name not in indexes:
+            print(f"{index.name} 인덱스 추가 중...")
+            conn.execute(CreateIndex(index))
+            print(f"✓ {index.name} 인덱스 추가 완료")
+        else:
+            print(f"✓ {index.name} 인덱스 이미 존재")
+
+
+def drop_replaced_indexes(conn, table, names):
+    """대체된 인덱스 삭제 (쓰기마다 갱신하는 비용만 남으므로)"""
+    indexes = {index['name'] for index in inspect(conn).get_indexes(table.name)}
+    for name in names:
+        if name in indexes:
+            conn.execute(text(f"DROP INDEX {name}"))
+            print(f"✓ {name} 인덱스 삭제 (대체됨)")
+
+
+def migrate_database(engine=None):
     """데이터베이스 마이그레이션 실행"""
-    # 데이터베이스 파일 경로
-    db_path = Path('instance/revo.db')
-    
-    if not db_path.exists():
+    engine = engine or create_db_engine()
+
+    db_path = sqlite_database_path(engine)
+    if db_path and not os.path.exists(db_path):
         print("데이터베이스 파일이 없습니다. 앱을 실행하면 자동으로 생성됩니다.")
         return
-    
-    print(f"데이터베이스 마이그레이션 시작: {db_path}")
-    
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    
+
+    if not inspect(engine).has_table('recordings'):
+        print("recordings 테이블이 없습니다. 앱을 실행하면 자동으로 생성됩니다.")
+        return
+
+    print(f"데이터베이스 마이그레이션 시작: {engine.url.render_as_string(hide_password=True)}")
+
     try:
-        # recordings 테이블의 컬럼 확인
-        cursor.execute("PRAGMA table_info(recordings)")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        print(f"현재 컬럼: {columns}")
-        
-        # is_uploaded 컬럼 추가
-        if 'is_uploaded' not in columns:
-            print("is_uploaded 컬럼 추가 중...")
-            cursor.execute("ALTER TABLE recordings ADD COLUMN is_uploaded BOOLEAN DEFAULT 0 NOT NULL")
-            print("✓ is_uploaded 컬럼 추가 완료")
-        else:
-            print("✓ is_uploaded 컬럼 이미 존재")
-        
-        # uploaded_at 컬럼 추가
-        if 'uploaded_at' not in columns:
-            print("uploaded_at 컬럼 추가 중...")
-            cursor.execute("ALTER TABLE recordings ADD COLUMN uploaded_at DATETIME")
-            print("✓ uploaded_at 컬럼 추가 완료")
-        else:
-            print("✓ uploaded_at 컬럼 이미 존재")
-        
-        # district 컬럼 추가
-        if 'district' not in columns:
-            print("district 컬럼 추가 중...")
-            cursor.execute("ALTER TABLE recordings ADD COLUMN district VARCHAR(50)")
-            print("✓ district 컬럼 추가 완료")
-        else:
-            print("✓ district 컬럼 이미 존재")
-        
-        conn.commit()
+        with engine.begin() as conn:
+            add_missing_columns(conn, 'recordings', RECORDING_COLUMNS)
+
+            # 인덱스 추가 (models.Recording.__table_args__ 기준)
+            add_missing_indexes(conn, Recording.__table__)
+            drop_replaced_indexes(conn, Recording.__table__, REPLACED_INDEXES)
+
+            # 검색 색인 (SQLite FTS5 테이블/트리거 - 없으면 만들고 기존 녹음 색인, 조각 색인에 빠진 녹음 추가)
+            ensure_search_index(conn)
+
+            # 키워드 색인 (keywords/recording_keywords 테이블 - 없으면 만들고 기존 녹음으로 채움)
+            ensure_keyword_index(conn)
+
+            # 사용자별 집계 (롤업 테이블 - 없으면 만들고 기존 녹음으로 채움, 아카이브/사용자 목록이 읽음)
+            ensure_rollups(conn)
+
+            # 쿼리 플래너 통계 갱신 (새 인덱스를 선택하도록)
+            conn.execute(text("ANALYZE"))
+
         print("\n✅ 데이터베이스 마이그레이션 완료!")
-        
+
     except Exception as e:
-        conn.rollback()
         print(f"❌ 마이그레이션 오류: {e}")
         raise
-    finally:
-        conn.close()
 
 if __name__ == '__main__':
     migrate_database()
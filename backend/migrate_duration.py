@@ -3,186 +3,138 @@
 1. duration 컬럼 추가 (없는 경우)
 2. 기존 녹음들의 duration 계산 및 업데이트 (선택)
 """
-import sqlite3
 import os
 from pathlib import Path
 
-# pydub는 선택적으로 import (duration 계산할 때만 필요)
-try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
-except ImportError:
-    PYDUB_AVAILABLE = False
-    print("⚠️  pydub를 사용할 수 없습니다. duration 컬럼 추가만 수행합니다.")
-    print("   duration 계산을 원하면: pip install pydub pyaudioop")
+from sqlalchemy import Float, text
+
+from db_config import create_db_engine, sqlite_database_path
+from migrate_db import add_missing_columns
+
+# 헤더만 읽어서 duration 계산 (전체 디코딩 없음, 실패 시 ffprobe)
+from audio_utils import get_audio_duration
 
 UPLOAD_FOLDER = 'uploads'
 
+def open_database():
+    """DATABASE_URL 기준 엔진 (SQLite 파일이 없으면 None)"""
+    engine = create_db_engine()
+    db_path = sqlite_database_path(engine)
+    if db_path and not os.path.exists(db_path):
+        print("❌ 데이터베이스 파일을 찾을 수 없습니다.")
+        print(f"  - {db_path}")
+        return None
+    print(f"📁 데이터베이스: {engine.url.render_as_string(hide_password=True)}")
+    return engine
+
 def migrate_duration_column():
     """duration 컬럼 추가"""
-    # 데이터베이스 파일 경로 확인
-    db_paths = [
-        Path('instance/revo.db'),
-        Path('revo.db'),
-        Path('backend/revo.db'),
-        Path('backend/instance/revo.db')
-    ]
-    
-    db_path = None
-    for path in db_paths:
-        if path.exists():
-            db_path = path
-            break
-    
-    if not db_path:
-        print("❌ 데이터베이스 파일을 찾을 수 없습니다.")
-        print("다음 경로를 확인했습니다:")
-        for path in db_paths:
-            print(f"  - {path}")
+    engine = open_database()
+    if not engine:
         return False
     
-    print(f"📁 데이터베이스 파일: {db_path}")
-    
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    
     try:
-        # recordings 테이블의 컬럼 확인
-        cursor.execute("PRAGMA table_info(recordings)")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        print(f"현재 컬럼: {columns}")
-        
         # duration 컬럼 추가
-        if 'duration' not in columns:
-            print("➕ duration 컬럼 추가 중...")
-            cursor.execute("ALTER TABLE recordings ADD COLUMN duration REAL")
-            conn.commit()
-            print("✅ duration 컬럼 추가 완료!")
-        else:
-            print("✅ duration 컬럼 이미 존재")
-        
+        with engine.begin() as conn:
+            add_missing_columns(conn, 'recordings', [('duration', Float(), None, True)])
         return True
         
     except Exception as e:
-        conn.rollback()
         print(f"❌ 마이그레이션 오류: {e}")
         return False
     finally:
-        conn.close()
+        engine.dispose()
 
 def update_existing_durations():
     """기존 녹음들의 duration 계산 및 업데이트"""
-    if not PYDUB_AVAILABLE:
-        print("❌ pydub를 사용할 수 없어 duration 계산을 수행할 수 없습니다.")
-        print("   다음 명령어로 설치하세요:")
-        print("   pip install pydub pyaudioop")
-        print("   또는 가상환경 사용: venv\\Scripts\\python.exe migrate_duration.py --update-existing")
+    print(f"\n📁 기존 녹음들의 duration 계산 시작...")
+    engine = open_database()
+    if not engine:
         return False
     
-    # 데이터베이스 파일 경로 확인
-    db_paths = [
-        Path('instance/revo.db'),
-        Path('revo.db'),
-        Path('backend/revo.db'),
-        Path('backend/instance/revo.db')
+    try:
+        with engine.begin() as conn:
+            return _update_durations(conn)
+        
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+        return False
+    finally:
+        engine.dispose()
+
+def _update_durations(conn):
+    """duration이 없는 녹음들 계산 (트랜잭션 안에서 호출)"""
+    # duration이 null이거나 0인 녹음들 가져오기
+    recordings = conn.execute(text("""
+        SELECT id, audio_file 
+        FROM recordings 
+        WHERE duration IS NULL OR duration = 0
+    """)).all()
+    
+    if not recordings:
+        print("✅ 업데이트할 녹음이 없습니다.")
+        return True
+    
+    print(f"📊 총 {len(recordings)}개의 녹음 발견")
+    
+    # 업로드 폴더 경로 확인
+    upload_paths = [
+        Path(UPLOAD_FOLDER),
+        Path('backend') / UPLOAD_FOLDER,
+        Path('instance') / UPLOAD_FOLDER,
     ]
     
-    db_path = None
-    for path in db_paths:
+    upload_folder = None
+    for path in upload_paths:
         if path.exists():
-            db_path = path
+            upload_folder = path
             break
     
-    if not db_path:
-        print("❌ 데이터베이스 파일을 찾을 수 없습니다.")
+    if not upload_folder:
+        print(f"❌ 업로드 폴더를 찾을 수 없습니다. ({UPLOAD_FOLDER})")
         return False
     
-    print(f"\n📁 기존 녹음들의 duration 계산 시작...")
-    print(f"데이터베이스: {db_path}")
+    print(f"📁 업로드 폴더: {upload_folder}")
     
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    success_count = 0
+    error_count = 0
     
-    try:
-        # duration이 null이거나 0인 녹음들 가져오기
-        cursor.execute("""
-            SELECT id, audio_file 
-            FROM recordings 
-            WHERE duration IS NULL OR duration = 0
-        """)
-        recordings = cursor.fetchall()
-        
-        if not recordings:
-            print("✅ 업데이트할 녹음이 없습니다.")
-            return True
-        
-        print(f"📊 총 {len(recordings)}개의 녹음 발견")
-        
-        # 업로드 폴더 경로 확인
-        upload_paths = [
-            Path(UPLOAD_FOLDER),
-            Path('backend') / UPLOAD_FOLDER,
-            Path('instance') / UPLOAD_FOLDER,
-        ]
-        
-        upload_folder = None
-        for path in upload_paths:
-            if path.exists():
-                upload_folder = path
-                break
-        
-        if not upload_folder:
-            print(f"❌ 업로드 폴더를 찾을 수 없습니다. ({UPLOAD_FOLDER})")
-            return False
-        
-        print(f"📁 업로드 폴더: {upload_folder}")
-        
-        success_count = 0
-        error_count = 0
-        
-        for idx, (recording_id, audio_file) in enumerate(recordings, 1):
-            filepath = upload_folder / audio_file
-            
-            if not filepath.exists():
-                print(f"⚠️  [{idx}/{len(recordings)}] 파일 없음: {audio_file} (ID: {recording_id})")
+    for idx, (recording_id, audio_file) in enumerate(recordings, 1):
+        filepath = upload_folder / audio_file
+        
+        if not filepath.exists():
+            print(f"⚠️  [{idx}/{len(recordings)}] 파일 없음: {audio_file} (ID: {recording_id})")
+            error_count += 1
+            continue
+        
+        try:
+            # 오디오 duration 계산
+            duration = get_audio_duration(str(filepath))
+            if duration is None:
+                print(f"⚠️  [{idx}/{len(recordings)}] duration 계산 실패: {audio_file} (ID: {recording_id})")
                 error_count += 1
                 continue
             
-            try:
-                # 오디오 duration 계산
-                audio = AudioSegment.from_file(str(filepath))
-                duration = len(audio) / 1000.0  # Convert ms to seconds
-                
-                # DB 업데이트
-                cursor.execute("""
-                    UPDATE recordings 
-                    SET duration = ? 
-                    WHERE id = ?
-                """, (duration, recording_id))
-                
-                print(f"✅ [{idx}/{len(recordings)}] ID {recording_id}: {duration:.2f}초 ({audio_file})")
-                success_count += 1
-                
-            except Exception as e:
-                print(f"❌ [{idx}/{len(recordings)}] ID {recording_id} 오류: {str(e)}")
-                error_count += 1
-                continue
-        
-        conn.commit()
-        
-        print(f"\n📊 완료!")
-        print(f"  ✅ 성공: {success_count}개")
-        print(f"  ❌ 실패: {error_count}개")
-        
-        return True
-        
-    except Exception as e:
-        conn.rollback()
-        print(f"❌ 오류: {e}")
-        return False
-    finally:
-        conn.close()
+            # DB 업데이트
+            conn.execute(text("""
+                UPDATE recordings 
+                SET duration = :duration 
+                WHERE id = :id
+            """), {'duration': duration, 'id': recording_id})
+            
+            print(f"✅ [{idx}/{len(recordings)}] ID {recording_id}: {duration:.2f}초 ({audio_file})")
+            success_count += 1
+            
+        except Exception as e:
+            print(f"❌ [{idx}/{len(recordings)}] ID {recording_id} 오류: {str(e)}")
+            error_count += 1
+            continue
+    
+    print(f"\n📊 완료!")
+    print(f"  ✅ 성공: {success_count}개")
+    print(f"  ❌ 실패: {error_count}개")
+    
+    return True
 
 if __name__ == '__main__':
     import sys
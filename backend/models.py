@@ -2,8 +2,10 @@
 데이터베이스 모델 정의
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func, select
 from datetime import datetime, timezone, timedelta
 import enum
+import uuid
 
 db = SQLAlchemy()
 
@@ -23,6 +25,13 @@ class EmotionType(enum.Enum):
     SURPRISE = "놀람"
     EXCITEMENT = "신남"
 
+class ProcessingStatus:
+    """녹음/작업 처리 상태"""
+    PENDING = "pending"        # 처리 대기 중
+    PROCESSING = "processing"  # 워커가 처리 중
+    DONE = "done"              # 처리 완료
+    FAILED = "failed"          # 처리 실패
+
 class User(db.Model):
     """사용자 모델"""
     __tablename__ = 'users'
@@ -34,17 +43,35 @@ class User(db.Model):
     # 관계: 사용자 -> 녹음들 (일대다)
     recordings = db.relationship('Recording', backref='user', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
+    def to_dict(self, recording_count=None):
+        """
+        Args:
+            recording_count: 미리 집계한 녹음 수 (목록 조회 시 집계 서브쿼리 결과 전달)
+                             None이면 COUNT 쿼리로 계산 (녹음 행을 모두 불러오지 않음)
+        """
+        if recording_count is None:
+            recording_count = db.session.scalar(
+                select(func.count(Recording.id)).where(Recording.user_id == self.id)
+            )
         return {
             'id': self.id,
             'name': self.name,
             'created_at': self.created_at.isoformat(),
-            'recording_count': len(self.recordings)
+            'recording_count': recording_count
         }
 
 class Recording(db.Model):
     """녹음 기록 모델"""
     __tablename__ = 'recordings'
+    __table_args__ = (
+        # 피드/페이지네이션: 필터 후 (recorded_at, id) 내림차순 정렬을 인덱스 순서로 처리
+        db.Index('ix_recordings_recorded_at_id', 'recorded_at', 'id'),
+        db.Index('ix_recordings_user_recorded_at', 'user_id', 'recorded_at', 'id'),
+        db.Index('ix_recordings_uploaded_recorded_at', 'is_uploaded', 'recorded_at', 'id'),
+        # 사용자별 감정/동네 목록(최신순 페이지네이션)과 통계 (감정/동네 집계)
+        db.Index('ix_recordings_user_emotion_recorded_at', 'user_id', 'emotion', 'recorded_at', 'id'),
+        db.Index('ix_recordings_user_district_recorded_at', 'user_id', 'district', 'recorded_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -74,10 +101,15 @@ class Recording(db.Model):
     # 오디오 재생 시간 (초 단위)
     duration = db.Column(db.Float, nullable=True)  # 오디오 파일 재생 시간 (초)
     
+    # 처리 상태 (비동기 처리 시 pending -> processing -> done/failed)
+    status = db.Column(db.String(20), nullable=False, default=ProcessingStatus.DONE,
+                       server_default=ProcessingStatus.DONE)
+    
     created_at = db.Column(db.DateTime, default=get_kst_now)
     updated_at = db.Column(db.DateTime, default=get_kst_now, onupdate=get_kst_now)
     
     def to_dict(self):
+        # 목록 조회 시에는 joinedload(Recording.user)로 사용자를 함께 불러와야 행마다 쿼리가 나가지 않음
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -94,7 +126,137 @@ class Recording(db.Model):
             'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
             'district': self.district,
             'duration': self.duration,  # 오디오 재생 시간 (초)
+            'status': self.status,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
 
+class ProcessingJob(db.Model):
+    """녹음 처리 작업 모델 (STT + 분석 비동기 큐)"""
+    __tablename__ = 'processing_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    recording_id = db.Column(db.Integer, db.ForeignKey('recordings.id'), nullable=False)
+    
+    status = db.Column(db.String(20), nullable=False, default=ProcessingStatus.PENDING, index=True)
+    transcript = db.Column(db.Text, nullable=True)  # 프론트엔드에서 인식한 텍스트 (있으면 Whisper 생략)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    
+    # 워커 점유 만료 시간 (워커가 죽으면 만료 후 다른 워커가 다시 가져감)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    
+    created_at = db.Column(db.DateTime, default=get_kst_now)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    # 관계: 녹음 -> 작업들 (녹음 삭제 시 작업도 삭제)
+    recording = db.relationship('Recording', backref=db.backref('jobs', lazy=True, cascade='all, delete-orphan'))
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'recording_id': self.recording_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class RecordingLike(db.Model):
+    """사용자별 좋아요 기록 (같은 사용자가 여러 번 눌러도 한 번만 반영)"""
+    __tablename__ = 'recording_likes'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    recording_id = db.Column(db.Integer, db.ForeignKey('recordings.id'), primary_key=True)
+    created_at = db.Column(db.DateTime, default=get_kst_now)
+    
+    # 관계: 녹음 -> 좋아요 기록들 (녹음 삭제 시 함께 삭제)
+    recording = db.relationship('Recording', backref=db.backref('like_records', lazy=True, cascade='all, delete-orphan'))
+
+
+def dialect_insert(table, dialect_name=None):
+    """
+    DB 종류에 맞는 INSERT 구문 (ON CONFLICT 지원)
+
+    Args:
+        dialect_name: 'sqlite' / 'postgresql' (None이면 앱 엔진 기준, 앱 밖에서는 conn.dialect.name 전달)
+    """
+    if (dialect_name or db.engine.dialect.name) == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+
+# ==================== 키워드 색인 ====================
+# 녹음의 keywords 문자열을 키워드 행 + 녹음-키워드 연결 행으로 나눠 저장 (keyword_index.py가 관리)
+# 키워드별 녹음 조회와 자주 나온 키워드 순위를 문자열 검색 없이 인덱스로 처리
+
+class Keyword(db.Model):
+    """키워드 (이름별 한 행, 연결된 녹음 수를 함께 관리)"""
+    __tablename__ = 'keywords'
+    __table_args__ = (
+        # 자주 나온 키워드 순위 (녹음 수 내림차순을 인덱스 순서로)
+        db.Index('ix_keywords_recording_count', 'recording_count', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+    recording_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'recording_count': self.recording_count
+        }
+
+class RecordingKeyword(db.Model):
+    """녹음 x 키워드 연결"""
+    __tablename__ = 'recording_keywords'
+    __table_args__ = (
+        # 키워드 -> 녹음 목록 (역색인)
+        db.Index('ix_recording_keywords_keyword_recording', 'keyword_id', 'recording_id'),
+    )
+    
+    recording_id = db.Column(db.Integer, db.ForeignKey('recordings.id'), primary_key=True)
+    keyword_id = db.Column(db.Integer, db.ForeignKey('keywords.id'), primary_key=True)
+    
+    # 관계: 녹음 -> 키워드 연결들 (녹음 삭제 시 함께 삭제)
+    recording = db.relationship('Recording', backref=db.backref('keyword_links', lazy=True, cascade='all, delete-orphan'))
+
+
+# ==================== 사용자별 집계 (롤업) 테이블 ====================
+# 녹음이 생성/수정/삭제될 때 같은 트랜잭션에서 rollups.py가 개수를 증감
+# 아카이브 조회는 녹음 전체가 아니라 이 테이블의 구간 행만 읽음
+
+class UserMonthEmotionStat(db.Model):
+    """사용자 x 월 x 감정별 녹음 수/재생 시간"""
+    __tablename__ = 'user_month_emotion_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    month = db.Column(db.String(7), primary_key=True)  # 'YYYY-MM'
+    emotion = db.Column(db.Enum(EmotionType), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    duration = db.Column(db.Float, nullable=False, default=0)  # 재생 시간 합계 (초)
+
+class UserMonthDistrictStat(db.Model):
+    """사용자 x 월 x 동네별 녹음 수"""
+    __tablename__ = 'user_month_district_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    month = db.Column(db.String(7), primary_key=True)
+    district = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class UserMonthKeywordStat(db.Model):
+    """사용자 x 월 x 키워드별 녹음 수"""
+    __tablename__ = 'user_month_keyword_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    month = db.Column(db.String(7), primary_key=True)
+    keyword = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
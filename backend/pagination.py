@@ -0,0 +1,161 @@
+"""
+커서(keyset) 페이지네이션
+- 정렬 키 (recorded_at, id) 내림차순
+- 커서는 마지막 항목의 정렬 키를 base64로 감싼 불투명 문자열
+- OFFSET 없이 "마지막 항목보다 이전" 조건으로 조회하므로 기록이 많아도 페이지 조회 비용이 일정
+- 검색 관련도순은 (점수 오름차순, id 내림차순) 키로 같은 방식 (paginate_by_score)
+- 색인(FTS, 키워드 연결)에서 id 역순으로 읽는 조회는 같은 커서 형식으로 id만 비교 (paginate_by_id)
+"""
+import base64
+import json
+import os
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', '50'))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '100'))  # 클라이언트가 더 크게 요청해도 이 값으로 제한
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없는 커서"""
+
+
+def clamp_page_size(limit):
+    """요청한 개수를 1 ~ MAX_PAGE_SIZE 범위로 제한"""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _decode(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+
+
+def encode_cursor(recorded_at, item_id):
+    """정렬 키 -> 커서 문자열"""
+    payload = json.dumps([recorded_at.isoformat(), item_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    커서 문자열 -> (recorded_at, id)
+
+    Raises:
+        InvalidCursorError: 형식이 잘못된 커서
+    """
+    try:
+        recorded_at, item_id = _decode(cursor)
+        return datetime.fromisoformat(recorded_at), int(item_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursorError('잘못된 커서입니다.')
+
+
+def encode_score_cursor(score, item_id, context=None):
+    """(점수, id, 부가 정보) -> 커서 문자열 (float는 JSON에서 그대로 복원됨)"""
+    payload = json.dumps([score, item_id, context], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_score_cursor(cursor):
+    """
+    커서 문자열 -> (점수, id, 부가 정보)
+
+    Raises:
+        InvalidCursorError: 형식이 잘못된 커서 (최신순 커서 포함)
+    """
+    try:
+        score, item_id, context = _decode(cursor)
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise ValueError(score)
+        return float(score), int(item_id), context
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursorError('잘못된 커서입니다.')
+
+
+def paginate_recordings(query, model, limit, cursor=None):
+    """
+    (recorded_at, id) 내림차순 한 페이지 조회
+
+    Args:
+        query: 필터가 적용된 Recording 쿼리
+        model: Recording 모델 (정렬 컬럼 참조용)
+        limit: 페이지 크기 (clamp_page_size 적용 후 값)
+        cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+    Returns:
+        (items, next_cursor): 다음 페이지가 없으면 next_cursor는 None
+    """
+    if cursor:
+        recorded_at, item_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.recorded_at < recorded_at,
+            and_(model.recorded_at == recorded_at, model.id < item_id)
+        ))
+
+    # 한 개 더 조회해서 다음 페이지 존재 여부 판단
+    items = query.order_by(model.recorded_at.desc(), model.id.desc()).limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(last.recorded_at, last.id)
+
+
+def paginate_by_id(query, id_column, limit, cursor=None):
+    """
+    id 내림차순 한 페이지 조회 (커서는 paginate_recordings와 같은 형식)
+    녹음 id는 저장 순서대로 매겨지고 recorded_at은 저장 시각이므로 (recorded_at, id) 내림차순과 같은 순서
+    - 일치 항목이 많을 때 녹음 전체의 최신순 인덱스 대신 색인 자체의 id 순서를 따라 limit개만 읽음
+
+    Args:
+        query: 색인과 조인하고 필터를 적용한 Recording 쿼리
+        id_column: 정렬할 색인 쪽 id 컬럼 (예: FTS rowid, recording_keywords.recording_id)
+        limit: 페이지 크기
+        cursor: 이전 페이지의 next_cursor
+    Returns:
+        (items, next_cursor): 다음 페이지가 없으면 next_cursor는 None
+    """
+    if cursor:
+        query = query.filter(id_column < decode_cursor(cursor)[1])
+
+    items = query.order_by(id_column.desc()).limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(last.recorded_at, last.id)
+
+
+def paginate_by_score(session, stmt, score, item_id, limit, cursor=None, context=None):
+    """
+    (점수 오름차순, id 내림차순) 한 페이지 조회 - 점수가 낮을수록 앞 (FTS5 bm25)
+
+    Args:
+        session: DB 세션
+        stmt: 필터가 적용된 id 조회 select
+        score: 정렬 점수 SQL 식
+        item_id: id 컬럼
+        limit: 페이지 크기
+        cursor: 이전 페이지의 next_cursor
+        context: 다음 페이지 커서에 함께 담을 값 (JSON으로 바꿀 수 있는 값, 예: 검색 순위 범위)
+    Returns:
+        (rows, next_cursor): rows는 (id, 점수) 목록
+    """
+    if cursor:
+        last_score, last_id, _ = decode_score_cursor(cursor)
+        stmt = stmt.where(or_(
+            score > last_score,
+            and_(score == last_score, item_id < last_id)
+        ))
+
+    rows = session.execute(
+        stmt.add_columns(score).order_by(score, item_id.desc()).limit(limit + 1)
+    ).all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_score_cursor(last[1], last[0], context)
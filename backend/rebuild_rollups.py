@@ -0,0 +1,39 @@
+"""
+사용자별 집계(롤업) 테이블을 녹음 테이블에서 다시 계산하는 스크립트
+롤업 테이블이 추가되기 전의 기록을 채우거나, 집계가 어긋났을 때 사용합니다.
+사용자를 지정하지 않으면 키워드 색인(keywords/recording_keywords)도 함께 다시 만듭니다.
+사용법: python rebuild_rollups.py [사용자이름]
+"""
+import sys
+from app import app, db
+from models import User
+import rollups
+import keyword_index
+
+def rebuild_rollups(user_name=None):
+    """롤업 재계산"""
+    with app.app_context():
+        user_id = None
+        if user_name:
+            user = User.query.filter_by(name=user_name).first()
+            if not user:
+                print(f"사용자 '{user_name}'를 찾을 수 없습니다.")
+                return
+            user_id = user.id
+
+        try:
+            count = rollups.rebuild(user_id)
+            if user_id is None:
+                keyword_index.rebuild(db.session.connection())
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"[오류] {str(e)}")
+            return
+
+        target = f"사용자 '{user_name}'" if user_name else "모든 사용자"
+        print(f"{target}의 기록 {count}개로 집계 테이블을 다시 계산했습니다.")
+
+if __name__ == '__main__':
+    user_name = sys.argv[1] if len(sys.argv) > 1 else None
+    rebuild_rollups(user_name)
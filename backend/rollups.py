@@ -0,0 +1,205 @@
+"""
+사용자별 집계(롤업) 테이블 관리
+- 사용자 x 월 x 감정 / 동네 / 키워드별 녹음 수를 미리 세어 둠
+- 녹음이 생성/수정/삭제될 때 호출한 쪽의 트랜잭션 안에서 개수를 증감 (커밋/롤백을 함께 따름)
+- 아카이브 조회 비용이 녹음 수가 아니라 구간(월/동네/키워드) 수에 비례
+
+사용 예:
+    add_recording(recording)                 # 새 녹음 (user_id, recorded_at 설정 후)
+    before = snapshot(recording)             # 수정 전 상태
+    ... recording 수정 ...
+    update_recording(before, recording)      # 바뀐 부분만 반영
+    remove_recording(recording)              # 삭제 전
+    ensure_rollups(conn)                     # 앱 시작/마이그레이션 시 (비어 있으면 기존 녹음으로 채움)
+"""
+from collections import Counter, namedtuple
+
+from sqlalchemy import delete, select
+
+from models import (
+    db, Recording, UserMonthEmotionStat, UserMonthDistrictStat, UserMonthKeywordStat, dialect_insert
+)
+
+KEYWORD_MAX_LENGTH = 100  # UserMonthKeywordStat.keyword 길이
+ROLLUP_MODELS = (UserMonthEmotionStat, UserMonthDistrictStat, UserMonthKeywordStat)
+
+# 집계에 영향을 주는 녹음 필드만 모은 값 (같으면 롤업 변경 없음)
+RecordingSnapshot = namedtuple('RecordingSnapshot', 'user_id month emotion district keywords duration')
+
+
+def month_of(recorded_at):
+    """녹음 시각 -> 'YYYY-MM'"""
+    return recorded_at.strftime('%Y-%m')
+
+
+def split_keywords(keywords):
+    """쉼표로 구분된 키워드 문자열 -> 중복 없는 키워드 튜플"""
+    if not keywords:
+        return ()
+    result = []
+    for keyword in keywords.split(','):
+        keyword = keyword.strip()[:KEYWORD_MAX_LENGTH]
+        if keyword and keyword not in result:
+            result.append(keyword)
+    return tuple(result)
+
+
+def snapshot(recording):
+    """녹음의 집계 관련 필드 (recorded_at이 없으면 None)"""
+    if recording.user_id is None or recording.recorded_at is None or recording.emotion is None:
+        return None
+    return RecordingSnapshot(
+        user_id=recording.user_id,
+        month=month_of(recording.recorded_at),
+        emotion=recording.emotion,
+        district=recording.district or None,
+        keywords=split_keywords(recording.keywords),
+        duration=recording.duration or 0.0
+    )
+
+
+def _upsert(model, keys, deltas):
+    """키가 같은 행이 있으면 값을 더하고, 없으면 새로 추가"""
+    table = model.__table__
+    stmt = dialect_insert(table).values(**keys, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: table.c[name] + stmt.excluded[name] for name in deltas}
+    )
+    db.session.execute(stmt)
+
+
+def _apply(snap, sign):
+    """스냅샷 하나를 롤업에 더하거나(sign=1) 뺌(sign=-1)"""
+    if snap is None:
+        return
+    _upsert(
+        UserMonthEmotionStat,
+        {'user_id': snap.user_id, 'month': snap.month, 'emotion': snap.emotion.name},
+        {'count': sign, 'duration': sign * snap.duration}
+    )
+    if snap.district:
+        _upsert(
+            UserMonthDistrictStat,
+            {'user_id': snap.user_id, 'month': snap.month, 'district': snap.district},
+            {'count': sign}
+        )
+    for keyword in snap.keywords:
+        _upsert(
+            UserMonthKeywordStat,
+            {'user_id': snap.user_id, 'month': snap.month, 'keyword': keyword},
+            {'count': sign}
+        )
+    if sign < 0:
+        _prune(snap.user_id, snap.month)
+
+
+def _prune(user_id, month):
+    """개수가 0 이하가 된 구간 삭제"""
+    for model in ROLLUP_MODELS:
+        db.session.execute(
+            delete(model).where(model.user_id == user_id, model.month == month, model.count <= 0)
+        )
+
+
+def add_recording(recording):
+    """새 녹음 반영"""
+    _apply(snapshot(recording), 1)
+
+
+def remove_recording(recording):
+    """삭제할 녹음 반영 (삭제 전에 호출)"""
+    _apply(snapshot(recording), -1)
+
+
+def update_recording(before, recording):
+    """
+    수정된 녹음 반영
+
+    Args:
+        before: 수정 전 snapshot(recording)
+        recording: 수정된 녹음
+    """
+    after = snapshot(recording)
+    if before == after:
+        return
+    _apply(before, -1)
+    _apply(after, 1)
+
+
+def rebuild(user_id=None, conn=None):
+    """
+    녹음 테이블에서 롤업을 다시 계산 (기존 데이터 백필/불일치 복구용)
+    호출한 쪽에서 커밋
+
+    Args:
+        user_id: 특정 사용자만 (None이면 전체)
+        conn: Connection (앱 밖에서 호출할 때, 기본은 db.session)
+    Returns:
+        int: 반영한 녹음 수
+    """
+    conn = db.session if conn is None else conn
+    for model in ROLLUP_MODELS:
+        stmt = delete(model)
+        if user_id is not None:
+            stmt = stmt.where(model.user_id == user_id)
+        conn.execute(stmt)
+
+    emotions = Counter()
+    durations = Counter()
+    districts = Counter()
+    keywords = Counter()
+    count = 0
+
+    query = select(
+        Recording.user_id, Recording.recorded_at, Recording.emotion,
+        Recording.district, Recording.keywords, Recording.duration
+    )
+    if user_id is not None:
+        query = query.where(Recording.user_id == user_id)
+
+    for row in conn.execute(query.execution_options(yield_per=1000)):
+        snap = snapshot(row)
+        if snap is None:
+            continue
+        count += 1
+        emotion_key = (snap.user_id, snap.month, snap.emotion.name)
+        emotions[emotion_key] += 1
+        durations[emotion_key] += snap.duration
+        if snap.district:
+            districts[(snap.user_id, snap.month, snap.district)] += 1
+        for keyword in snap.keywords:
+            keywords[(snap.user_id, snap.month, keyword)] += 1
+
+    if emotions:
+        conn.execute(UserMonthEmotionStat.__table__.insert(), [
+            {'user_id': u, 'month': m, 'emotion': e, 'count': n, 'duration': durations[(u, m, e)]}
+            for (u, m, e), n in emotions.items()
+        ])
+    if districts:
+        conn.execute(UserMonthDistrictStat.__table__.insert(), [
+            {'user_id': u, 'month': m, 'district': d, 'count': n}
+            for (u, m, d), n in districts.items()
+        ])
+    if keywords:
+        conn.execute(UserMonthKeywordStat.__table__.insert(), [
+            {'user_id': u, 'month': m, 'keyword': k, 'count': n}
+            for (u, m, k), n in keywords.items()
+        ])
+    return count
+
+
+def ensure_rollups(conn):
+    """
+    롤업 준비 (테이블이 없으면 만들고, 롤업이 비어 있는데 녹음이 있으면 기존 녹음으로 채움)
+    녹음이 있으면 감정 롤업 행도 반드시 있으므로 감정 롤업이 비어 있으면 백필이 필요한 상태
+    호출한 쪽의 트랜잭션 안에서 실행 (engine.begin())
+    """
+    for model in ROLLUP_MODELS:
+        model.__table__.create(conn, checkfirst=True)
+
+    if conn.execute(select(UserMonthEmotionStat.user_id).limit(1)).first() is not None:
+        return
+    if conn.execute(select(Recording.id).limit(1)).first() is not None:
+        count = rebuild(conn=conn)
+        print(f"[롤업] 기존 녹음 {count}개로 사용자별 집계 생성 완료")
@@ -0,0 +1,398 @@
+"""
+녹음 검색 (내용 + 키워드)
+- SQLite: FTS5 가상 테이블 두 개
+  recordings_fts: trigram 토크나이저 - 3글자 이상 검색어
+    recordings를 외부 콘텐츠로 쓰고 트리거로 같은 트랜잭션에서 동기화 (내장 토크나이저만 사용 - 어떤 연결로 써도 됨)
+    한국어는 조사가 붙거나 띄어쓰기가 달라도 부분 문자열로 찾을 수 있도록 3글자 단위로 색인
+  recordings_grams: 1글자/2글자 조각 토큰 (search_grams) - 3글자 미만 검색어 (친구, 회사, 비 등)
+    trigram으로는 찾을 수 없는 짧은 단어도 LIKE로 전체를 훑지 않고 색인으로 찾음
+    토큰은 파이썬에서 만들므로 트리거 없이 녹음을 추가/수정/삭제하는 쪽에서 갱신 (keyword_index.py와 같은 방식)
+    앱을 거치지 않고 추가된 녹음은 앱 시작/마이그레이션 때 색인, 찾은 녹음은 LIKE로 다시 확인
+    (앱 밖에서 수정/삭제된 녹음이 잘못 나오지 않음)
+- 관련도순(bm25, 키워드 일치에 가중치) 또는 최신순
+  짧은 검색어만 있으면 최신순 (1~2글자 조각의 bm25는 관련도 구분이 거의 없음)
+  최신순은 색인의 일치 항목을 id 역순으로 읽으며 녹음과 연결 (limit개를 찾으면 멈춤)
+  흔한 단어의 관련도순은 가장 최근 SEARCH_RANK_WINDOW개 일치 항목 안에서만 순위를 매김
+  (더 오래된 일치 항목은 관련도순 결과에 나오지 않음 - 응답의 truncated로 알리고, 전체는 최신순으로 조회)
+- 3글자 이상 검색어와 짧은 검색어가 함께 있으면 trigram 색인으로 찾은 녹음 안에서 짧은 검색어는 LIKE로 확인
+- PostgreSQL: ILIKE (pg_trgm 확장을 쓸 수 있으면 GIN 인덱스 생성), 최신순
+
+사용 예:
+    ensure_search_index(conn)       # 앱 시작/마이그레이션 시 (없으면 만들고 기존 녹음 색인)
+    index_recording(recording)      # 녹음 추가/수정 후 조각 색인 (id가 없으면 flush)
+    unindex_recording(recording)    # 삭제 전
+    recordings, next_cursor, sort, truncated = search_recordings('고양이 산책', limit=20, user_id=1)
+"""
+import os
+import string
+
+from sqlalchemy import Integer, String, bindparam, column, func, inspect, literal_column, or_, select, table, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import joinedload
+
+from models import db, Recording
+from pagination import (InvalidCursorError, decode_score_cursor, paginate_by_id, paginate_by_score,
+                        paginate_recordings)
+
+SEARCH_TABLE = 'recordings_fts'
+GRAMS_TABLE = 'recordings_grams'
+MIN_TERM_LENGTH = 3  # trigram 색인으로 찾을 수 있는 최소 글자 수
+BATCH_SIZE = 5000  # 조각 색인을 다시 만들 때 한 번에 INSERT할 행 수
+MAX_QUERY_LENGTH = 100
+MAX_TERMS = 8
+KEYWORD_WEIGHT = 2.0  # bm25 열 가중치 (content 1.0 대비)
+SORTS = ('relevance', 'recent')
+
+# 관련도순으로 순위를 매기는 최근 일치 항목 수 (흔한 단어도 bm25 계산량이 일정)
+# 일치 항목이 더 많으면 이보다 오래된 항목은 관련도순 결과에서 빠짐 (최신순으로는 모두 조회)
+RANK_WINDOW = int(os.getenv('SEARCH_RANK_WINDOW', '1000'))
+
+# SQLite: 외부 콘텐츠 FTS5 테이블 + 동기화 트리거
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        content, keywords, content='recordings', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS recordings_fts_ai AFTER INSERT ON recordings BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, content, keywords) VALUES (new.id, new.content, new.keywords);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS recordings_fts_ad AFTER DELETE ON recordings BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, content, keywords)
+        VALUES ('delete', old.id, old.content, old.keywords);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS recordings_fts_au AFTER UPDATE OF content, keywords ON recordings BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, content, keywords)
+        VALUES ('delete', old.id, old.content, old.keywords);
+        INSERT INTO {SEARCH_TABLE}(rowid, content, keywords) VALUES (new.id, new.content, new.keywords);
+    END""",
+    # 짧은 검색어용 조각 색인 (토큰을 저장하는 FTS5 테이블 - 녹음 id로 바로 삭제, 트리거 없음)
+    # 토큰 포함 여부만 확인하므로 위치 정보는 저장하지 않음 (detail=none)
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {GRAMS_TABLE} USING fts5(content, keywords, detail='none')""",
+]
+SQLITE_OBJECTS = {SEARCH_TABLE, 'recordings_fts_ai', 'recordings_fts_ad', 'recordings_fts_au', GRAMS_TABLE}
+# 이전 버전의 조각 색인 트리거 (SQL 함수 search_grams가 등록된 연결에서만 녹음을 쓸 수 있었음 - 지움)
+LEGACY_SQLITE_TRIGGERS = {'recordings_grams_ai', 'recordings_grams_ad', 'recordings_grams_au'}
+
+# PostgreSQL: ILIKE '%검색어%'를 인덱스로 처리 (pg_trgm)
+POSTGRES_DDL = [
+    'CREATE INDEX IF NOT EXISTS ix_recordings_content_trgm ON recordings USING gin (content gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_recordings_keywords_trgm ON recordings USING gin (keywords gin_trgm_ops)',
+]
+
+fts = table(SEARCH_TABLE, column('rowid', Integer))
+grams = table(GRAMS_TABLE, column('rowid', Integer), column('content', String), column('keywords', String))
+
+# SQLite LIKE와 같게 영문 대소문자만 구분하지 않음
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# 엔진별 FTS 사용 가능 여부 (ensure_search_index 또는 첫 검색 때 확인)
+_fts_ready = {}
+
+
+class SearchQueryError(ValueError):
+    """잘못된 검색 조건 (message는 그대로 클라이언트에 전달)"""
+
+
+def parse_terms(q):
+    """
+    검색어 -> 공백으로 나눈 중복 없는 단어 목록 (모든 단어를 포함하는 녹음을 찾음)
+
+    Raises:
+        SearchQueryError: 검색어가 없거나 너무 긴 경우
+    """
+    q = (q or '').strip()
+    if not q:
+        raise SearchQueryError('검색어(q)를 입력하세요.')
+    if len(q) > MAX_QUERY_LENGTH:
+        raise SearchQueryError(f'검색어는 {MAX_QUERY_LENGTH}자 이하로 입력하세요.')
+    terms = []
+    for term in q.split():
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def fts_phrase(term):
+    """단어 -> FTS5 구문 문자열 (따옴표로 감싸 연산자/특수문자를 글자 그대로 검색)"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def gram_token(gram):
+    """1~2글자 조각 -> 색인 토큰 (글자마다 코드 포인트 16진수 6자리 - 토크나이저가 나누지 않는 영문/숫자)"""
+    return 'g' + ''.join(f'{ord(char):06x}' for char in gram.translate(_ASCII_LOWER))
+
+
+def search_grams(value):
+    """
+    텍스트 -> 짧은 검색어 색인용 토큰 문자열
+    공백이 아닌 글자 하나하나와 이어진 두 글자를 토큰으로 만듦 (1~2글자 검색어가 부분 문자열이면 반드시 포함)
+    """
+    if not value:
+        return ''
+    text_value = value.translate(_ASCII_LOWER)
+    tokens = []
+    for i, char in enumerate(text_value):
+        if char.isspace():
+            continue
+        tokens.append(gram_token(char))
+        following = text_value[i + 1:i + 2]
+        if following and not following.isspace():
+            tokens.append(gram_token(char + following))
+    return ' '.join(tokens)
+
+
+# ==================== 색인 관리 ====================
+
+def ensure_search_index(conn):
+    """
+    검색 색인 준비 (없는 객체만 만들고, 새로 만든 경우 기존 녹음 전체 색인)
+    이미 있으면 조각 색인에 빠진 최근 녹음만 추가 (앱을 거치지 않고 추가된 녹음)
+    호출한 쪽의 트랜잭션 안에서 실행 (engine.begin())
+
+    Returns:
+        bool: FTS 사용 가능 여부 (SQLite에 FTS5/trigram이 없으면 False - LIKE 검색)
+    """
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        existing = set(conn.execute(
+            text('SELECT name FROM sqlite_master WHERE name IN :names')
+            .bindparams(bindparam('names', expanding=True)),
+            {'names': sorted(SQLITE_OBJECTS | LEGACY_SQLITE_TRIGGERS)}
+        ).scalars())
+        legacy = existing & LEGACY_SQLITE_TRIGGERS
+        if legacy:
+            # 이전 버전 조각 색인 (내용 없는 테이블 + search_grams 트리거) - 지우고 새 형식으로 다시 만듦
+            for name in sorted(legacy):
+                conn.execute(text(f'DROP TRIGGER IF EXISTS {name}'))
+            conn.execute(text(f'DROP TABLE IF EXISTS {GRAMS_TABLE}'))
+            existing -= legacy | {GRAMS_TABLE}
+        if existing == SQLITE_OBJECTS:
+            index_missing_grams(conn)
+            ready = True
+        else:
+            try:
+                with conn.begin_nested():
+                    for ddl in SQLITE_DDL:
+                        conn.execute(text(ddl))
+                    # 트리거가 없던 동안 바뀐 녹음이 있을 수 있으므로 처음부터 다시 색인
+                    rebuild_search_index(conn)
+                print(f"[검색] {SEARCH_TABLE}, {GRAMS_TABLE} 색인 생성 완료")
+                ready = True
+            except DBAPIError as e:
+                print(f"[검색] FTS5 trigram을 사용할 수 없어 LIKE로 검색합니다: {str(e).splitlines()[0]}")
+                ready = False
+    elif dialect == 'postgresql':
+        try:
+            with conn.begin_nested():
+                conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+                for ddl in POSTGRES_DDL:
+                    conn.execute(text(ddl))
+        except DBAPIError as e:
+            print(f"[검색] pg_trgm 확장을 사용할 수 없어 인덱스 없이 ILIKE로 검색합니다: {str(e).splitlines()[0]}")
+        ready = False
+    else:
+        ready = False
+
+    _fts_ready[conn.engine.url] = ready
+    return ready
+
+
+def rebuild_search_index(conn):
+    """recordings 내용으로 FTS 색인 다시 만들기 (SQLite)"""
+    conn.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+    conn.execute(grams.delete())
+    index_missing_grams(conn)
+
+
+def index_missing_grams(conn):
+    """
+    조각 색인에 없는 최근 녹음 추가 (색인된 가장 큰 id보다 큰 녹음, BATCH_SIZE개씩)
+
+    Returns:
+        int: 추가한 녹음 수
+    """
+    last_id = conn.execute(select(func.coalesce(func.max(grams.c.rowid), 0))).scalar()
+    added = 0
+    while True:
+        rows = conn.execute(
+            select(Recording.id, Recording.content, Recording.keywords)
+            .where(Recording.id > last_id).order_by(Recording.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(grams.insert(), [_gram_row(*row) for row in rows])
+        last_id = rows[-1][0]
+        added += len(rows)
+    if added:
+        print(f"[검색] {GRAMS_TABLE}에 녹음 {added}개 색인")
+    return added
+
+
+def _gram_row(recording_id, content, keywords):
+    return {'rowid': recording_id, 'content': search_grams(content), 'keywords': search_grams(keywords)}
+
+
+def index_recording(recording):
+    """
+    추가/수정된 녹음의 조각 색인 갱신 (호출한 쪽의 트랜잭션 안에서, 녹음 id가 필요하므로 아직 없으면 flush)
+    FTS를 쓰지 않는 DB(PostgreSQL 등)에서는 아무것도 하지 않음
+    """
+    session = db.session
+    if not fts_available(session):
+        return
+    if recording.id is None:
+        session.flush()
+    session.execute(grams.delete().where(grams.c.rowid == recording.id))
+    session.execute(grams.insert(), [_gram_row(recording.id, recording.content, recording.keywords)])
+
+
+def unindex_recording(recording):
+    """삭제할 녹음을 조각 색인에서 제거 (삭제 전, 같은 트랜잭션)"""
+    session = db.session
+    if recording.id is None or not fts_available(session):
+        return
+    session.execute(grams.delete().where(grams.c.rowid == recording.id))
+
+
+def fts_available(session):
+    """현재 DB에서 FTS 검색을 쓸 수 있는지"""
+    engine = session.get_bind()
+    if engine.url not in _fts_ready:
+        _fts_ready[engine.url] = engine.dialect.name == 'sqlite' and all(
+            inspect(engine).has_table(name) for name in (SEARCH_TABLE, GRAMS_TABLE))
+    return _fts_ready[engine.url]
+
+
+# ==================== 검색 ====================
+
+def contains_term(term, case_insensitive):
+    """내용 또는 키워드에 단어가 포함된 녹음 조건 (%, _는 글자 그대로)"""
+    if case_insensitive:
+        return or_(Recording.content.icontains(term, autoescape=True),
+                   Recording.keywords.icontains(term, autoescape=True))
+    return or_(Recording.content.contains(term, autoescape=True),
+               Recording.keywords.contains(term, autoescape=True))
+
+
+def search_recordings(q, limit, cursor=None, sort='relevance', user_id=None, is_uploaded=None):
+    """
+    검색어가 모두 포함된 녹음 한 페이지
+
+    Args:
+        q: 검색어 (공백으로 구분한 단어를 모두 포함)
+        limit: 페이지 크기 (clamp_page_size 적용 후 값)
+        cursor: 이전 페이지의 next_cursor
+        sort: relevance(관련도순) 또는 recent(최신순)
+        user_id / is_uploaded: 피드와 같은 필터 (선택)
+    Returns:
+        (items, next_cursor, 실제 정렬, truncated)
+        - FTS를 쓸 수 없거나(PostgreSQL 등) 짧은 검색어만 있으면 relevance도 recent로 처리
+        - truncated: 관련도순에서 RANK_WINDOW개보다 오래된 일치 항목을 순위에서 뺐는지 (모든 페이지에서 같음, 최신순은 False)
+    Raises:
+        SearchQueryError: 잘못된 검색어/정렬
+        InvalidCursorError: 잘못된 커서
+    """
+    if sort not in SORTS:
+        raise SearchQueryError(f"sort는 {', '.join(SORTS)} 중 하나여야 합니다.")
+    terms = parse_terms(q)
+
+    session = db.session
+    use_fts = fts_available(session)
+    long_terms = [t for t in terms if len(t) >= MIN_TERM_LENGTH] if use_fts else []
+    short_terms = [t for t in terms if t not in long_terms]
+
+    # 3글자 이상 검색어가 있으면 trigram 색인 (짧은 검색어는 찾은 녹음 안에서 LIKE로 확인),
+    # 짧은 검색어만 있으면 조각 색인 (앱 밖에서 수정된 녹음이 있을 수 있어 찾은 녹음만 LIKE로 다시 확인)
+    if long_terms:
+        index, match_expr = fts, ' '.join(fts_phrase(t) for t in long_terms)
+        like_terms = short_terms
+    elif use_fts:
+        index, match_expr = grams, ' '.join(gram_token(t) for t in short_terms)
+        like_terms = short_terms
+    else:
+        index, match_expr, like_terms = None, None, terms
+
+    filters = []
+    if user_id:
+        filters.append(Recording.user_id == user_id)
+    if is_uploaded is not None:
+        filters.append(Recording.is_uploaded == is_uploaded)
+    # SQLite LIKE는 영문 대소문자를 구분하지 않음 (trigram 색인과 같음), PostgreSQL은 ILIKE
+    case_insensitive = session.get_bind().dialect.name != 'sqlite'
+    conditions = filters + [contains_term(term, case_insensitive) for term in like_terms]
+
+    # 작성자 이름을 같은 쿼리에서 함께 조회 (피드와 같음)
+    query = Recording.query.options(joinedload(Recording.user)).filter(*conditions)
+
+    if index is None:
+        items, next_cursor = paginate_recordings(query, Recording, limit, cursor)
+        return items, next_cursor, 'recent', False
+
+    # 최신순 (짧은 검색어만 있으면 관련도순도 최신순)
+    if sort == 'recent' or index is grams:
+        # 색인의 일치 항목을 id 역순으로 읽으며 녹음과 연결하고 필터 확인 (limit개를 찾으면 멈춤)
+        # 흔한 단어도 일치 항목 전체를 모으거나 녹음 전체의 최신순 인덱스를 훑지 않음
+        query = query.join(index, index.c.rowid == Recording.id).filter(fts_match(index, match_expr))
+        items, next_cursor = paginate_by_id(query, index.c.rowid, limit, cursor)
+        return items, next_cursor, 'recent', False
+
+    # 관련도순: 일치 항목이 RANK_WINDOW개보다 많으면 가장 최근 RANK_WINDOW개 안에서만 순위를 매김
+    # (bm25 계산 비용이 일치 항목 수에 비례 - 범위보다 오래된 항목은 관련도순 결과에서 빠짐)
+    # 범위는 첫 페이지에서 정해 커서에 담음 (페이지를 넘기는 동안 같은 범위, 빠진 항목이 없으면 None)
+    ranked = select(index.c.rowid).where(fts_match(index, match_expr))
+    if user_id:
+        # 사용자 필터: 사용자의 녹음 id 목록(사용자 인덱스)에 있는 일치 항목만 (녹음 행을 읽지 않음)
+        # rowid + 0: FTS가 id마다 따로 검색하지 않고, 일치 항목을 훑으면서 목록과 비교하도록
+        owned = select(Recording.id).where(*filters)
+        ranked = ranked.where((index.c.rowid + 0).in_(owned))
+        if like_terms:
+            ranked = ranked.join(Recording, Recording.id == index.c.rowid).where(*conditions)
+    elif conditions:
+        ranked = ranked.join(Recording, Recording.id == index.c.rowid).where(*conditions)
+
+    if cursor:
+        window_start = decode_score_cursor(cursor)[2]
+        if window_start is not None and (isinstance(window_start, bool) or not isinstance(window_start, int)):
+            raise InvalidCursorError('잘못된 커서입니다.')
+    else:
+        # 색인 일치 항목이 RANK_WINDOW개보다 많으면 RANK_WINDOW번째로 최근 항목 (아니면 None)
+        # 필터 없이 LIKE로 확인할 짧은 검색어만 있으면 범위는 색인 일치 항목 기준 (LIKE는 범위 안에서만 확인)
+        window_start = rank_window_start(session, select(index.c.rowid).where(fts_match(index, match_expr)),
+                                         index.c.rowid)
+        if window_start is not None and filters:
+            if user_id and session.execute(select(func.count()).select_from(owned.subquery())).scalar() <= RANK_WINDOW:
+                window_start = None  # 사용자의 녹음 수가 범위보다 적음
+            else:
+                # 필터/짧은 검색어를 적용한 일치 항목 기준
+                window_start = rank_window_start(session, ranked, index.c.rowid)
+
+    # 순위는 색인(id, 점수)만으로 매기고, 한 페이지 분량의 녹음만 불러옴
+    # bm25: 낮을수록 관련도가 높음 (새 녹음이 추가되면 점수가 조금 바뀔 수 있음)
+    score = literal_column(f'bm25({index.name}, 1.0, {KEYWORD_WEIGHT})')
+    if window_start is not None:
+        ranked = ranked.where(index.c.rowid >= window_start)
+    rows, next_cursor = paginate_by_score(session, ranked, score, index.c.rowid, limit, cursor, context=window_start)
+
+    ids = [row[0] for row in rows]
+    recordings = {r.id: r for r in Recording.query.options(joinedload(Recording.user)).filter(Recording.id.in_(ids))}
+    return [recordings[i] for i in ids if i in recordings], next_cursor, sort, window_start is not None
+
+
+def fts_match(index, match_expr):
+    return text(f'{index.name} MATCH :match').bindparams(match=match_expr)
+
+
+def rank_window_start(session, stmt, item_id):
+    """
+    관련도순 범위의 시작 id (색인만 읽음)
+
+    Args:
+        stmt: 일치 항목 id 조회 select
+        item_id: id 컬럼
+    Returns:
+        int | None: 일치 항목이 RANK_WINDOW개보다 많으면 RANK_WINDOW번째로 최근(id 역순) 항목의 id,
+                    아니면 None (범위 밖으로 빠지는 항목 없음)
+    """
+    ids = session.execute(
+        stmt.order_by(item_id.desc()).offset(RANK_WINDOW - 1).limit(2)
+    ).scalars().all()
+    return ids[0] if len(ids) == 2 else None
@@ -1,11 +1,20 @@
 """
 외부 서비스 통합 (ChatGPT API)
 """
+import json
 import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, deque
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
-from openai import OpenAI
 from models import EmotionType
+from cache import MemoCache, get_cache, hash_text
+from emotion_classifier import classify_emotion, confident_emotion
+from gpt_client import GPTClient
 
 # .env 파일 로드 (명시적으로 backend 폴더 경로 지정)
 env_path = Path(__file__).parent / '.env'
@@ -13,80 +22,169 @@ load_dotenv(dotenv_path=env_path)
 print(f"[GPT 분석] .env 파일 경로: {env_path}")
 print(f"[GPT 분석] .env 파일 존재: {env_path.exists()}")
 
-# OpenAI 클라이언트 (API 키가 있을 때만 생성)
+# ChatGPT 호출 클라이언트 (API 키가 있을 때만 생성, gpt_client.GPTClient)
 _client = None
 
+# GPT 분석 메모이제이션 설정
+GPT_MEMO_ENABLED = os.getenv('GPT_MEMO_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+GPT_MEMO_MAX_SIZE = int(os.getenv('GPT_MEMO_MAX_SIZE', '2048'))  # 메모리에 보관할 최대 결과 수
+GPT_MEMO_TTL = int(os.getenv('GPT_MEMO_TTL', '86400'))  # 결과 유효 시간 (초)
+GPT_MEMO_PERSIST = os.getenv('GPT_MEMO_PERSIST', 'true').lower() in ('1', 'true', 'yes')  # 재시작 후에도 유지 (캐시 DB)
+
+_analysis_memo = MemoCache(max_size=GPT_MEMO_MAX_SIZE, ttl=GPT_MEMO_TTL)
+
+# 배치 분석 설정 (analyze_texts_with_gpt)
+GPT_BATCH_SIZE = int(os.getenv('GPT_BATCH_SIZE', '20'))  # ChatGPT 요청 하나에 묶는 최대 텍스트 수
+GPT_BATCH_TOKENS_PER_TEXT = int(os.getenv('GPT_BATCH_TOKENS_PER_TEXT', '60'))  # 텍스트당 답변 토큰 (max_tokens 계산용)
+
+# 회로 차단기 설정 (OpenAI 장애 시 호출을 건너뛰고 바로 로컬 분석)
+GPT_CIRCUIT_ENABLED = os.getenv('GPT_CIRCUIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+GPT_CIRCUIT_WINDOW = int(os.getenv('GPT_CIRCUIT_WINDOW', '20'))  # 실패율을 계산할 최근 호출 수
+GPT_CIRCUIT_MIN_CALLS = int(os.getenv('GPT_CIRCUIT_MIN_CALLS', '5'))  # 이만큼 기록이 쌓여야 차단 판단
+GPT_CIRCUIT_FAILURE_RATE = float(os.getenv('GPT_CIRCUIT_FAILURE_RATE', '0.5'))  # 이 비율 이상 실패하면 차단
+GPT_CIRCUIT_SLOW_SECONDS = float(os.getenv('GPT_CIRCUIT_SLOW_SECONDS', '10'))  # 성공해도 이보다 오래 걸리면 실패로 셈
+GPT_CIRCUIT_OPEN_SECONDS = float(os.getenv('GPT_CIRCUIT_OPEN_SECONDS', '30'))  # 차단 유지 시간 (지나면 시험 호출)
+
+
+class CircuitBreaker:
+    """
+    ChatGPT 호출 회로 차단기 (프로세스(워커)별)
+    - closed: 정상 호출, 최근 window개 호출의 성공/실패와 걸린 시간을 기록
+      기록이 min_calls개 이상이고 실패(오류 또는 slow_seconds 이상 걸린 호출) 비율이 failure_rate 이상이면 open
+    - open: open_seconds 동안 호출하지 않음 (분석은 바로 로컬 결과)
+    - half_open: open_seconds가 지나면 시험 호출 하나만 허용, 성공하면 closed(기록 초기화), 실패하면 다시 open
+      (배치 분석은 첫 요청만 시험 호출, 결과 없이 중단된 호출은 release()로 시험 호출 자리 반환)
+    - allow()는 호출 번호(세대)를 돌려주고 record()/release()는 그 번호를 함께 넘김
+      상태가 바뀌거나 시험 호출을 새로 허용할 때마다 번호가 바뀌므로, 이전 세대 호출의 늦은 결과는 무시
+      (예: 중단된 것으로 보고 release한 시험 호출이 나중에 끝나도 다음 시험 호출의 결과를 가로채지 못함)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, enabled=GPT_CIRCUIT_ENABLED, window=GPT_CIRCUIT_WINDOW, min_calls=GPT_CIRCUIT_MIN_CALLS,
+                 failure_rate=GPT_CIRCUIT_FAILURE_RATE, slow_seconds=GPT_CIRCUIT_SLOW_SECONDS,
+                 open_seconds=GPT_CIRCUIT_OPEN_SECONDS, clock=time.monotonic):
+        self.enabled = enabled
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=window)  # (실패 여부, 걸린 시간)
+        self.state = self.CLOSED
+        self._opened_at = None
+        self._probing = False  # half_open에서 시험 호출 진행 중
+        self._generation = 1  # allow()가 돌려주는 호출 번호 (상태 전이/시험 호출마다 증가)
+        self.opened = 0  # open으로 바뀐 횟수
+        self.rejected = 0  # 차단되어 호출하지 않은 횟수
+        self.last_error = None
+
+    def allow(self):
+        """
+        지금 ChatGPT를 호출해도 되는지
+        False면 로컬 분석 사용, 아니면 호출 번호 (결과는 record(번호, ...), 중단은 release(번호)로 알림)
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self.state == self.OPEN:
+                if self._clock() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+                print("[회로 차단기] half_open - 시험 호출을 보냅니다.")
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    return False
+                self._probing = True
+                self._generation += 1  # 이 시험 호출만 half_open 상태를 바꿀 수 있음
+            return self._generation
+
+    def record(self, token, latency, error=None):
+        """
+        호출 결과 기록 (error가 있거나 slow_seconds 이상 걸렸으면 실패)
+        token은 allow()가 돌려준 번호 - 이전 세대 호출의 결과면 무시
+        """
+        if not self.enabled:
+            return
+        failed = error is not None or latency >= self.slow_seconds
+        with self._lock:
+            if token != self._generation:
+                return
+            if error is not None:
+                self.last_error = f'{type(error).__name__}: {error}'
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                self._generation += 1
+                if failed:
+                    self._open(f'시험 호출 실패 ({latency:.2f}초)')
+                else:
+                    self.state = self.CLOSED
+                    self._calls.clear()
+                    print(f"[회로 차단기] closed - 시험 호출 성공 ({latency:.2f}초), ChatGPT 호출을 다시 사용합니다.")
+                return
+            self._calls.append((failed, latency))
+            if self.state == self.CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for call_failed, _ in self._calls if call_failed)
+                if failures / len(self._calls) >= self.failure_rate:
+                    self._open(f'최근 {len(self._calls)}회 중 {failures}회 실패')
+
+    def release(self, token):
+        """
+        결과 없이 끝난 호출 (KeyboardInterrupt 등으로 중단) - 지금의 half_open 시험 호출이었으면 다음 시험 호출 허용
+        (이후 같은 번호로 들어오는 결과는 무시)
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.state == self.HALF_OPEN and token == self._generation:
+                self._probing = False
+                self._generation += 1
+
+    def _open(self, reason):
+        self.state = self.OPEN
+        self._generation += 1  # 열리기 전에 시작한 호출의 결과는 무시
+        self._opened_at = self._clock()
+        self.opened += 1
+        print(f"⚡ [회로 차단기] open - {reason}. {self.open_seconds:g}초 동안 ChatGPT 호출 없이 로컬 분석을 사용합니다.")
+
+    def stats(self):
+        with self._lock:
+            calls = list(self._calls)
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = round(max(0.0, self.open_seconds - (self._clock() - self._opened_at)), 1)
+            return {
+                'enabled': self.enabled,
+                'state': self.state,
+                'recent_calls': len(calls),
+                'failure_rate': round(sum(1 for failed, _ in calls if failed) / len(calls), 3) if calls else 0.0,
+                'avg_latency': round(sum(latency for _, latency in calls) / len(calls), 3) if calls else None,
+                'retry_in': retry_in,  # open일 때 시험 호출까지 남은 시간 (초)
+                'opened': self.opened,
+                'rejected': self.rejected,
+                'last_error': self.last_error
+            }
+
+
+_circuit = CircuitBreaker()
+
 def get_client():
-    """OpenAI 클라이언트 지연 초기화"""
+    """
+    ChatGPT 호출 클라이언트 지연 초기화 (비동기 호출 + 동기 메서드, gpt_client.py)
+    API 키가 없거나 잘못되었으면 None
+    """
     global _client
     if _client is None:
-        # 환경변수 직접 확인
-        api_key = os.getenv('OPENAI_API_KEY')
-        
-        # .env 파일에서 직접 읽기 시도
-        if not api_key:
-            env_path = Path(__file__).parent / '.env'
-            if env_path.exists():
-                print(f"[GPT 분석] .env 파일에서 직접 읽기 시도...")
-                print(f"[GPT 분석] 파일 경로: {env_path.absolute()}")
-                try:
-                    with open(env_path, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                        print(f"[GPT 분석] 파일 줄 수: {len(lines)}")
-                        for i, line in enumerate(lines, 1):
-                            original_line = line
-                            line = line.strip()
-                            print(f"[GPT 분석] 줄 {i}: '{line[:50]}...' (전체 길이: {len(original_line)})")
-                            # 주석이나 빈 줄 건너뛰기
-                            if not line or line.startswith('#'):
-                                continue
-                            # OPENAI_API_KEY=로 시작하는 줄 찾기
-                            if 'OPENAI_API_KEY' in line:
-                                if '=' in line:
-                                    api_key = line.split('=', 1)[1].strip()
-                                    # 따옴표 제거
-                                    if api_key.startswith('"') and api_key.endswith('"'):
-                                        api_key = api_key[1:-1]
-                                    elif api_key.startswith("'") and api_key.endswith("'"):
-                                        api_key = api_key[1:-1]
-                                    # 주석 제거
-                                    if '#' in api_key:
-                                        api_key = api_key.split('#')[0].strip()
-                                    print(f"[GPT 분석] .env 파일에서 API 키 읽기 성공! (길이: {len(api_key)})")
-                                    print(f"[GPT 분석] API 키 앞 10자: {api_key[:10]}...")
-                                    break
-                                else:
-                                    print(f"[GPT 분석] 줄 {i}에 '=' 기호가 없습니다.")
-                except Exception as e:
-                    print(f"[GPT 분석] .env 파일 읽기 오류: {e}")
-                    import traceback
-                    print(traceback.format_exc())
-        
-        # API 키 검증 및 정리
-        if api_key:
-            # API 키 정리 (앞뒤 공백 제거)
-            api_key = api_key.strip()
-            
-            # 잘못된 형식 검증
-            if api_key.startswith('OPENAI_API_KEY') or api_key.startswith('OPENAI_A'):
-                print(f"⚠️ [GPT 분석] 잘못된 API 키 형식 감지: '{api_key[:50]}...'")
-                print(f"⚠️ [GPT 분석] .env 파일에 'OPENAI_API_KEY=OPENAI_API_KEY=...' 형식으로 저장되어 있을 수 있습니다.")
-                print(f"⚠️ [GPT 분석] .env 파일 형식: OPENAI_API_KEY=sk-... (키만 입력)")
-                api_key = None
-            elif not api_key.startswith('sk-'):
-                print(f"⚠️ [GPT 분석] API 키가 'sk-'로 시작하지 않습니다: '{api_key[:10]}...'")
-                print(f"⚠️ [GPT 분석] 올바른 OpenAI API 키는 'sk-'로 시작해야 합니다.")
-                api_key = None
-            elif len(api_key) < 40 or len(api_key) > 200:
-                # 새로운 OpenAI API 키 형식(sk-proj-...)은 더 길 수 있음 (최대 200자)
-                print(f"⚠️ [GPT 분석] API 키 길이가 비정상입니다: {len(api_key)}자 (정상: 40-200자)")
-                print(f"⚠️ [GPT 분석] API 키 앞 10자: '{api_key[:10]}...'")
-                api_key = None
-        
+        api_key = _load_api_key()
         print(f"[GPT 분석] API 키 확인 중... (키 존재: {bool(api_key)}, 길이: {len(api_key) if api_key else 0})")
         if api_key:
             try:
-                _client = OpenAI(api_key=api_key)
+                _client = GPTClient(api_key)
                 print("[GPT 분석] OpenAI 클라이언트 생성 완료!")
             except Exception as e:
                 print(f"⚠️ [GPT 분석] OpenAI 클라이언트 생성 실패: {e}")
@@ -96,56 +194,201 @@ def get_client():
             _client = None
     return _client
 
+def _load_api_key():
+    """OPENAI_API_KEY 환경변수 또는 .env 파일에서 API 키 읽기 (형식이 잘못되었으면 None)"""
+    # 환경변수 직접 확인
+    api_key = os.getenv('OPENAI_API_KEY')
+    
+    # .env 파일에서 직접 읽기 시도
+    if not api_key:
+        env_path = Path(__file__).parent / '.env'
+        if env_path.exists():
+            print(f"[GPT 분석] .env 파일에서 직접 읽기 시도...")
+            print(f"[GPT 분석] 파일 경로: {env_path.absolute()}")
+            try:
+                with open(env_path, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+                    print(f"[GPT 분석] 파일 줄 수: {len(lines)}")
+                    for i, line in enumerate(lines, 1):
+                        original_line = line
+                        line = line.strip()
+                        print(f"[GPT 분석] 줄 {i}: '{line[:50]}...' (전체 길이: {len(original_line)})")
+                        # 주석이나 빈 줄 건너뛰기
+                        if not line or line.startswith('#'):
+                            continue
+                        # OPENAI_API_KEY=로 시작하는 줄 찾기
+                        if 'OPENAI_API_KEY' in line:
+                            if '=' in line:
+                                api_key = line.split('=', 1)[1].strip()
+                                # 따옴표 제거
+                                if api_key.startswith('"') and api_key.endswith('"'):
+                                    api_key = api_key[1:-1]
+                                elif api_key.startswith("'") and api_key.endswith("'"):
+                                    api_key = api_key[1:-1]
+                                # 주석 제거
+                                if '#' in api_key:
+                                    api_key = api_key.split('#')[0].strip()
+                                print(f"[GPT 분석] .env 파일에서 API 키 읽기 성공! (길이: {len(api_key)})")
+                                print(f"[GPT 분석] API 키 앞 10자: {api_key[:10]}...")
+                                break
+                            else:
+                                print(f"[GPT 분석] 줄 {i}에 '=' 기호가 없습니다.")
+            except Exception as e:
+                print(f"[GPT 분석] .env 파일 읽기 오류: {e}")
+                import traceback
+                print(traceback.format_exc())
+    
+    # API 키 검증 및 정리
+    if api_key:
+        # API 키 정리 (앞뒤 공백 제거)
+        api_key = api_key.strip()
+        
+        # 잘못된 형식 검증
+        if api_key.startswith('OPENAI_API_KEY') or api_key.startswith('OPENAI_A'):
+            print(f"⚠️ [GPT 분석] 잘못된 API 키 형식 감지: '{api_key[:50]}...'")
+            print(f"⚠️ [GPT 분석] .env 파일에 'OPENAI_API_KEY=OPENAI_API_KEY=...' 형식으로 저장되어 있을 수 있습니다.")
+            print(f"⚠️ [GPT 분석] .env 파일 형식: OPENAI_API_KEY=sk-... (키만 입력)")
+            api_key = None
+        elif not api_key.startswith('sk-'):
+            print(f"⚠️ [GPT 분석] API 키가 'sk-'로 시작하지 않습니다: '{api_key[:10]}...'")
+            print(f"⚠️ [GPT 분석] 올바른 OpenAI API 키는 'sk-'로 시작해야 합니다.")
+            api_key = None
+        elif len(api_key) < 40 or len(api_key) > 200:
+            # 새로운 OpenAI API 키 형식(sk-proj-...)은 더 길 수 있음 (최대 200자)
+            print(f"⚠️ [GPT 분석] API 키 길이가 비정상입니다: {len(api_key)}자 (정상: 40-200자)")
+            print(f"⚠️ [GPT 분석] API 키 앞 10자: '{api_key[:10]}...'")
+            api_key = None
+    
+    return api_key
+
+def normalize_text(text):
+    """
+    메모이제이션 키용 텍스트 정규화
+    유니코드 정규화(NFC), 소문자화, 문장부호 제거, 공백 정리
+    예: "돈까스 먹어서 맛있다!!" == " 돈까스  먹어서 맛있다 "
+    """
+    text = unicodedata.normalize('NFC', text or '').lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return ' '.join(text.split())
+
+def get_analysis_memo_stats():
+    """GPT 분석 메모이제이션 통계"""
+    stats = _analysis_memo.stats()
+    stats['enabled'] = GPT_MEMO_ENABLED
+    stats['persist'] = GPT_MEMO_PERSIST and get_cache() is not None
+    return stats
+
+def get_gpt_stats():
+    """
+    ChatGPT 호출 통계 + 회로 차단기 상태 (프로세스(워커)별)
+    아직 호출 전이거나 API 키가 없으면 enabled=False
+    """
+    stats = {'enabled': _client is not None, 'circuit': _circuit.stats()}
+    if _client is not None:
+        stats.update(_client.stats())
+    return stats
+
 def analyze_text_with_gpt(text):
     """
-    ChatGPT API를 사용하여 텍스트 분석
-    - 키워드 추출
-    - 감정 분석
+    ChatGPT API를 사용하여 텍스트 분석 (정규화된 텍스트 기준 메모이제이션)
+    1. 메모리 캐시 (TTL + LRU)
+    2. 캐시 DB (GPT_MEMO_PERSIST, 재시작 후에도 유지)
+    3. 로컬 감정 분류 (emotion_classifier.py) - 신뢰도가 높으면 GPT 호출 생략
+    4. ChatGPT API 호출 - 실제 GPT 결과만 캐시에 저장
     
     Returns:
         dict: {
             'keywords': ['키워드1', '키워드2', ...],
-            'emotion': EmotionType
+            'emotion': EmotionType,
+            'source': 'gpt' | 'cache' | 'local' | 'fallback'
         }
     """
-    client = get_client()
+    if not GPT_MEMO_ENABLED:
+        return _analyze_locally(text) or _analyze_text_with_gpt(text)
     
-    # API 키가 없으면 간단한 방식 사용
-    if client is None:
-        print("=" * 60)
-        print("⚠️ [GPT 분석] OpenAI API 키가 없습니다!")
-        print("⚠️ [GPT 분석] 감정 분석을 수행할 수 없어 기본값(놀람)을 사용합니다.")
-        print("⚠️ [GPT 분석] .env 파일에 OPENAI_API_KEY를 설정해주세요.")
-        print("=" * 60)
-        keywords = extract_keywords_simple(text)
+    key = normalize_text(text)
+    persistent = get_cache() if GPT_MEMO_PERSIST else None
+    cached = _cached_analysis(key, persistent)
+    
+    if cached is not None:
+        print(f"[GPT 분석] 캐시 히트: '{key[:30]}' -> {cached['emotion'].value}, {cached['keywords']}")
         return {
-            'keywords': keywords,
-            'emotion': EmotionType.SURPRISE
+            'keywords': list(cached['keywords']),
+            'emotion': cached['emotion'],
+            'source': 'cache'
         }
     
-    print("=" * 60)
-    print("✅ [GPT 분석] API 클라이언트 확인 완료!")
-    print(f"📝 [GPT 분석] 입력 텍스트: {text}")
-    print(f"📝 [GPT 분석] 텍스트 길이: {len(text)} 글자")
-    print("🚀 [GPT 분석] ChatGPT API 호출 시작...")
-    print("=" * 60)
+    local = _analyze_locally(text)
+    if local is not None:
+        return local
     
-    try:
-        # 감정 매핑 (행복, 놀람, 화남, 슬픔, 신남, 보통)
-        emotion_map = {
-            "행복": EmotionType.JOY,
-            "화남": EmotionType.ANGER,
-            "슬픔": EmotionType.SADNESS,
-            "보통": EmotionType.CONFUSION,
-            "놀람": EmotionType.SURPRISE,
-            "신남": EmotionType.EXCITEMENT
-        }
-        
-        prompt = f"""다음 텍스트를 분석해주세요:
+    result = _analyze_text_with_gpt(text)
+    if result['source'] == 'gpt':
+        _remember_analysis(key, result, persistent)
+    return result
 
-"{text}"
+def _cached_analysis(key, persistent):
+    """메모리 캐시 -> 캐시 DB 순서로 분석 결과 조회 (캐시 DB에서 찾으면 메모리 캐시에도 저장)"""
+    cached = _analysis_memo.get(key)
+    if cached is None and persistent is not None:
+        cached = persistent.get_analysis(hash_text(key), max_age=GPT_MEMO_TTL)
+        if cached is not None:
+            _analysis_memo.set(key, cached)
+    return cached
 
-1. 감정 분석: 반드시 다음 6개 중 하나만 선택 (행복, 놀람, 화남, 슬픔, 신남, 보통)
+def _remember_analysis(key, result, persistent):
+    """GPT 분석 결과를 메모리 캐시와 캐시 DB에 저장"""
+    entry = {'keywords': list(result['keywords']), 'emotion': result['emotion']}
+    _analysis_memo.set(key, entry)
+    if persistent is not None:
+        persistent.set_analysis(hash_text(key), entry['keywords'], entry['emotion'])
+
+def _analyze_locally(text):
+    """로컬 감정 분류 신뢰도가 높으면 GPT 없이 결과 반환 (아니면 None)"""
+    prediction = confident_emotion(text)
+    if prediction is None:
+        return None
+    keywords = extract_keywords_simple(text)
+    print(f"[로컬 분석] {prediction.emotion.value} (신뢰도 {prediction.confidence}) - GPT 호출 생략, 키워드: {keywords}")
+    return {
+        'keywords': keywords,
+        'emotion': prediction.emotion,
+        'source': 'local'
+    }
+
+def _fallback_analysis(text):
+    """GPT를 쓸 수 없을 때 (API 키 없음/오류) 로컬 감정 분류 + 로컬 키워드 추출"""
+    prediction = classify_emotion(text)
+    print(f"⚠️ [GPT 분석] 로컬 감정 분류 결과를 사용합니다: {prediction.emotion.value} (신뢰도 {prediction.confidence})")
+    return {
+        'keywords': extract_keywords_simple(text),
+        'emotion': prediction.emotion,
+        'source': 'fallback'
+    }
+
+# 감정 매핑 (행복, 놀람, 화남, 슬픔, 신남, 보통)
+EMOTION_MAP = {
+    "행복": EmotionType.JOY,
+    "화남": EmotionType.ANGER,
+    "슬픔": EmotionType.SADNESS,
+    "보통": EmotionType.CONFUSION,
+    "놀람": EmotionType.SURPRISE,
+    "신남": EmotionType.EXCITEMENT
+}
+
+# 직접 매핑에 실패했을 때 유사 감정 매핑 (위에서부터 확인)
+SIMILAR_EMOTIONS = (
+    (['외로', '우울', '힘들', '아쉽', '그리움', '슬픔'], EmotionType.SADNESS),  # 외로움, 우울, 힘듦 등 -> 슬픔
+    (['기쁨', '행복', '좋', '즐거', '만족'], EmotionType.JOY),  # 기쁨, 행복 등 -> 행복
+    (['분노', '화', '짜증'], EmotionType.ANGER),  # 분노, 화 등 -> 화남
+    (['신남', '설렘', '두근'], EmotionType.EXCITEMENT),  # 신남, 설렘 등 -> 신남
+    (['놀람', '깜짝', '신기'], EmotionType.SURPRISE),  # 놀람, 깜짝 등 -> 놀람
+)
+
+GPT_SYSTEM_PROMPT = "텍스트 감정 분석 및 키워드 추출 전문가. JSON 형식으로만 답변."
+
+# 한 건 분석과 배치 분석이 함께 쓰는 분석 규칙 (배치에서는 요청마다 한 번만 보냄)
+ANALYSIS_RULES = """1. 감정 분석: 반드시 다음 6개 중 하나만 선택 (행복, 놀람, 화남, 슬픔, 신남, 보통)
    
    매핑 규칙:
    - 행복: 맛있다, 좋다, 즐겁다, 행복하다, 기쁘다, 만족, 뿌듯, 기쁨, 행복
@@ -180,153 +423,222 @@ def analyze_text_with_gpt(text):
 
 예시:
 텍스트: "오늘 성북동에 갔는데 길을 가다가 아기고양이를 봤다 정말 귀여웠고 기분이 좋아졌다"
-결과: {{"emotion": "행복", "keywords": ["성북동", "아기고양이"]}}
+결과: {"emotion": "행복", "keywords": ["성북동", "아기고양이"]}
 설명: "정말", "귀여웠고", "좋아졌다"는 형용사/동사이므로 키워드에 포함하지 않음
 
 텍스트: "돈까스 먹어서 맛있다"
-결과: {{"emotion": "행복", "keywords": ["돈까스"]}}
+결과: {"emotion": "행복", "keywords": ["돈까스"]}
 설명: "맛있다"는 형용사이므로 키워드에 포함하지 않음
 
 텍스트: "생일인데 집에서 혼자 외롭다"
-결과: {{"emotion": "슬픔", "keywords": ["생일", "집"]}}
+결과: {"emotion": "슬픔", "keywords": ["생일", "집"]}
 설명: "외롭다"는 형용사이므로 키워드에 포함하지 않음. "생일", "집"은 명사이므로 포함
 
 텍스트: "내일 돈까스 먹고 싶다"
-결과: {{"emotion": "행복", "keywords": ["돈까스"]}}
+결과: {"emotion": "행복", "keywords": ["돈까스"]}
 설명: "내일"은 시간 관련 단어이므로 제외, "돈까스"만 포함
+"""
+
+def build_analysis_prompt(text):
+    """한 건 분석 프롬프트"""
+    return f"""다음 텍스트를 분석해주세요:
+
+"{text}"
 
+{ANALYSIS_RULES}
 JSON 형식 (반드시 이 형식으로만 답변):
 {{
     "emotion": "행복",
     "keywords": ["성북동", "아기고양이"]
 }}
 """
-        
+
+def build_batch_prompt(texts):
+    """배치 분석 프롬프트 (텍스트마다 [번호]를 붙이고, 답변도 번호로 구분)"""
+    numbered = '\n'.join(f'[{index}] {json.dumps(text, ensure_ascii=False)}' for index, text in enumerate(texts))
+    return f"""다음 텍스트 {len(texts)}개를 각각 분석해주세요:
+
+{numbered}
+
+{ANALYSIS_RULES}
+JSON 형식 (반드시 이 형식으로만 답변, 텍스트 {len(texts)}개 모두 [번호]를 index로):
+{{
+    "results": [
+        {{"index": 0, "emotion": "행복", "keywords": ["성북동", "아기고양이"]}},
+        {{"index": 1, "emotion": "슬픔", "keywords": ["생일", "집"]}}
+    ]
+}}
+"""
+
+def _parse_json_response(result_text):
+    """
+    ChatGPT 응답 -> JSON (```json ... ``` 코드 블록이면 안쪽만)
+    Raises:
+        json.JSONDecodeError
+    """
+    result_text = result_text.strip()
+    if result_text.startswith('```'):
+        # 첫 번째 ``` 이후부터 마지막 ``` 이전까지 추출
+        json_lines = []
+        in_json = False
+        for line in result_text.split('\n'):
+            if line.strip().startswith('```'):
+                in_json = not in_json
+                continue
+            if in_json:
+                json_lines.append(line)
+        result_text = '\n'.join(json_lines)
+    return json.loads(result_text)
+
+def _map_emotion(emotion_str, text):
+    """
+    GPT 감정 문자열 -> EmotionType
+    직접 매핑(대소문자 무시) -> 유사 감정 매핑 -> 둘 다 실패하면 로컬 감정 분류 결과
+    """
+    emotion_str_lower = emotion_str.lower()
+    
+    # 직접 매핑 시도
+    for key, value in EMOTION_MAP.items():
+        if key.lower() == emotion_str_lower:
+            print(f"✅ [GPT 분석] 직접 매핑 성공: '{emotion_str}' -> {value.value}")
+            return value
+    
+    # 직접 매핑 실패 시 유사 감정 매핑
+    print(f"⚠️ [GPT 분석] 직접 매핑 실패. 유사 감정 매핑 시도 중...")
+    for words, value in SIMILAR_EMOTIONS:
+        if any(word in emotion_str_lower for word in words):
+            print(f"✅ [GPT 분석] 유사 감정 매핑 성공: '{emotion_str}' -> {value.value}")
+            return value
+    
+    emotion = classify_emotion(text).emotion
+    print(f"❌ [GPT 분석] 감정 매핑 실패: '{emotion_str}' - 로컬 감정 분류 결과 사용: {emotion.value}")
+    return emotion
+
+def _gpt_result(result, text):
+    """
+    파싱된 GPT 답변 하나 ({"emotion", "keywords"}) -> 분석 결과
+    키워드가 없거나 문자열 목록이 아니면 로컬 추출, 최대 3개
+    """
+    emotion_str = str(result.get('emotion') or '').strip()
+    print(f"🔍 [GPT 분석] 추출된 감정 문자열: '{emotion_str}'")
+    emotion = _map_emotion(emotion_str, text)
+    
+    # 키워드 추출 (ChatGPT에서 추출 시도, 없으면 로컬 추출)
+    keywords = result.get('keywords')
+    if not isinstance(keywords, list) or not keywords or not all(isinstance(k, str) for k in keywords):
+        print(f"⚠️ [GPT 분석] ChatGPT에서 키워드 추출 실패. 로컬 키워드 추출 시작...")
+        keywords = extract_keywords_simple(text)
+    else:
+        print(f"✅ [GPT 분석] ChatGPT에서 키워드 추출 성공: {keywords}")
+    
+    # 키워드 최대 3개로 제한 (감정 판단에 가장 중요한 순서대로)
+    if len(keywords) > 3:
+        print(f"⚠️ [GPT 분석] 키워드가 3개를 초과합니다 ({len(keywords)}개). 처음 3개만 사용합니다.")
+        keywords = keywords[:3]
+    
+    return {
+        'keywords': keywords,
+        'emotion': emotion,
+        'source': 'gpt'
+    }
+
+def _analyze_text_with_gpt(text):
+    """
+    ChatGPT API를 사용하여 텍스트 분석
+    - 키워드 추출
+    - 감정 분석
+    
+    Returns:
+        dict: {
+            'keywords': ['키워드1', '키워드2', ...],
+            'emotion': EmotionType,
+            'source': 'gpt' | 'fallback'  # fallback: API 키 없음/오류로 로컬 분석 결과 사용
+        }
+    """
+    client = get_client()
+    
+    # API 키가 없으면 간단한 방식 사용
+    if client is None:
+        print("=" * 60)
+        print("⚠️ [GPT 분석] OpenAI API 키가 없습니다!")
+        print("⚠️ [GPT 분석] .env 파일에 OPENAI_API_KEY를 설정해주세요.")
+        print("=" * 60)
+        return _fallback_analysis(text)
+    
+    # OpenAI 장애로 회로가 열려 있으면 호출하지 않고 바로 로컬 분석
+    token = _circuit.allow()
+    if not token:
+        print("⚡ [GPT 분석] 회로 차단 중 - ChatGPT 호출 없이 로컬 분석 결과를 사용합니다.")
+        return _fallback_analysis(text)
+    
+    print("=" * 60)
+    print("✅ [GPT 분석] API 클라이언트 확인 완료!")
+    print(f"📝 [GPT 분석] 입력 텍스트: {text}")
+    print(f"📝 [GPT 분석] 텍스트 길이: {len(text)} 글자")
+    print("🚀 [GPT 분석] ChatGPT API 호출 시작...")
+    print("=" * 60)
+    
+    try:
         # API 호출
         print("⏳ [GPT 분석] ChatGPT API 호출 중...")
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "텍스트 감정 분석 및 키워드 추출 전문가. JSON 형식으로만 답변."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=200  # 키워드도 포함하므로 토큰 수 증가
-        )
+        # 동시 호출 수 제한, 마감 시간(GPT_DEADLINE), 429/5xx 재시도는 gpt_client에서 처리
+        started = time.perf_counter()
+        error = None
+        finished = False
+        try:
+            result_text = client.complete(
+                [
+                    {"role": "system", "content": GPT_SYSTEM_PROMPT},
+                    {"role": "user", "content": build_analysis_prompt(text)}
+                ],
+                max_tokens=200  # 키워드도 포함하므로 토큰 수 증가
+            )
+            finished = True
+        except Exception as e:
+            error, finished = e, True
+            raise
+        finally:
+            if finished:
+                _circuit.record(token, time.perf_counter() - started, error)
+            else:
+                _circuit.release(token)  # 결과 없이 중단 (KeyboardInterrupt 등) - half_open에 갇히지 않도록 시험 호출 자리 반환
         
         print("✅ [GPT 분석] ChatGPT API 호출 성공!")
         
         # 응답 파싱
-        result_text = response.choices[0].message.content.strip()
+        result_text = (result_text or '').strip()
         print("=" * 60)
         print("📥 [GPT 분석] ChatGPT 원본 응답:")
         print(result_text)
         print("=" * 60)
         
-        # 코드 블록 제거 (```json ... ``` 형식)
-        if result_text.startswith('```'):
-            # 첫 번째 ``` 이후부터 마지막 ``` 이전까지 추출
-            lines = result_text.split('\n')
-            json_lines = []
-            in_json = False
-            for line in lines:
-                if line.strip().startswith('```'):
-                    in_json = not in_json
-                    continue
-                if in_json:
-                    json_lines.append(line)
-            result_text = '\n'.join(json_lines)
-        
         # JSON 파싱
-        import json
         try:
-            result = json.loads(result_text)
+            result = _parse_json_response(result_text)
+            if not isinstance(result, dict):
+                raise ValueError(f'JSON 객체가 아닙니다: {type(result).__name__}')
             print("✅ [GPT 분석] JSON 파싱 성공!")
             print(f"📊 [GPT 분석] 파싱된 결과: {result}")
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # json.JSONDecodeError 포함
             print("=" * 60)
             print("❌ [GPT 분석] JSON 파싱 오류 발생!")
             print(f"❌ [GPT 분석] 오류 내용: {e}")
             print(f"❌ [GPT 분석] 파싱 시도한 텍스트:")
             print(result_text)
-            print("⚠️ [GPT 분석] 기본값(놀람)을 사용합니다.")
             print("=" * 60)
-            # 기본값 반환
-            keywords = extract_keywords_simple(text)
-            return {
-                'keywords': keywords,
-                'emotion': EmotionType.SURPRISE
-            }
-        
-        # 감정 변환
-        emotion_str = result.get('emotion', '').strip()
-        print("=" * 60)
-        print(f"🔍 [GPT 분석] 추출된 감정 문자열: '{emotion_str}'")
-        
-        # 감정 매핑 (대소문자 무시, 유사 감정 매핑 포함)
-        emotion_str_lower = emotion_str.lower()
-        emotion = None
-        
-        # 직접 매핑 시도
-        for key, value in emotion_map.items():
-            if key.lower() == emotion_str_lower:
-                emotion = value
-                print(f"✅ [GPT 분석] 직접 매핑 성공: '{emotion_str}' -> {emotion.value}")
-                break
-        
-        # 직접 매핑 실패 시 유사 감정 매핑
-        if emotion is None:
-            print(f"⚠️ [GPT 분석] 직접 매핑 실패. 유사 감정 매핑 시도 중...")
-            # 외로움, 우울, 힘듦 등 -> 슬픔
-            if any(word in emotion_str_lower for word in ['외로', '우울', '힘들', '아쉽', '그리움', '슬픔']):
-                emotion = EmotionType.SADNESS
-                print(f"✅ [GPT 분석] 유사 감정 매핑 성공: '{emotion_str}' -> 슬픔")
-            # 기쁨, 행복 등 -> 행복
-            elif any(word in emotion_str_lower for word in ['기쁨', '행복', '좋', '즐거', '만족']):
-                emotion = EmotionType.JOY
-                print(f"✅ [GPT 분석] 유사 감정 매핑 성공: '{emotion_str}' -> 행복")
-            # 분노, 화 등 -> 화남
-            elif any(word in emotion_str_lower for word in ['분노', '화', '짜증']):
-                emotion = EmotionType.ANGER
-                print(f"✅ [GPT 분석] 유사 감정 매핑 성공: '{emotion_str}' -> 화남")
-            # 신남, 설렘 등 -> 신남
-            elif any(word in emotion_str_lower for word in ['신남', '설렘', '두근']):
-                emotion = EmotionType.EXCITEMENT
-                print(f"✅ [GPT 분석] 유사 감정 매핑 성공: '{emotion_str}' -> 신남")
-            # 놀람, 깜짝 등 -> 놀람
-            elif any(word in emotion_str_lower for word in ['놀람', '깜짝', '신기']):
-                emotion = EmotionType.SURPRISE
-                print(f"✅ [GPT 분석] 유사 감정 매핑 성공: '{emotion_str}' -> 놀람")
-            else:
-                print(f"❌ [GPT 분석] 감정 매핑 실패: '{emotion_str}'")
-                print(f"⚠️ [GPT 분석] 기본값(놀람)을 사용합니다.")
-                emotion = EmotionType.SURPRISE
+            return _fallback_analysis(text)
         
+        # 감정 변환 + 키워드 정리
         print("=" * 60)
-        
-        # 키워드 추출 (ChatGPT에서 추출 시도, 없으면 로컬 추출)
-        keywords = result.get('keywords', [])
-        if not keywords or len(keywords) == 0:
-            print(f"⚠️ [GPT 분석] ChatGPT에서 키워드 추출 실패. 로컬 키워드 추출 시작...")
-            keywords = extract_keywords_simple(text)
-        else:
-            print(f"✅ [GPT 분석] ChatGPT에서 키워드 추출 성공: {keywords}")
-        
-        # 키워드 최대 3개로 제한 (감정 판단에 가장 중요한 순서대로)
-        if len(keywords) > 3:
-            print(f"⚠️ [GPT 분석] 키워드가 3개를 초과합니다 ({len(keywords)}개). 처음 3개만 사용합니다.")
-            keywords = keywords[:3]
+        analysis = _gpt_result(result, text)
         
         print("=" * 60)
         print("🎉 [GPT 분석] 최종 결과:")
-        print(f"   📌 키워드: {keywords}")
-        print(f"   😊 감정: {emotion.value}")
+        print(f"   📌 키워드: {analysis['keywords']}")
+        print(f"   😊 감정: {analysis['emotion'].value}")
         print("=" * 60)
         
-        return {
-            'keywords': keywords,
-            'emotion': emotion
-        }
+        return analysis
         
     except Exception as e:
         error_msg = str(e)
@@ -341,60 +653,245 @@ JSON 형식 (반드시 이 형식으로만 답변):
         print("📋 [GPT 분석] 상세 오류 스택:")
         print(traceback.format_exc())
         print("=" * 60)
-        print("⚠️ [GPT 분석] OpenAI API 오류로 인해 기본값을 사용합니다.")
-        print("⚠️ [GPT 분석] 감정: 기본값(놀람)")
-        print("⚠️ [GPT 분석] 키워드: 로컬에서 문장의 단어를 추출합니다.")
+        print("⚠️ [GPT 분석] OpenAI API 오류로 인해 로컬 분석 결과를 사용합니다.")
         print("=" * 60)
-        
-        keywords = extract_keywords_simple(text)
-        
-        return {
-            'keywords': keywords,
-            'emotion': EmotionType.SURPRISE
-        }
+        return _fallback_analysis(text)
 
-def extract_keywords_simple(text):
+# ==================== 배치 분석 ====================
+# 백필처럼 텍스트가 많을 때 분석 규칙(약 2KB)을 텍스트마다 보내지 않도록
+# 여러 텍스트를 요청 하나로 묶고, 답변은 [번호]별 JSON 배열로 받음
+
+def analyze_texts_with_gpt(texts, batch_size=None):
     """
-    문장에서 키워드 추출 (로컬 처리, ChatGPT 사용 안 함)
-    한국어 명사를 추출하고 조사 및 불용어를 제거합니다.
+    여러 텍스트를 한 번에 분석
+    텍스트마다 analyze_text_with_gpt와 같은 순서(메모리 캐시 -> 캐시 DB -> 로컬 감정 분류)로 확인하고,
+    남은 텍스트만 batch_size개씩 ChatGPT 요청 하나로 분석 (정규화 결과가 같은 텍스트는 한 번만)
+    
+    Returns:
+        list: 텍스트 순서대로 analyze_text_with_gpt와 같은 형식의 결과
+              (답변에서 빠졌거나 형식이 잘못된 항목만 'fallback')
     """
-    import re
-    from collections import Counter
+    batch_size = max(1, batch_size or GPT_BATCH_SIZE)
+    persistent = get_cache() if GPT_MEMO_ENABLED and GPT_MEMO_PERSIST else None
+    results = [None] * len(texts)
+    pending = {}  # 정규화 텍스트 -> 같은 텍스트의 인덱스 목록 (GPT로 보낼 것)
     
-    # 한국어 조사 패턴 (단어 끝에 붙는 조사)
-    josa_patterns = [
-        r'은$', r'는$', r'이$', r'가$', r'을$', r'를$', r'의$', r'와$', r'과$', 
-        r'도$', r'로$', r'으로$', r'에서$', r'에게$', r'께$', r'한테$', r'에게서$',
-        r'만$', r'까지$', r'부터$', r'처럼$', r'같이$', r'보다$', r'마다$'
-    ]
+    for index, text in enumerate(texts):
+        key = normalize_text(text)
+        if key in pending:
+            pending[key].append(index)
+            continue
+        cached = _cached_analysis(key, persistent) if GPT_MEMO_ENABLED else None
+        if cached is not None:
+            results[index] = {'keywords': list(cached['keywords']), 'emotion': cached['emotion'], 'source': 'cache'}
+            continue
+        local = _analyze_locally(text)
+        if local is not None:
+            results[index] = local
+            continue
+        pending[key] = [index]
     
-    # 한국어 불용어 (조사, 대명사, 부사 등)
-    stop_words = {'이', '가', '을', '를', '은', '는', '의', '와', '과', '도', '로', '으로', 
-                  '에서', '에게', '께', '한', '한다', '하다', '되는', '되다', '있다', '없다',
-                  '그', '그것', '이것', '저것', '그런', '이런', '저런', '그렇게', '이렇게',
-                  '잘', '좀', '더', '매우', '너무', '정말', '진짜', '그냥', '아주',
-                  '오늘', '어제', '내일', '지금', '그때', '이때', '저때',  # 시간 관련 불용어
-                  '나갔다', '왔다', '갔다', '했다', '했다', '했다', '했다',  # 동사 불용어
-                  '좋다', '나쁘다', '크다', '작다', '많다', '적다'}  # 형용사 불용어
+    groups = list(pending.items())
+    chunks = [groups[start:start + batch_size] for start in range(0, len(groups), batch_size)]
+    print(f"[GPT 배치 분석] 텍스트 {len(texts)}개 중 {len(groups)}개를 GPT로 분석 (요청 {len(chunks)}개)")
+    batches = _analyze_batches_with_gpt([[texts[indexes[0]] for _, indexes in chunk] for chunk in chunks])
+    for chunk, analyses in zip(chunks, batches):
+        for (key, indexes), analysis in zip(chunk, analyses):
+            if analysis['source'] == 'gpt' and GPT_MEMO_ENABLED:
+                _remember_analysis(key, analysis, persistent)
+            for index in indexes:
+                results[index] = dict(analysis, keywords=list(analysis['keywords']))
+    return results
+
+def _analyze_batches_with_gpt(batches):
+    """
+    텍스트 묶음마다 ChatGPT 요청 하나로 분석 (묶음끼리는 GPT_MAX_CONCURRENCY 안에서 동시에 요청)
     
-    # 단어 추출 (2글자 이상 한글)
-    words = re.findall(r'[가-힣]{2,}', text)
+    Returns:
+        list: 묶음마다 텍스트 순서대로의 분석 결과 목록
+    """
+    if not batches:
+        return []
     
-    # 조사 제거
-    cleaned_words = []
-    for word in words:
-        # 조사 패턴 제거
-        cleaned = word
-        for pattern in josa_patterns:
-            cleaned = re.sub(pattern, '', cleaned)
-        
-        # 조사 제거 후 남은 단어가 2글자 이상이고 불용어가 아니면 추가
-        if len(cleaned) >= 2 and cleaned not in stop_words:
-            cleaned_words.append(cleaned)
+    client = get_client()
+    if client is None:
+        print("⚠️ [GPT 배치 분석] OpenAI API 키가 없습니다! 로컬 분석 결과를 사용합니다.")
+        return [[_fallback_analysis(text) for text in texts] for texts in batches]
     
-    # 빈도수 기반 키워드 추출 (최대 3개)
-    word_counts = Counter(cleaned_words)
-    keywords = [word for word, count in word_counts.most_common(3)]
+    # 묶음(요청)마다 회로 확인 - half_open이면 첫 묶음만 시험 호출로 보내고 나머지는 로컬 분석
+    allowed = [_circuit.allow() for _ in batches]
+    if not any(allowed):
+        print("⚡ [GPT 배치 분석] 회로 차단 중 - ChatGPT 호출 없이 로컬 분석 결과를 사용합니다.")
+        return [[_fallback_analysis(text) for text in texts] for texts in batches]
+    if not all(allowed):
+        print(f"⚡ [GPT 배치 분석] 회로 시험 호출 중 - 요청 {allowed.count(False)}개는 로컬 분석 결과를 사용합니다.")
     
-    return keywords
+    sent = [(texts, token) for texts, token in zip(batches, allowed) if token]
+    started = time.perf_counter()
+    responses = None
+    try:
+        responses = client.complete_many([
+            {
+                'messages': [
+                    {"role": "system", "content": GPT_SYSTEM_PROMPT},
+                    {"role": "user", "content": build_batch_prompt(texts)}
+                ],
+                'max_tokens': GPT_BATCH_TOKENS_PER_TEXT * len(texts) + 50
+            }
+            for texts, _ in sent
+        ], timed=True)
+    finally:
+        if responses is None:
+            for _, token in sent:
+                _circuit.release(token)  # 결과 없이 중단 - half_open에 갇히지 않도록 시험 호출 자리 반환
+    # 자리를 기다리다 마감 시간을 넘긴 요청은 전체 걸린 시간으로 기록
+    elapsed = time.perf_counter() - started
+    for (_, token), (response, latency) in zip(sent, responses):
+        _circuit.record(token, elapsed if latency is None else latency,
+                        response if isinstance(response, BaseException) else None)
+    analyses = iter([_batch_analyses(texts, response) for (texts, _), (response, _) in zip(sent, responses)])
+    return [next(analyses) if ok else [_fallback_analysis(text) for text in texts]
+            for texts, ok in zip(batches, allowed)]
+
+def _batch_analyses(texts, response):
+    """
+    배치 답변 하나 -> 텍스트별 분석 결과
+    요청이 실패했거나 JSON이 아니면 모든 텍스트를, 항목이 빠졌거나 잘못되었으면 그 텍스트만 로컬 분석으로 대체
+    """
+    error = response if isinstance(response, BaseException) else None
+    if error is None:
+        try:
+            result = _parse_json_response(response or '')
+        except ValueError as e:  # json.JSONDecodeError 포함
+            error = e
+    if error is not None:
+        print(f"❌ [GPT 배치 분석] 요청/파싱 오류 ({type(error).__name__}: {error}) - 텍스트 {len(texts)}개 모두 로컬 분석 결과를 사용합니다.")
+        return [_fallback_analysis(text) for text in texts]
+    
+    items = result.get('results') if isinstance(result, dict) else result
+    by_index = {}
+    for item in items if isinstance(items, list) else []:
+        index = item.get('index') if isinstance(item, dict) else None
+        # bool은 int의 하위 클래스이므로 제외, 같은 번호가 두 번 오면 첫 번째만 사용
+        if isinstance(index, int) and not isinstance(index, bool) and 0 <= index < len(texts):
+            by_index.setdefault(index, item)
+    
+    analyses = []
+    for index, text in enumerate(texts):
+        item = by_index.get(index)
+        if item is None or not isinstance(item.get('emotion'), str) or not item['emotion'].strip():
+            print(f"⚠️ [GPT 배치 분석] {index}번 답변이 없거나 형식이 잘못되었습니다: {item}")
+            analyses.append(_fallback_analysis(text))
+        else:
+            analyses.append(_gpt_result(item, text))
+    print(f"✅ [GPT 배치 분석] 텍스트 {len(texts)}개 분석 완료 (대체 {sum(a['source'] == 'fallback' for a in analyses)}개)")
+    return analyses
+
+# ==================== 로컬 키워드 추출 ====================
+# GPT 실패/미설정 시 대체 경로와 키워드 백필(backfill_keywords.py)에서 사용하므로
+# 조사 트라이, 불용어, 정규식은 불러올 때 한 번만 만듦
+
+# 단어 끝에 붙는 조사 (겹조사 포함 - 가장 긴 조사 하나만 제거)
+JOSA = (
+    '은', '는', '이', '가', '을', '를', '의', '와', '과', '도', '로', '으로', '에', '에서', '에게', '께',
+    '한테', '에게서', '만', '까지', '부터', '처럼', '같이', '보다', '마다',
+) + tuple(
+    base + tail
+    for base in ('에', '에서', '에게', '한테', '으로', '로', '까지', '부터', '처럼', '보다')
+    for tail in ('는', '도', '만', '의')
+)
+
+# 키워드에서 뺄 단어 (대명사, 부사, 시간, 흔한 동사/형용사)
+STOP_WORDS = frozenset({
+    '이', '가', '을', '를', '은', '는', '의', '와', '과', '도', '로', '으로',
+    '에서', '에게', '께', '한', '한다', '하다', '되는', '되다', '있다', '없다',
+    '그', '그것', '이것', '저것', '그런', '이런', '저런', '그렇게', '이렇게',
+    '잘', '좀', '더', '매우', '너무', '정말', '진짜', '그냥', '아주',
+    '오늘', '어제', '내일', '지금', '그때', '이때', '저때',
+    '나갔다', '왔다', '갔다', '했다',
+    '좋다', '나쁘다', '크다', '작다', '많다', '적다',
+})
 
+MIN_KEYWORD_LENGTH = 2
+MAX_LOCAL_KEYWORDS = 3
+
+_HANGUL_WORD = re.compile(r'[가-힣]{2,}')
+_JOSA_END = '\0'  # 트라이에서 조사가 끝나는 위치 표시
+
+
+def _build_suffix_trie(suffixes):
+    """조사를 뒤에서부터 읽는 트라이 (단어 끝에서 한 글자씩 거슬러 올라가며 일치 확인)"""
+    trie = {}
+    for suffix in suffixes:
+        node = trie
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node[_JOSA_END] = len(suffix)
+    return trie
+
+
+_JOSA_TRIE = _build_suffix_trie(JOSA)
+
+
+@lru_cache(maxsize=65536)
+def strip_josa(word):
+    """
+    단어 끝의 가장 긴 조사 하나를 뗀 어간 (조사가 없으면 그대로)
+    예: '학교에서는' -> '학교', '카페에' -> '카페'
+    """
+    node = _JOSA_TRIE
+    longest = 0
+    # 어간이 한 글자 이상 남는 범위에서만 확인
+    for index in range(len(word) - 1, 0, -1):
+        node = node.get(word[index])
+        if node is None:
+            break
+        longest = node.get(_JOSA_END, longest)
+    return word[:len(word) - longest] if longest else word
+
+
+def _keyword_candidates(text):
+    """텍스트 -> 조사를 떼고 불용어를 뺀 단어 목록 (등장 순서)"""
+    candidates = []
+    for word in _HANGUL_WORD.findall(text or ''):
+        stem = strip_josa(word)
+        if len(stem) >= MIN_KEYWORD_LENGTH and stem not in STOP_WORDS:
+            candidates.append(stem)
+    return candidates
+
+
+def extract_keywords_simple(text):
+    """
+    문장에서 키워드 추출 (로컬 처리, ChatGPT 사용 안 함)
+    한국어 단어에서 조사를 떼고 불용어를 뺀 뒤 자주 나온 순서로 최대 3개 (같으면 먼저 나온 단어)
+    """
+    return [word for word, _ in Counter(_keyword_candidates(text)).most_common(MAX_LOCAL_KEYWORDS)]
+
+
+def extract_keywords_batch(texts):
+    """
+    여러 텍스트의 키워드를 한 번에 추출 (기존 녹음 백필 등)
+    배치 안에서 같은 단어는 한 번만 조사를 떼고 불용어를 확인 (단어 -> 키워드 후보 또는 None)
+
+    Returns:
+        list: 텍스트마다 extract_keywords_simple과 같은 키워드 목록
+    """
+    findall = _HANGUL_WORD.findall
+    strip = strip_josa.__wrapped__  # 배치 사전이 캐시 역할
+    candidates = {}
+    results = []
+    for text in texts:
+        counts = {}
+        for word in findall(text or ''):
+            try:
+                stem = candidates[word]
+            except KeyError:
+                stem = strip(word)
+                if len(stem) < MIN_KEYWORD_LENGTH or stem in STOP_WORDS:
+                    stem = None
+                candidates[word] = stem
+            if stem is not None:
+                counts[stem] = counts.get(stem, 0) + 1
+        # 빈도 내림차순, 같으면 먼저 나온 단어 (Counter.most_common과 같은 순서)
+        results.append(sorted(counts, key=counts.__getitem__, reverse=True)[:MAX_LOCAL_KEYWORDS])
+    return results
@@ -0,0 +1,210 @@
+"""
+녹음 통계 집계
+- 감정별 개수를 DB에서 GROUP BY로 집계 (녹음 행을 파이썬으로 불러오지 않음)
+- 기간/동네/업로드 여부 필터, 일/월 단위 구간 집계
+- 날짜 구간 함수는 DB 종류에 맞춰 선택 (SQLite strftime, PostgreSQL to_char)
+- 아카이브 요약 (월별 감정, 많이 기록한 동네, 자주 나온 키워드) - rollups.py가 관리하는 롤업 테이블 사용
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from models import (
+    db, Recording, EmotionType,
+    UserMonthEmotionStat, UserMonthDistrictStat, UserMonthKeywordStat
+)
+
+# 구간 단위 -> (strftime 형식, to_char 형식)
+BUCKET_FORMATS = {
+    'day': ('%Y-%m-%d', 'YYYY-MM-DD'),
+    'month': ('%Y-%m', 'YYYY-MM'),
+}
+
+
+class StatsQueryError(ValueError):
+    """잘못된 통계 조회 조건 (message는 그대로 클라이언트에 전달)"""
+
+
+def parse_date(value, name):
+    """'YYYY-MM-DD' 문자열 -> datetime (None이면 None)"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise StatsQueryError(f'{name} 형식이 올바르지 않습니다. (YYYY-MM-DD)')
+
+
+def parse_month(value):
+    """'YYYY-MM' 문자열 -> (해당 월 1일, 해당 월 마지막 날)"""
+    try:
+        start = datetime.strptime(value, '%Y-%m')
+    except (TypeError, ValueError):
+        raise StatsQueryError('month 형식이 올바르지 않습니다. (YYYY-MM)')
+    next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+
+def bucket_expression(column, bucket, dialect_name=None):
+    """
+    날짜 컬럼 -> 구간 문자열 SQL 식 ('2024-01-31' / '2024-01')
+
+    Args:
+        column: DateTime 컬럼
+        bucket: 'day' 또는 'month'
+        dialect_name: DB 종류 (None이면 현재 엔진 기준)
+    """
+    if bucket not in BUCKET_FORMATS:
+        raise StatsQueryError('bucket은 day 또는 month만 가능합니다.')
+    strftime_format, to_char_format = BUCKET_FORMATS[bucket]
+    dialect_name = dialect_name or db.engine.dialect.name
+    if dialect_name == 'postgresql':
+        return func.to_char(column, to_char_format)
+    if dialect_name in ('mysql', 'mariadb'):
+        return func.date_format(column, strftime_format)
+    return func.strftime(strftime_format, column)
+
+
+def recording_filters(user_id=None, start_date=None, end_date=None, district=None, is_uploaded=None):
+    """
+    녹음 필터 조건 목록
+
+    Args:
+        start_date / end_date: 포함 범위 (datetime, 날짜 단위)
+    """
+    conditions = []
+    if user_id:
+        conditions.append(Recording.user_id == user_id)
+    if start_date is not None:
+        conditions.append(Recording.recorded_at >= start_date)
+    if end_date is not None:
+        # 종료일 당일 전체 포함
+        conditions.append(Recording.recorded_at < end_date + timedelta(days=1))
+    if district:
+        conditions.append(Recording.district == district)
+    if is_uploaded is not None:
+        conditions.append(Recording.is_uploaded == is_uploaded)
+    return conditions
+
+
+def empty_emotion_counts():
+    """모든 감정을 0으로 채운 dict (응답에 항상 전체 감정 포함)"""
+    return {emotion_type.value: 0 for emotion_type in EmotionType}
+
+
+def emotion_stats(bucket=None, **filters):
+    """
+    감정별 개수 집계
+
+    Args:
+        bucket: None, 'day', 'month' (None이면 전체 합계만)
+        **filters: recording_filters 인자
+    Returns:
+        dict: {'total': n, 'emotions': {...}, 'buckets': [{'period', 'total', 'emotions'}, ...]}
+              (buckets는 bucket 지정 시에만 포함, 기간 오름차순)
+    """
+    conditions = recording_filters(**filters)
+    count = func.count(Recording.id)
+
+    if bucket is None:
+        rows = db.session.execute(
+            select(Recording.emotion, count).where(*conditions).group_by(Recording.emotion)
+        ).all()
+        emotions = empty_emotion_counts()
+        for emotion, n in rows:
+            emotions[emotion.value] = n
+        return {'total': sum(emotions.values()), 'emotions': emotions}
+
+    period = bucket_expression(Recording.recorded_at, bucket).label('period')
+    rows = db.session.execute(
+        select(period, Recording.emotion, count)
+        .where(*conditions)
+        .group_by(period, Recording.emotion)
+        .order_by(period)
+    ).all()
+
+    emotions = empty_emotion_counts()
+    buckets = {}
+    for period_value, emotion, n in rows:
+        entry = buckets.get(period_value)
+        if entry is None:
+            entry = buckets[period_value] = {'period': period_value, 'total': 0, 'emotions': empty_emotion_counts()}
+        entry['emotions'][emotion.value] = n
+        entry['total'] += n
+        emotions[emotion.value] += n
+
+    return {
+        'total': sum(emotions.values()),
+        'emotions': emotions,
+        'buckets': list(buckets.values())
+    }
+
+
+def archive_summary(user_id, month=None, top=4):
+    """
+    사용자 아카이브 요약 (롤업 테이블에서 조회 - 녹음 수가 아니라 구간 수에 비례)
+
+    Args:
+        user_id: 사용자 ID
+        month: 'YYYY-MM' (None이면 전체 기간)
+        top: 동네/키워드 상위 개수
+    Returns:
+        dict: {
+            'month', 'total', 'total_duration', 'emotions',
+            'months': [{'period', 'total', 'emotions'}, ...],
+            'top_districts': [...], 'top_keywords': [...]
+        }
+    """
+    if month:
+        parse_month(month)
+
+    def conditions(model):
+        result = [model.user_id == user_id]
+        if month:
+            result.append(model.month == month)
+        return result
+
+    rows = db.session.execute(
+        select(UserMonthEmotionStat.month, UserMonthEmotionStat.emotion,
+               UserMonthEmotionStat.count, UserMonthEmotionStat.duration)
+        .where(*conditions(UserMonthEmotionStat))
+        .order_by(UserMonthEmotionStat.month)
+    ).all()
+
+    emotions = empty_emotion_counts()
+    months = {}
+    total_duration = 0.0
+    for period, emotion, n, duration in rows:
+        entry = months.get(period)
+        if entry is None:
+            entry = months[period] = {'period': period, 'total': 0, 'emotions': empty_emotion_counts()}
+        entry['emotions'][emotion.value] += n
+        entry['total'] += n
+        emotions[emotion.value] += n
+        total_duration += duration or 0.0
+
+    def top_counts(model, column):
+        total = func.sum(model.count).label('total')
+        return db.session.execute(
+            select(column, total)
+            .where(*conditions(model))
+            .group_by(column)
+            .order_by(total.desc(), column)
+            .limit(top)
+        ).all()
+
+    return {
+        'month': month,
+        'total': sum(emotions.values()),
+        'total_duration': total_duration,
+        'emotions': emotions,
+        'months': list(months.values()),
+        'top_districts': [
+            {'district': district, 'count': n}
+            for district, n in top_counts(UserMonthDistrictStat, UserMonthDistrictStat.district)
+        ],
+        'top_keywords': [
+            {'keyword': keyword, 'count': n}
+            for keyword, n in top_counts(UserMonthKeywordStat, UserMonthKeywordStat.keyword)
+        ]
+    }
@@ -0,0 +1,169 @@
+"""
+SQLite 동시 쓰기 부하 테스트
+gunicorn 워커처럼 여러 프로세스가 같은 DB 파일에 동시에 쓰고 읽을 때
+"database is locked" 오류가 몇 번 나는지 기본 설정과 튜닝 설정(db_config.py)을 비교합니다.
+
+각 쓰기 프로세스는 좋아요 증가(UPDATE)와 녹음 추가(INSERT)를 한 트랜잭션으로 반복하고,
+읽기 프로세스는 피드 조회처럼 녹음 테이블을 계속 읽습니다.
+
+사용법:
+    python stress_sqlite_writes.py                 # 기본 설정 vs 튜닝 설정 비교
+    python stress_sqlite_writes.py --writers 8 --iterations 300 --readers 4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+import db_config
+
+SCHEMA = [
+    'CREATE TABLE counters (id INTEGER PRIMARY KEY, likes INTEGER NOT NULL)',
+    'CREATE TABLE recordings (id INTEGER PRIMARY KEY, worker INTEGER, content TEXT, created_at REAL)',
+    'INSERT INTO counters (id, likes) VALUES (1, 0)',
+]
+
+
+def make_engine(url, tuned):
+    """기본 설정(예전 app.py와 같음) 또는 튜닝 설정 엔진"""
+    if not tuned:
+        return create_engine(url)
+    engine = create_engine(url, **db_config.engine_options(url))
+    db_config.configure_engine(engine)
+    return engine
+
+
+def writer(url, tuned, worker_id, iterations, hold_ms, results):
+    engine = make_engine(url, tuned)
+    locked = 0
+    committed = 0
+    latencies = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                conn.execute(text('UPDATE counters SET likes = likes + 1 WHERE id = 1'))
+                conn.execute(
+                    text('INSERT INTO recordings (worker, content, created_at) VALUES (:w, :c, :t)'),
+                    {'w': worker_id, 'c': '테스트 녹음 ' * 20, 't': time.time()}
+                )
+                if hold_ms:
+                    # 요청 처리 중 트랜잭션을 잡고 있는 시간 (ORM 처리, 직렬화 등)
+                    time.sleep(hold_ms / 1000.0)
+            committed += 1
+        except OperationalError as e:
+            if 'locked' in str(e) or 'busy' in str(e):
+                locked += 1
+            else:
+                raise
+        latencies.append(time.perf_counter() - started)
+    engine.dispose()
+    results.put(('writer', committed, locked, latencies))
+
+
+def reader(url, tuned, stop, results):
+    engine = make_engine(url, tuned)
+    reads = 0
+    locked = 0
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(text(
+                    'SELECT worker, COUNT(*), MAX(created_at) FROM recordings GROUP BY worker'
+                )).all()
+                conn.execute(text('SELECT * FROM recordings ORDER BY id DESC LIMIT 50')).all()
+            reads += 1
+        except OperationalError as e:
+            if 'locked' in str(e) or 'busy' in str(e):
+                locked += 1
+            else:
+                raise
+    engine.dispose()
+    results.put(('reader', reads, locked, []))
+
+
+def run(tuned, writers, readers, iterations, hold_ms):
+    """한 가지 설정으로 부하 실행 후 결과 반환"""
+    temp_dir = tempfile.mkdtemp(prefix='revo-stress-')
+    url = 'sqlite:///' + os.path.join(temp_dir, 'stress.db')
+
+    engine = make_engine(url, tuned)
+    with engine.begin() as conn:
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+    engine.dispose()
+
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    stop = ctx.Event()
+    reader_procs = [ctx.Process(target=reader, args=(url, tuned, stop, results)) for _ in range(readers)]
+    writer_procs = [
+        ctx.Process(target=writer, args=(url, tuned, i, iterations, hold_ms, results))
+        for i in range(writers)
+    ]
+
+    started = time.perf_counter()
+    for proc in reader_procs + writer_procs:
+        proc.start()
+    collected = [results.get() for _ in writer_procs]
+    stop.set()
+    collected += [results.get() for _ in reader_procs]
+    for proc in reader_procs + writer_procs:
+        proc.join()
+    elapsed = time.perf_counter() - started
+
+    engine = make_engine(url, tuned)
+    with engine.connect() as conn:
+        likes = conn.execute(text('SELECT likes FROM counters WHERE id = 1')).scalar()
+        rows = conn.execute(text('SELECT COUNT(*) FROM recordings')).scalar()
+    engine.dispose()
+
+    latencies = sorted(lat for kind, _, _, lats in collected if kind == 'writer' for lat in lats)
+    return {
+        'committed': sum(n for kind, n, _, _ in collected if kind == 'writer'),
+        'write_locked': sum(n for kind, _, n, _ in collected if kind == 'writer'),
+        'reads': sum(n for kind, n, _, _ in collected if kind == 'reader'),
+        'read_locked': sum(n for kind, _, n, _ in collected if kind == 'reader'),
+        'likes': likes,
+        'rows': rows,
+        'elapsed': elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 동시 쓰기 부하 테스트')
+    parser.add_argument('--writers', type=int, default=8, help='쓰기 프로세스 수')
+    parser.add_argument('--readers', type=int, default=4, help='읽기 프로세스 수')
+    parser.add_argument('--iterations', type=int, default=200, help='쓰기 프로세스당 트랜잭션 수')
+    parser.add_argument('--hold-ms', type=int, default=5, help='트랜잭션 안에서 머무는 시간 (ms)')
+    args = parser.parse_args()
+
+    print(f"쓰기 {args.writers}개 x {args.iterations}회, 읽기 {args.readers}개, 트랜잭션 유지 {args.hold_ms}ms")
+    print("-" * 70)
+    failed = False
+    for name, tuned in (('기본 설정', False), ('튜닝 설정', True)):
+        result = run(tuned, args.writers, args.readers, args.iterations, args.hold_ms)
+        print(f"[{name}] 커밋 {result['committed']}, 쓰기 잠금 오류 {result['write_locked']}, "
+              f"읽기 {result['reads']} (잠금 오류 {result['read_locked']}), "
+              f"{result['elapsed']:.1f}초, 쓰기 p50 {result['p50_ms']:.1f}ms / p99 {result['p99_ms']:.1f}ms")
+        if result['likes'] != result['committed'] or result['rows'] != result['committed']:
+            print(f"  ⚠️ 커밋 수와 DB 값이 다릅니다 (likes={result['likes']}, rows={result['rows']})")
+            failed = True
+        if tuned and (result['write_locked'] or result['read_locked']):
+            failed = True
+    print("-" * 70)
+
+    if failed:
+        print("\n[결과] 튜닝 설정에서도 잠금 오류가 발생했습니다.")
+        raise SystemExit(1)
+    print("\n[결과] 튜닝 설정에서 잠금 오류가 없습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+STT(음성 인식) 클라이언트
+- WHISPER_SERVER_URL이 있으면 공유 Whisper 추론 서버(whisper_server.py)에 요청
+- 없으면 이 프로세스에서 Whisper 모델을 처음 사용할 때 한 번만 로드해서 사용
+- WHISPER_BATCH_SIZE > 1이면 동시에 들어온 요청을 모아서 한 번에 디코딩 (마이크로 배치)
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import requests
+
+WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base')
+WHISPER_SERVER_URL = os.getenv('WHISPER_SERVER_URL', '').rstrip('/')  # 예: http://127.0.0.1:5001
+WHISPER_SERVER_TIMEOUT = float(os.getenv('WHISPER_SERVER_TIMEOUT', '300'))  # 초
+WHISPER_BATCH_SIZE = int(os.getenv('WHISPER_BATCH_SIZE', '1'))  # 배치 최대 크기 (1이면 배치 안 함)
+WHISPER_BATCH_WAIT_MS = int(os.getenv('WHISPER_BATCH_WAIT_MS', '50'))  # 배치를 모으는 최대 대기 시간
+
+# 배치 디코딩 결과가 이 기준보다 나쁘면 해당 파일만 transcribe()로 다시 처리
+# (whisper.transcribe의 temperature fallback 기준과 동일)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+_local_model = None
+_local_model_lock = threading.Lock()
+_batcher = None
+
+
+class STTServerBusyError(RuntimeError):
+    """추론 서버 대기열이 가득 참"""
+
+
+def get_local_model():
+    """Whisper 모델 지연 로드 (프로세스당 한 번)"""
+    global _local_model
+    if _local_model is None:
+        with _local_model_lock:
+            if _local_model is None:
+                import whisper
+                print(f"Whisper 모델 로딩 중... ({WHISPER_MODEL})")
+                _local_model = whisper.load_model(WHISPER_MODEL)
+                print("Whisper 모델 로드 완료!")
+    return _local_model
+
+
+def transcribe(filepath, language='ko'):
+    """
+    오디오 파일 STT
+
+    Args:
+        filepath: 오디오 파일 경로
+        language: 인식 언어
+    Returns:
+        str: 인식된 텍스트 (앞뒤 공백 포함 원본)
+    """
+    if WHISPER_SERVER_URL:
+        return _transcribe_remote(filepath, language)
+    if WHISPER_BATCH_SIZE > 1:
+        return get_batcher().transcribe(filepath, language)
+    result = get_local_model().transcribe(filepath, language=language)
+    return result['text']
+
+
+def get_batcher():
+    """프로세스 공용 배치 처리기"""
+    global _batcher
+    if _batcher is None:
+        model = get_local_model()
+        with _local_model_lock:
+            if _batcher is None:
+                _batcher = BatchTranscriber(model)
+    return _batcher
+
+
+class BatchTranscriber:
+    """
+    마이크로 배치 STT 스케줄러
+    - 호출한 스레드에서 오디오를 디코딩(ffmpeg)한 뒤 대기열에 넣음
+    - 스케줄러 스레드가 최대 max_wait_ms 동안 최대 max_batch_size개를 모아
+      log-mel 계산 + 디코더 패스를 한 번에 실행하고 각 호출자에게 결과를 돌려줌
+    - 30초를 넘는 오디오는 배치 디코딩이 불가능하므로 단독으로 transcribe() 처리
+    """
+
+    def __init__(self, model, max_batch_size=None, max_wait_ms=None):
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size or WHISPER_BATCH_SIZE)
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else WHISPER_BATCH_WAIT_MS) / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.batched_items = 0
+        self.fallbacks = 0
+        self._thread = threading.Thread(target=self._run, name='whisper-batcher', daemon=True)
+        self._thread.start()
+
+    def transcribe(self, filepath, language='ko'):
+        """파일 하나를 배치에 넣고 결과가 나올 때까지 대기"""
+        import whisper
+        audio = whisper.load_audio(filepath)
+        future = Future()
+        self._queue.put((filepath, audio, language, future))
+        return future.result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'batched_items': self.batched_items,
+                'avg_batch_size': round(self.batched_items / self.batches, 2) if self.batches else 0,
+                'fallbacks': self.fallbacks,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': int(self.max_wait * 1000)
+            }
+
+    def _collect(self):
+        """첫 요청이 올 때까지 기다린 후, 배치가 차거나 대기 시간이 끝날 때까지 추가로 모음"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        import whisper
+        while True:
+            batch = self._collect()
+
+            short_items = []
+            for item in batch:
+                filepath, audio, language, future = item
+                if audio.shape[0] > whisper.audio.N_SAMPLES:
+                    self._transcribe_single(item)
+                else:
+                    short_items.append(item)
+
+            # 언어별로 묶어서 디코딩
+            by_language = {}
+            for item in short_items:
+                by_language.setdefault(item[2], []).append(item)
+            for language, items in by_language.items():
+                try:
+                    self._decode_batch(items, language)
+                except Exception as e:
+                    for item in items:
+                        if not item[3].done():
+                            item[3].set_exception(e)
+
+    def _decode_batch(self, items, language):
+        import torch
+        import whisper
+
+        n_mels = getattr(self.model.dims, 'n_mels', 80)
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=n_mels)
+            for _, audio, _, _ in items
+        ]).to(self.model.device)
+
+        options = whisper.DecodingOptions(
+            language=language,
+            without_timestamps=True,
+            fp16=self.model.device.type == 'cuda'
+        )
+        results = whisper.decode(self.model, mels, options)
+
+        with self._lock:
+            self.batches += 1
+            self.batched_items += len(items)
+
+        for item, result in zip(items, results):
+            if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+                item[3].set_result('')  # 무음
+            elif (result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+                    or result.avg_logprob < LOGPROB_THRESHOLD):
+                # 품질이 낮으면 temperature fallback이 있는 transcribe()로 다시 처리
+                with self._lock:
+                    self.fallbacks += 1
+                self._transcribe_single(item)
+            else:
+                item[3].set_result(result.text)
+
+    def _transcribe_single(self, item):
+        filepath, audio, language, future = item
+        try:
+            result = self.model.transcribe(audio, language=language)
+            future.set_result(result['text'])
+        except Exception as e:
+            future.set_exception(e)
+
+
+def _transcribe_remote(filepath, language):
+    """추론 서버에 파일 경로를 전달 (웹 워커와 추론 서버는 uploads 폴더를 공유)"""
+    try:
+        response = requests.post(
+            f"{WHISPER_SERVER_URL}/transcribe",
+            json={'path': os.path.abspath(filepath), 'language': language},
+            timeout=WHISPER_SERVER_TIMEOUT
+        )
+    except requests.exceptions.ConnectionError as e:
+        raise RuntimeError(f'Whisper 추론 서버에 연결할 수 없습니다: {WHISPER_SERVER_URL}') from e
+
+    data = response.json() if response.content else {}
+    if response.status_code == 200:
+        return data['text']
+    error = data.get('error', response.text)
+    if response.status_code == 404:
+        raise FileNotFoundError(error)
+    if response.status_code == 503:
+        raise STTServerBusyError(error)
+    raise RuntimeError(f'Whisper 추론 서버 오류 ({response.status_code}): {error}')
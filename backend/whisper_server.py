@@ -0,0 +1,181 @@
+"""
+공유 Whisper 추론 서버
+gunicorn 워커마다 Whisper 모델을 따로 로드하지 않도록, 모델 하나를 이 프로세스가 소유하고
+로컬 HTTP로 모든 웹 워커의 STT 요청을 처리합니다.
+
+사용법:
+    python whisper_server.py
+    (웹 서버에는 WHISPER_SERVER_URL=http://127.0.0.1:5001 설정)
+
+API:
+    POST /transcribe  {"path": "/app/uploads/xxx.webm", "language": "ko"} -> {"text": "..."}
+    GET  /health      -> 모델/대기열 상태
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+WHISPER_HOST = os.getenv('WHISPER_HOST', '127.0.0.1')
+WHISPER_PORT = int(os.getenv('WHISPER_PORT', '5001'))
+WHISPER_MAX_CONCURRENCY = int(os.getenv('WHISPER_MAX_CONCURRENCY', '1'))  # 동시에 추론하는 요청 수
+WHISPER_MAX_QUEUE = int(os.getenv('WHISPER_MAX_QUEUE', '16'))  # 추론 대기 가능한 요청 수 (초과 시 503)
+WHISPER_THREADS = int(os.getenv('WHISPER_THREADS', '0'))  # torch 스레드 수 (0이면 기본값)
+# 이 폴더 안의 파일만 처리 (임의 파일 읽기 방지)
+WHISPER_ALLOWED_DIR = os.path.abspath(os.getenv('WHISPER_ALLOWED_DIR', 'uploads'))
+
+
+class TranscriptionService:
+    """모델 하나를 공유하고 동시 실행 수와 대기열 길이를 제한"""
+
+    def __init__(self, max_concurrency=WHISPER_MAX_CONCURRENCY, max_queue=WHISPER_MAX_QUEUE):
+        from stt import get_local_model, get_batcher, WHISPER_BATCH_SIZE
+        self.model = get_local_model()
+        # 배치 모드에서는 스케줄러 스레드가 모델 실행을 직렬화하므로 동시 요청을 모두 배치로 보냄
+        self.batcher = get_batcher() if WHISPER_BATCH_SIZE > 1 else None
+        if self.batcher is not None:
+            max_concurrency = max(max_concurrency, self.batcher.max_batch_size)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def try_admit(self):
+        """대기열에 자리가 있으면 입장 (없으면 False)"""
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            return True
+
+    def transcribe(self, path, language):
+        """입장한 요청 처리 (슬롯이 날 때까지 대기)"""
+        with self._slots:
+            with self._lock:
+                self.waiting -= 1
+                self.active += 1
+            try:
+                if self.batcher is not None:
+                    return self.batcher.transcribe(path, language)
+                result = self.model.transcribe(path, language=language)
+                return result['text']
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                'active': self.active,
+                'waiting': self.waiting,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue
+            }
+        if self.batcher is not None:
+            stats['batch'] = self.batcher.stats()
+        return stats
+
+
+class WhisperRequestHandler(BaseHTTPRequestHandler):
+    service = None  # TranscriptionService (서버 시작 시 설정)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': '존재하지 않는 경로입니다.'})
+            return
+        self._send_json(200, {'status': 'ok', 'model': os.getenv('WHISPER_MODEL', 'base'), **self.service.stats()})
+
+    def do_POST(self):
+        if self.path != '/transcribe':
+            self._send_json(404, {'error': '존재하지 않는 경로입니다.'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {'error': '요청 형식이 올바르지 않습니다.'})
+            return
+
+        path = os.path.abspath(data.get('path') or '')
+        language = data.get('language') or 'ko'
+
+        if os.path.commonpath([path, WHISPER_ALLOWED_DIR]) != WHISPER_ALLOWED_DIR:
+            self._send_json(400, {'error': '허용되지 않은 파일 경로입니다.'})
+            return
+        if not os.path.exists(path):
+            self._send_json(404, {'error': f'파일을 찾을 수 없습니다: {path}'})
+            return
+
+        if not self.service.try_admit():
+            self._send_json(503, {'error': 'STT 대기열이 가득 찼습니다.'}, headers={'Retry-After': '5'})
+            return
+
+        started = time.time()
+        try:
+            text = self.service.transcribe(path, language)
+        except Exception as e:
+            print(f"[Whisper 서버] 처리 오류: {str(e)}")
+            self._send_json(500, {'error': str(e)})
+            return
+
+        elapsed = time.time() - started
+        print(f"[Whisper 서버] STT 완료 ({elapsed:.2f}초): {os.path.basename(path)}")
+        self._send_json(200, {'text': text, 'elapsed': elapsed})
+
+    def log_message(self, format, *args):
+        # 기본 접근 로그는 생략 (처리 결과만 출력)
+        pass
+
+
+def main():
+    if WHISPER_THREADS > 0:
+        import torch
+        torch.set_num_threads(WHISPER_THREADS)
+
+    WhisperRequestHandler.service = TranscriptionService()
+    server = ThreadingHTTPServer((WHISPER_HOST, WHISPER_PORT), WhisperRequestHandler)
+    server.daemon_threads = True
+
+    print("=" * 50)
+    print(f"Whisper 추론 서버 시작: http://{WHISPER_HOST}:{WHISPER_PORT}")
+    service = WhisperRequestHandler.service
+    print(f"동시 처리: {service.max_concurrency}, 대기열: {service.max_queue}")
+    if service.batcher is not None:
+        print(f"배치 처리: 최대 {service.batcher.max_batch_size}개 / {int(service.batcher.max_wait * 1000)}ms")
+    print(f"허용 폴더: {WHISPER_ALLOWED_DIR}")
+    print("=" * 50)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Whisper 추론 서버 종료")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()